@@ -0,0 +1,173 @@
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("SUPABASE_DATABASE")
+ASYNC_DB_POOL_MIN = int(os.getenv("ASYNC_DB_POOL_MIN", "1"))
+ASYNC_DB_POOL_MAX = int(os.getenv("ASYNC_DB_POOL_MAX", "10"))
+# Role user-scoped queries switch to, so the RLS policies the anon-key client went through still apply
+ASYNC_DB_RLS_ROLE = os.getenv("ASYNC_DB_RLS_ROLE", "authenticated")
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def _init_connection(conn) -> None:
+    # jobs.skills / admin_logs.details are jsonb; hand them over as Python objects
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """Process-wide asyncpg pool for the request path, created on first use"""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    DATABASE_URL,
+                    min_size=ASYNC_DB_POOL_MIN,
+                    max_size=ASYNC_DB_POOL_MAX,
+                    ssl="require",
+                    # Supabase's pooler runs in transaction mode, which can't keep prepared statements
+                    statement_cache_size=0,
+                    init=_init_connection,
+                )
+                logger.info(f"✅ Async DB pool ready ({ASYNC_DB_POOL_MIN}-{ASYNC_DB_POOL_MAX} connections)")
+    return _pool
+
+
+async def close_async_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def user_transaction(user_id: str) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Transaction that runs as ASYNC_DB_RLS_ROLE with this user's JWT claims, the
+    way PostgREST does for a Supabase request: auth.uid() is the user and RLS
+    policies apply (the pool's own DATABASE_URL role would bypass them).
+    """
+    claims = json.dumps({"sub": str(user_id), "role": ASYNC_DB_RLS_ROLE})
+    pool = await get_async_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # Both are transaction-local, so nothing leaks to the next borrower of the connection
+            await conn.execute(
+                "SELECT set_config('request.jwt.claims', $1, true), set_config('request.jwt.claim.sub', $2, true)",
+                claims, str(user_id)
+            )
+            await conn.execute(f'SET LOCAL ROLE "{ASYNC_DB_RLS_ROLE}"')
+            yield conn
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _insert_sql(table: str, columns: List[str]) -> str:
+    placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+# ===========================
+# Jobs
+# ===========================
+# Scraped listings are the same for every user, so these read on the pool's own role
+async def fetch_job_descriptions(job_ids: Iterable[str]) -> Dict[str, str]:
+    """Map job id → job_description for just these jobs"""
+    job_ids = [str(job_id) for job_id in job_ids]
+    if not job_ids:
+        return {}
+    pool = await get_async_pool()
+    rows = await pool.fetch(
+        "SELECT id, job_description FROM jobs WHERE id = ANY($1::uuid[])",
+        job_ids
+    )
+    return {str(row["id"]): row["job_description"] or "" for row in rows}
+
+
+async def fetch_jobs(job_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    job_ids = [str(job_id) for job_id in job_ids]
+    if not job_ids:
+        return []
+    pool = await get_async_pool()
+    rows = await pool.fetch("SELECT * FROM jobs WHERE id = ANY($1::uuid[])", job_ids)
+    return [dict(row) for row in rows]
+
+
+# ===========================
+# Applications (user-scoped: these go through RLS, see user_transaction)
+# ===========================
+async def insert_application(application: Dict[str, Any]) -> None:
+    columns = list(application)
+    async with user_transaction(application["user_id"]) as conn:
+        await conn.execute(_insert_sql("applications", columns), *application.values())
+
+
+async def insert_applications(user_id: str, applications: List[Dict[str, Any]]) -> int:
+    """Insert several of a user's applications (same keys) in one transaction"""
+    if not applications:
+        return 0
+    columns = list(applications[0])
+    async with user_transaction(user_id) as conn:
+        await conn.executemany(
+            _insert_sql("applications", columns),
+            [tuple(app[c] for c in columns) for app in applications]
+        )
+    return len(applications)
+
+
+async def insert_admin_log(action: str, user_id: str, details: Dict[str, Any]) -> None:
+    async with user_transaction(user_id) as conn:
+        await conn.execute(
+            "INSERT INTO admin_logs (action, user_id, details, timestamp) VALUES ($1, $2, $3, $4)",
+            action, user_id, details, _now()
+        )
+
+
+async def get_application_stats(user_id: str, recent_days: int = 7, top_companies: int = 5) -> Dict[str, Any]:
+    """Aggregate a user's applications in SQL instead of pulling every row"""
+    async with user_transaction(user_id) as conn:
+        totals = await conn.fetchrow("""
+            SELECT COUNT(*) AS total,
+                   COALESCE(AVG(match_score), 0) AS avg_match_score,
+                   COUNT(*) FILTER (WHERE submitted_at > $2) AS recent
+            FROM applications
+            WHERE user_id = $1
+        """, user_id, _now() - timedelta(days=recent_days))
+        statuses = await conn.fetch("""
+            SELECT COALESCE(application_status, 'unknown') AS status, COUNT(*) AS count
+            FROM applications
+            WHERE user_id = $1
+            GROUP BY 1
+        """, user_id)
+        companies = await conn.fetch("""
+            SELECT company, COUNT(*) AS count
+            FROM applications
+            WHERE user_id = $1 AND company IS NOT NULL
+            GROUP BY company
+            ORDER BY count DESC, company
+            LIMIT $2
+        """, user_id, top_companies)
+
+    return {
+        "total": totals["total"],
+        "avg_match_score": float(totals["avg_match_score"]),
+        "recent": totals["recent"],
+        "status_counts": {row["status"]: row["count"] for row in statuses},
+        "top_companies": [{"company": row["company"], "count": row["count"]} for row in companies],
+    }
@@ -0,0 +1,280 @@
+"""
+Loads the job_data CSV exports into the jobs table.
+
+Each file is streamed in batches: a batch is COPYed into a temporary staging
+table and moved into jobs with one INSERT ... SELECT ... ON CONFLICT (url)
+DO NOTHING RETURNING, so the counts are real inserts vs duplicates. Several
+files load in parallel, and a manifest next to the files records each file's
+checksum and how many rows are committed, so a rerun skips finished files
+and resumes a half-loaded one where it stopped. Rows without a url, or with
+a value the table rejects, are counted as failed and skipped rather than
+blocking their batch on every rerun.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import psycopg2
+
+from app.db.connect_database import DB_POOL_MAX, db_connection
+from app.db.job_writer import JOB_COLUMNS, job_values
+from app.utils.job_skill_index import index_inserted_job
+from app.utils.url_bloom import remember_urls
+from app.utils.write_jobs import iter_job_csv_files, read_job_csv
+
+logger = logging.getLogger(__name__)
+
+SYNC_BATCH_SIZE = int(os.getenv("SYNC_BATCH_SIZE", "2000"))
+SYNC_WORKERS = int(os.getenv("SYNC_WORKERS", "4"))
+MANIFEST_NAME = ".sync_manifest.json"
+
+COPY_NULL = r"\N"
+
+COPY_BATCH_SQL = f"""
+    CREATE TEMP TABLE jobs_stage ON COMMIT DROP AS
+    SELECT {", ".join(JOB_COLUMNS)} FROM jobs WITH NO DATA;
+"""
+MOVE_BATCH_SQL = f"""
+    INSERT INTO jobs ({", ".join(JOB_COLUMNS)})
+    SELECT {", ".join(JOB_COLUMNS)} FROM jobs_stage
+    ON CONFLICT (url) DO NOTHING
+    RETURNING id, url;
+"""
+
+
+def row_to_job(row: Dict[str, str]) -> Dict:
+    """CSV row (all strings, empty = missing) -> job dict for job_values()"""
+    return {
+        "title": row["title"],
+        "company": row.get("company") or None,
+        "job_location": row.get("job_location") or None,
+        "job_state": row.get("job_state") or None,
+        "date": row.get("date") or None,
+        "site": row["site"],
+        "job_description": row.get("job_description") or "",
+        "salary": row.get("salary") or None,
+        "url": row["url"],
+        "applied": row.get("applied", "False") in ("True", "true", True),
+        "saved": row.get("saved", "False") in ("True", "true", True),
+        "search_term": row.get("search_term", ""),
+        "category": row.get("category") or None,
+        "priority": row.get("priority") or None,
+        "status": row.get("status") or None,
+        "inserted_at": row.get("inserted_at") or None,
+        "last_verified": row.get("last_verified") or None,
+        "skills": json.loads(row.get("skills") or "[]"),
+        "skills_by_category": json.loads(row.get("skills_by_category") or "{}"),
+        "user_id": None
+    }
+
+
+def file_checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SyncManifest:
+    """
+    {file name: {size, mtime, sha256, rows_done, complete, inserted, duplicates, ...}}
+    saved atomically after every committed batch
+    """
+
+    def __init__(self, folder: Path):
+        self.path = folder / MANIFEST_NAME
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.files: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self.files = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable sync manifest {self.path}: {e}")
+            self.files = {}
+
+    def start(self, path: Path) -> Dict:
+        """Entry for this file, reset if its contents changed since the last run"""
+        stat = path.stat()
+        with self._lock:
+            entry = self.files.get(path.name)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+            return entry
+        checksum = file_checksum(path)
+        if entry and entry.get("sha256") == checksum:
+            with self._lock:
+                entry.update(size=stat.st_size, mtime=stat.st_mtime)
+            return entry
+        if entry:
+            logger.info(f"♻️ {path.name} changed since it was synced; loading it again")
+        entry = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": checksum,
+                 "rows_done": 0, "complete": False, "inserted": 0, "duplicates": 0}
+        with self._lock:
+            self.files[path.name] = entry
+        return entry
+
+    def update(self, path: Path, add: Dict[str, int] = None, **fields) -> None:
+        """Change one file's entry (counters in `add` are incremented) and save"""
+        with self._lock:
+            entry = self.files[path.name]
+            for key, value in (add or {}).items():
+                entry[key] = entry.get(key, 0) + value
+            for key, value in fields.items():
+                if value is None:
+                    entry.pop(key, None)
+                else:
+                    entry[key] = value
+        self.save()
+
+    def save(self) -> None:
+        # Workers share one manifest; the lock also keeps their tmp-file writes apart
+        with self._lock:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.files, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def _copy_buffer(rows: List[tuple]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for values in rows:
+        writer.writerow(COPY_NULL if v is None else v for v in values)
+    buffer.seek(0)
+    return buffer
+
+
+def load_rows(jobs: List[Dict], path: Path) -> Dict[str, int]:
+    """
+    Fallback for a batch whose COPY failed: one insert per row, so a single bad
+    value costs that row (logged and counted as failed) instead of the batch
+    """
+    counts = {"inserted": 0, "duplicates": 0, "failed": 0}
+    for job in jobs:
+        try:
+            result = load_batch([job])
+        except Exception as e:
+            counts["failed"] += 1
+            logger.warning(f"⚠️ [{path.name}] Quarantined row {job.get('url')}: {e}")
+            continue
+        counts["inserted"] += result["inserted"]
+        counts["duplicates"] += result["duplicates"]
+    return counts
+
+
+def load_batch(jobs: List[Dict]) -> Dict[str, int]:
+    """COPY one batch into a staging table and move it into jobs in the same transaction"""
+    # First job per url wins, same as sequential ON CONFLICT DO NOTHING inserts
+    unique: Dict[str, Dict] = {}
+    for job in jobs:
+        unique.setdefault(job["url"], job)
+
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute(COPY_BATCH_SQL)
+        cur.copy_expert(
+            f"COPY jobs_stage ({', '.join(JOB_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            _copy_buffer([job_values(job) for job in unique.values()]),
+        )
+        cur.execute(MOVE_BATCH_SQL)
+        returned = cur.fetchall()
+
+    for job_id, url in returned:
+        index_inserted_job(job_id, unique[url])
+    remember_urls(unique.keys())
+    return {"inserted": len(returned), "duplicates": len(jobs) - len(returned)}
+
+
+def _batches(rows: Iterator[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_file(path: Path, manifest: SyncManifest, batch_size: int = SYNC_BATCH_SIZE) -> Dict:
+    entry = manifest.start(path)
+    stats = {"file": path.name, "rows": 0, "inserted": 0, "duplicates": 0, "resumed_past": 0, "failed": 0}
+    if entry["complete"]:
+        stats["skipped"] = True
+        return stats
+
+    rows = read_job_csv(path)
+    # Rows before rows_done were committed by an earlier run
+    stats["resumed_past"] = sum(1 for _ in islice(rows, entry["rows_done"]))
+
+    for batch in _batches(rows, batch_size):
+        jobs = []
+        failed = 0
+        for row in batch:
+            try:
+                if not row.get("url"):
+                    raise ValueError("no url")
+                jobs.append(row_to_job(row))
+            except (KeyError, ValueError) as e:
+                failed += 1
+                logger.warning(f"⚠️ [{path.name}] Skipping malformed row: {e}")
+        try:
+            counts = load_batch(jobs) if jobs else {"inserted": 0, "duplicates": 0}
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            # A bad value fails the whole COPY; load row by row so only that row is lost
+            logger.warning(f"⚠️ [{path.name}] Batch at row {entry['rows_done']} has bad data ({e}), loading it row by row")
+            counts = load_rows(jobs, path)
+            failed += counts.pop("failed")
+        except Exception as e:
+            # Connection trouble: leave rows_done where it is so the next run retries from this batch
+            manifest.update(path, error=str(e))
+            logger.error(f"❌ [{path.name}] Batch at row {entry['rows_done']} failed: {e}")
+            stats["error"] = str(e)
+            return stats
+
+        stats["rows"] += len(batch)
+        stats["inserted"] += counts["inserted"]
+        stats["duplicates"] += counts["duplicates"]
+        stats["failed"] += failed
+        manifest.update(path, add={"rows_done": len(batch), "failed": failed, **counts}, error=None)
+
+    manifest.update(path, complete=True, synced_at=datetime.utcnow().isoformat())
+    return stats
+
+
+def load_folder(folder, workers: int = SYNC_WORKERS, batch_size: int = SYNC_BATCH_SIZE) -> Dict:
+    """Load every finished CSV in folder, `workers` files at a time; returns totals and rows/sec"""
+    folder = Path(folder)
+    files = iter_job_csv_files(folder)
+    manifest = SyncManifest(folder)
+    # Each worker holds one pooled connection per batch; leave room for the app
+    workers = max(1, min(workers, DB_POOL_MAX - 1, len(files) or 1))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda path: load_file(path, manifest, batch_size), files))
+    seconds = time.perf_counter() - start
+
+    rows = sum(r["rows"] for r in results)
+    totals = {
+        "files": len(files),
+        "files_skipped": sum(1 for r in results if r.get("skipped")),
+        "files_failed": sum(1 for r in results if r.get("error")),
+        "rows": rows,
+        "rows_resumed_past": sum(r["resumed_past"] for r in results),
+        "inserted": sum(r["inserted"] for r in results),
+        "duplicates": sum(r["duplicates"] for r in results),
+        "failed": sum(r["failed"] for r in results),
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else 0.0,
+        "by_file": [r for r in results if not r.get("skipped")],
+    }
+    return totals
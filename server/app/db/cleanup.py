@@ -1,92 +1,102 @@
-from datetime import datetime
-import requests
-from app.db.connect_database import get_db_connection
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from app.db.connect_database import db_connection
+from app.db.job_validator import validate_jobs as validate_jobs_concurrently
 
-def remove_duplicate_urls():
-    """Keep only the newest inserted_at for each URL."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                DELETE FROM jobs a
-                USING (
-                    SELECT url, MAX(inserted_at) AS latest
-                    FROM jobs
-                    GROUP BY url
-                    HAVING COUNT(*) > 1
-                ) dups
-                WHERE a.url = dups.url
-                  AND a.inserted_at < dups.latest;
-            """)
-        conn.commit()
+CLEANUP_CHUNK_SIZE = int(os.getenv("CLEANUP_CHUNK_SIZE", "5000"))
+# Duplicate URL pass of cleanup(): "full" (default) scans the whole table, a number only
+# checks rows inserted in that many days
+_lookback = os.getenv("DEDUP_LOOKBACK_DAYS", "full")
+DEDUP_LOOKBACK_DAYS = None if _lookback == "full" else int(_lookback)
+# Runs right after a crawl only need the recent rows: a new duplicate always involves one
+DEDUP_RECENT_DAYS = int(os.getenv("DEDUP_RECENT_DAYS", "3"))
+
+def run_chunked(label: str, sql: str, params: tuple = (), chunk_size: int = CLEANUP_CHUNK_SIZE) -> Dict:
+    """
+    Repeat a `... WHERE id IN (SELECT ... LIMIT %s)` statement until it touches
+    fewer than chunk_size rows. Each chunk is its own short transaction, so
+    row locks are never held across the whole table.
+    """
+    start = time.perf_counter()
+    rows = chunks = 0
+    while True:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(sql, params + (chunk_size,))
+            touched = cur.rowcount
+        rows += touched
+        chunks += 1
+        if touched < chunk_size:
+            break
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else 0.0,
+    }
+    print(f"🧹 {label}: {rows} rows in {stats['seconds']}s ({stats['rows_per_second']} rows/s, {chunks} chunks)")
+    return stats
+
+def remove_duplicate_urls(lookback_days: Optional[int] = DEDUP_LOOKBACK_DAYS):
+    """Keep only the newest inserted_at for each URL (lookback_days=None checks the whole table)."""
+    since = datetime.utcnow() - timedelta(days=lookback_days) if lookback_days is not None else datetime.min
+    return run_chunked("Duplicate URLs removed", """
+        DELETE FROM jobs
+        WHERE id IN (
+            -- EXISTS, not a JOIN: a row with several newer twins must count once,
+            -- or a chunk touches fewer than chunk_size rows and the loop stops early
+            SELECT older.id
+            FROM jobs older
+            WHERE EXISTS (
+                SELECT 1 FROM jobs newer
+                WHERE newer.url = older.url
+                  AND newer.inserted_at > older.inserted_at
+                  AND newer.inserted_at >= %s
+            )
+            LIMIT %s
+        );
+    """, (since,))
 
 def purge_older_than(days: int = 15):
     """Archive jobs with user data; delete unreferenced old jobs."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            # Archive jobs that are referenced
-            cur.execute("""
-                UPDATE jobs
-                SET archived_at = NOW()
-                WHERE date < CURRENT_DATE - INTERVAL '%s days'
-                  AND id IN (SELECT job_id FROM user_job_status)
-                  AND archived_at IS NULL;
-            """, (days,))
+    # Jobs that are referenced get archived
+    archived = run_chunked("Old referenced jobs archived", """
+        UPDATE jobs
+        SET archived_at = NOW()
+        WHERE id IN (
+            SELECT j.id FROM jobs j
+            WHERE j.date < CURRENT_DATE - make_interval(days => %s)
+              AND j.archived_at IS NULL
+              AND EXISTS (SELECT 1 FROM user_job_status s WHERE s.job_id = j.id)
+            LIMIT %s
+        );
+    """, (days,))
 
-            cur.execute("""
-                DELETE FROM jobs
-                WHERE date < CURRENT_DATE - INTERVAL '%s days'
-                  AND archived_at IS NULL
-                  AND id NOT IN (SELECT job_id FROM user_job_status);
-            """, (days,))
-        conn.commit()
-
-def is_job_expired(url: str) -> bool:
-    try:
-        response = requests.get(url, timeout=10)
-        html = response.text.lower()
-        expired_keywords = [
-            "this job has expired on indeed",
-            "not accepting applications",
-            "position has been filled",
-            "no longer accepting applications",
-            "we're sorry"
-        ]
-        return any(kw in html for kw in expired_keywords)
-    except Exception as e:
-        print(f"⚠️ Could not verify {url}: {e}")
-        return True
+    deleted = run_chunked("Old unreferenced jobs deleted", """
+        DELETE FROM jobs
+        WHERE id IN (
+            SELECT j.id FROM jobs j
+            WHERE j.date < CURRENT_DATE - make_interval(days => %s)
+              AND j.archived_at IS NULL
+              AND NOT EXISTS (SELECT 1 FROM user_job_status s WHERE s.job_id = j.id)
+            LIMIT %s
+        );
+    """, (days,))
+    return {"archived": archived, "deleted": deleted}
 
 def validate_jobs(batch_size: int = 100):
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, url FROM jobs
-                WHERE last_verified IS NULL OR last_verified < NOW() - INTERVAL '7 days'
-                LIMIT %s;
-            """, (batch_size,))
-            jobs = cur.fetchall()
-
-            for job_id, url in jobs:
-                if is_job_expired(url):
-                    cur.execute("""
-                        SELECT 1 FROM user_job_status WHERE job_id = %s LIMIT 1;
-                    """, (job_id,))
-                    if cur.fetchone():
-                        cur.execute("""
-                            UPDATE jobs SET archived_at = %s WHERE id = %s AND archived_at IS NULL;
-                        """, (datetime.utcnow(), job_id))
-                        print(f"📦 Archived expired job: {url}")
-                    else:
-                        cur.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
-                        print(f"🗑️ Deleted expired job: {url}")
-                else:
-                    cur.execute("UPDATE jobs SET last_verified = %s WHERE id = %s",
-                                (datetime.utcnow(), job_id))
-        conn.commit()
+    """Check stale jobs concurrently and apply the results in one batch (see job_validator)"""
+    return validate_jobs_concurrently(batch_size)
 
-def cleanup(days: int = 15, validate_batch: int = 100):
+def cleanup(days: int = 15, validate_batch: int = 100, lookback_days: Optional[int] = DEDUP_LOOKBACK_DAYS):
     print("🧼 Running job cleanup...")
-    remove_duplicate_urls()
-    purge_older_than(days)
-    validate_jobs(validate_batch)
-    print("✅ Cleanup complete")
\ No newline at end of file
+    start = time.perf_counter()
+    stats = {
+        "duplicates": remove_duplicate_urls(lookback_days),
+        **purge_older_than(days),
+        "validation": validate_jobs(validate_batch),
+    }
+    print(f"✅ Cleanup complete in {time.perf_counter() - start:.1f}s")
+    return stats
\ No newline at end of file
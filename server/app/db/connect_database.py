@@ -1,7 +1,11 @@
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import os
 import sys
+import threading
+import time
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 from supabase import create_client
 
@@ -15,13 +19,146 @@ if url is None or key is None:
 
 supabase = create_client(url, key)
 
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections idle longer than this get a SELECT 1 before being handed out
+DB_POOL_HEALTHCHECK_SECONDS = float(os.getenv("DB_POOL_HEALTHCHECK_SECONDS", "60"))
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+_last_used = {}
+_pool_metrics = {
+    "checkouts": 0,
+    "in_use": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+    "timeouts": 0,
+    "health_check_failures": 0,
+    "discarded": 0,
+}
+
+
 def get_db_connection():
+    """Open a dedicated, unpooled connection (one-off scripts only; prefer db_connection())"""
     conn = psycopg2.connect(DATABASE_URL, connect_timeout=10, sslmode="require")
     return conn
 
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    DB_POOL_MIN, DB_POOL_MAX, DATABASE_URL, connect_timeout=10, sslmode="require"
+                )
+    return _pool
+
+
+def _is_healthy(conn) -> bool:
+    if conn.closed:
+        return False
+    last_used = _last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < DB_POOL_HEALTHCHECK_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _checkout(pool):
+    """Take a healthy connection, replacing any that went stale while idle"""
+    for _ in range(DB_POOL_MAX + 1):
+        conn = pool.getconn()
+        if _is_healthy(conn):
+            return conn
+        with _pool_lock:
+            _pool_metrics["health_check_failures"] += 1
+            _pool_metrics["discarded"] += 1
+        _last_used.pop(id(conn), None)
+        pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("Could not get a healthy connection from the pool")
+
+
+@contextmanager
+def db_connection():
+    """
+    Borrow a pooled connection: commits on success, rolls back on error and
+    always returns it to the pool. Blocks up to DB_POOL_TIMEOUT seconds when
+    all DB_POOL_MAX connections are checked out.
+    """
+    start = time.perf_counter()
+    if not _pool_slots.acquire(timeout=DB_POOL_TIMEOUT):
+        with _pool_lock:
+            _pool_metrics["timeouts"] += 1
+        raise psycopg2.OperationalError(f"Timed out after {DB_POOL_TIMEOUT}s waiting for a database connection")
+
+    pool = conn = None
+    broken = False
+    try:
+        pool = _get_pool()
+        conn = _checkout(pool)
+        waited_ms = (time.perf_counter() - start) * 1000
+        with _pool_lock:
+            _pool_metrics["checkouts"] += 1
+            _pool_metrics["in_use"] += 1
+            _pool_metrics["wait_ms_total"] += waited_ms
+            _pool_metrics["wait_ms_max"] = max(_pool_metrics["wait_ms_max"], waited_ms)
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            broken = conn.closed or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            with _pool_lock:
+                _pool_metrics["in_use"] -= 1
+    finally:
+        if conn is not None:
+            if broken:
+                _last_used.pop(id(conn), None)
+                with _pool_lock:
+                    _pool_metrics["discarded"] += 1
+            else:
+                _last_used[id(conn)] = time.monotonic()
+            pool.putconn(conn, close=broken)
+        _pool_slots.release()
+
+
+def pool_stats():
+    """Checkout counts and wait times for the shared pool"""
+    with _pool_lock:
+        stats = dict(_pool_metrics)
+    checkouts = stats["checkouts"]
+    stats["wait_ms_avg"] = round(stats["wait_ms_total"] / checkouts, 2) if checkouts else 0.0
+    stats["wait_ms_total"] = round(stats["wait_ms_total"], 2)
+    stats["wait_ms_max"] = round(stats["wait_ms_max"], 2)
+    stats["min_size"] = DB_POOL_MIN
+    stats["max_size"] = DB_POOL_MAX
+    stats["initialized"] = _pool is not None
+    return stats
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+        _last_used.clear()
+
 def load_skill_matrix():
-    response = supabase.table("skill_categories").select("*").execute()
-    return response.data 
+    # Shares the on-disk cache in skills_engine so this doesn't hit Supabase on every import
+    from app.utils.skills_engine import load_skill_matrix as load_cached_skill_matrix
+    return load_cached_skill_matrix()
 
 
 def get_jobs_missing_description(site="CareerBuilder", max_rows=50):
@@ -46,9 +183,8 @@ def update_job_description(job_id, job_description, skills, skills_by_category):
 def main():
     
     try:
-        conn = get_db_connection()
-        print("Database connection successful.")
-        conn.close()
+        with db_connection():
+            print("Database connection successful.")
     except Exception as e:
         print(f"Database connection failed: {e}")
 
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from psycopg2.extras import execute_values
+
+from app.db.connect_database import db_connection
+from app.utils.http_fetcher import HEADERS, FetchResult, fetch_browser, fetch_mode, looks_blocked
+
+logger = logging.getLogger(__name__)
+
+VALIDATE_CONCURRENCY = int(os.getenv("VALIDATE_CONCURRENCY", "50"))
+VALIDATE_PER_HOST = int(os.getenv("VALIDATE_PER_HOST", "4"))
+VALIDATE_BROWSER_CONCURRENCY = int(os.getenv("VALIDATE_BROWSER_CONCURRENCY", "2"))
+VALIDATE_TIMEOUT = float(os.getenv("VALIDATE_TIMEOUT", "10"))
+# After an inconclusive check, wait this long before retrying; doubles per failure, capped at a week
+VALIDATE_RETRY_HOURS = float(os.getenv("VALIDATE_RETRY_HOURS", "6"))
+# Expiry notices sit near the top of the page; stop reading after this much
+VALIDATE_MAX_BYTES = int(os.getenv("VALIDATE_MAX_BYTES", str(256 * 1024)))
+
+EXPIRED_PHRASES = (
+    "this job has expired on indeed",
+    "not accepting applications",
+    "position has been filled",
+    "no longer accepting applications",
+    "we're sorry",
+)
+_PHRASE_OVERLAP = max(len(p) for p in EXPIRED_PHRASES)
+
+EXPIRED = "expired"
+LIVE = "live"
+UNKNOWN = "unknown"
+
+
+@dataclass
+class CheckResult:
+    job_id: str
+    url: str
+    verdict: str
+    reason: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def has_expiry_phrase(text: str) -> bool:
+    text = text.lower()
+    return any(phrase in text for phrase in EXPIRED_PHRASES)
+
+
+class JobValidator:
+    """
+    Checks job URLs concurrently: a conditional HEAD first (304 = unchanged,
+    404/410 = gone), then a conditional GET streamed only until an expiry
+    phrase shows up. Sites that wall off plain clients go through the
+    browser pool instead, with their own small concurrency limit.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self._all = asyncio.Semaphore(VALIDATE_CONCURRENCY)
+        self._browser = asyncio.Semaphore(VALIDATE_BROWSER_CONCURRENCY)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self.requests = Counter()
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        return self._hosts.setdefault(host, asyncio.Semaphore(VALIDATE_PER_HOST))
+
+    async def check(self, job_id: str, url: str, etag: Optional[str], last_modified: Optional[str]) -> CheckResult:
+        """Verdict for one job; never raises, so one bad row can't sink the batch's apply_results"""
+        try:
+            return await self._check(job_id, url, etag, last_modified)
+        except Exception as e:
+            # Bad or missing url, decode error, ...: this job stays unverified (and backs off)
+            logger.warning(f"⚠️ Could not check job {job_id} ({url}): {e}")
+            return CheckResult(job_id, url, UNKNOWN, f"error: {type(e).__name__}")
+
+    async def _check(self, job_id: str, url: str, etag: Optional[str], last_modified: Optional[str]) -> CheckResult:
+        if not url:
+            return CheckResult(job_id, url, UNKNOWN, "no url")
+        if fetch_mode(url) == "browser":
+            return await self._check_browser(job_id, url, "browser site")
+        conditional = {}
+        if etag:
+            conditional["If-None-Match"] = etag
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+
+        # Host slot first: a batch dominated by one host must not park every global slot waiting on it
+        async with self._host_slot(url), self._all:
+            try:
+                result = await self._head(job_id, url, conditional)
+                if result is None:
+                    result = await self._get(job_id, url, conditional)
+            except httpx.HTTPError as e:
+                return CheckResult(job_id, url, UNKNOWN, f"network: {type(e).__name__}")
+
+        if result.verdict == UNKNOWN and result.reason == "blocked" and fetch_mode(url) == "auto":
+            return await self._check_browser(job_id, url, "blocked")
+        return result
+
+    async def _head(self, job_id: str, url: str, conditional: Dict) -> Optional[CheckResult]:
+        """Settles unchanged and gone pages without a body; None means a GET is needed"""
+        self.requests["head"] += 1
+        response = await self.client.head(url, headers=conditional)
+        if response.status_code == 304:
+            return CheckResult(job_id, url, LIVE, "not modified", conditional.get("If-None-Match"), conditional.get("If-Modified-Since"))
+        if response.status_code in (404, 410):
+            return CheckResult(job_id, url, EXPIRED, f"status {response.status_code}")
+        return None
+
+    async def _get(self, job_id: str, url: str, conditional: Dict) -> CheckResult:
+        self.requests["get"] += 1
+        async with self.client.stream("GET", url, headers=conditional) as response:
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if response.status_code == 304:
+                return CheckResult(job_id, url, LIVE, "not modified", etag or conditional.get("If-None-Match"),
+                                   last_modified or conditional.get("If-Modified-Since"))
+            if response.status_code in (404, 410):
+                return CheckResult(job_id, url, EXPIRED, f"status {response.status_code}")
+
+            # Read until a phrase matches; keep a tail so phrases split across chunks still match
+            seen = 0
+            head = ""
+            tail = ""
+            async for chunk in response.aiter_text():
+                if len(head) < 5000:
+                    head += chunk[:5000 - len(head)]
+                window = tail + chunk.lower()
+                if any(phrase in window for phrase in EXPIRED_PHRASES):
+                    return CheckResult(job_id, url, EXPIRED, "expiry phrase")
+                tail = window[-_PHRASE_OVERLAP:]
+                seen += len(chunk)
+                if seen >= VALIDATE_MAX_BYTES:
+                    break
+
+        if looks_blocked(FetchResult(url, response.status_code, head, "http")):
+            return CheckResult(job_id, url, UNKNOWN, "blocked")
+        if response.status_code >= 400:
+            return CheckResult(job_id, url, UNKNOWN, f"status {response.status_code}")
+        return CheckResult(job_id, url, LIVE, "no expiry phrase", etag, last_modified)
+
+    async def _check_browser(self, job_id: str, url: str, why: str) -> CheckResult:
+        async with self._browser:
+            self.requests["browser"] += 1
+            # The Selenium pool is thread-safe and stays warm across calls
+            result = await asyncio.to_thread(fetch_browser, url)
+        if not result.html:
+            return CheckResult(job_id, url, UNKNOWN, f"{why}: browser fetch failed")
+        if has_expiry_phrase(result.html):
+            return CheckResult(job_id, url, EXPIRED, f"{why}: expiry phrase")
+        return CheckResult(job_id, url, LIVE, f"{why}: no expiry phrase")
+
+
+def _jobs_to_validate(batch_size: int) -> List[Tuple]:
+    """
+    Active jobs not verified in a week, least recently checked first. Jobs whose
+    last check was inconclusive wait out their backoff so they can't hog the batch.
+    """
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT id, url, http_etag, http_last_modified FROM jobs
+            WHERE archived_at IS NULL
+              AND (last_verified IS NULL OR last_verified < NOW() - INTERVAL '7 days')
+              AND (validation_attempted_at IS NULL
+                   OR validation_attempted_at < NOW() - INTERVAL '1 hour' * LEAST(%s * 2 ^ validation_failures, 168))
+            ORDER BY GREATEST(last_verified, validation_attempted_at) NULLS FIRST
+            LIMIT %s;
+        """, (VALIDATE_RETRY_HOURS, batch_size))
+        return cur.fetchall()
+
+
+def apply_results(results: List[CheckResult]) -> Dict[str, int]:
+    """One transaction: archive/delete expired jobs, stamp live ones, back off unknowns"""
+    expired = [r.job_id for r in results if r.verdict == EXPIRED]
+    live = [(r.job_id, r.etag, r.last_modified) for r in results if r.verdict == LIVE]
+    unknown = [r.job_id for r in results if r.verdict == UNKNOWN]
+    archived = deleted = 0
+    with db_connection() as conn, conn.cursor() as cur:
+        if expired:
+            # Jobs users interacted with are archived, the rest deleted
+            cur.execute("""
+                UPDATE jobs SET archived_at = NOW()
+                WHERE id = ANY(%s::uuid[]) AND archived_at IS NULL
+                  AND EXISTS (SELECT 1 FROM user_job_status s WHERE s.job_id = jobs.id);
+            """, (expired,))
+            archived = cur.rowcount
+            cur.execute("""
+                DELETE FROM jobs
+                WHERE id = ANY(%s::uuid[])
+                  AND NOT EXISTS (SELECT 1 FROM user_job_status s WHERE s.job_id = jobs.id);
+            """, (expired,))
+            deleted = cur.rowcount
+        if live:
+            execute_values(cur, """
+                UPDATE jobs SET last_verified = NOW(), http_etag = v.etag, http_last_modified = v.last_modified,
+                    validation_attempted_at = NOW(), validation_failures = 0
+                FROM (VALUES %s) AS v(id, etag, last_modified)
+                WHERE jobs.id = v.id::uuid;
+            """, live, page_size=1000)
+        if unknown:
+            # Not verified, but stamped so the next runs move on to other jobs first
+            cur.execute("""
+                UPDATE jobs SET validation_attempted_at = NOW(), validation_failures = validation_failures + 1
+                WHERE id = ANY(%s::uuid[]);
+            """, (unknown,))
+    return {"archived": archived, "deleted": deleted, "verified": len(live), "backed_off": len(unknown)}
+
+
+async def validate_jobs_async(batch_size: int = 100) -> Dict:
+    start = time.perf_counter()
+    jobs = _jobs_to_validate(batch_size)
+    if not jobs:
+        return {"checked": 0}
+
+    async with httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=VALIDATE_TIMEOUT,
+        headers=HEADERS,
+        limits=httpx.Limits(max_connections=VALIDATE_CONCURRENCY, max_keepalive_connections=VALIDATE_CONCURRENCY),
+    ) as client:
+        validator = JobValidator(client)
+        results = await asyncio.gather(*(
+            validator.check(str(job_id), url, etag, last_modified)
+            for job_id, url, etag, last_modified in jobs
+        ))
+
+    # No DB connection is held while the network checks run
+    applied = await asyncio.to_thread(apply_results, results)
+    verdicts = Counter(r.verdict for r in results)
+    summary = {
+        "checked": len(results),
+        **verdicts,
+        **applied,
+        "requests": dict(validator.requests),
+        "reasons": dict(Counter(r.reason for r in results)),
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+    logger.info(
+        f"🔎 Validated {len(results)} jobs in {summary['seconds']}s: {verdicts[EXPIRED]} expired "
+        f"({applied['archived']} archived, {applied['deleted']} deleted), {verdicts[LIVE]} live, {verdicts[UNKNOWN]} unknown"
+    )
+    return summary
+
+
+def validate_jobs(batch_size: int = 100) -> Dict:
+    """Sync entry point; safe to call from a thread that already runs an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(validate_jobs_async(batch_size))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, validate_jobs_async(batch_size)).result()
@@ -0,0 +1,213 @@
+import json
+import logging
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from app.db.connect_database import db_connection
+from app.utils.job_dedup import DEDUP_ENABLED, JobDeduper, check_job, register_jobs
+from app.utils.job_skill_index import index_inserted_job
+from app.utils.url_bloom import remember_urls
+from app.utils.write_jobs import canonical_job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+JOB_COLUMNS = (
+    "id", "title", "company", "job_location", "job_state", "salary", "site",
+    "date", "applied", "saved", "url", "job_description", "search_term",
+    "category", "priority", "status", "inserted_at", "last_verified",
+    "skills", "skills_by_category", "user_id", "content_simhash",
+)
+
+INSERT_JOBS_SQL = f"""
+    INSERT INTO jobs ({", ".join(JOB_COLUMNS)})
+    VALUES %s
+    ON CONFLICT (url) DO NOTHING
+    RETURNING id, url
+"""
+
+
+def job_values(job: Dict) -> tuple:
+    """Row tuple in JOB_COLUMNS order; scraper aliases (link, flat_skills, ...) are mapped first"""
+    job = canonical_job(job)
+    return (
+        str(job.get("id") or uuid.uuid4()),
+        job["title"],
+        job.get("company"),
+        job.get("job_location"),
+        job.get("job_state"),
+        job.get("salary") or "N/A",
+        job["site"],
+        job.get("date") or datetime.today().date(),
+        job.get("applied", False),
+        job.get("saved", False),
+        job["url"],
+        job.get("job_description") or "",
+        job.get("search_term"),
+        job.get("category"),
+        job.get("priority"),
+        job.get("status"),
+        job.get("inserted_at") or datetime.utcnow(),
+        job.get("last_verified"),
+        json.dumps(job.get("skills") or []),
+        json.dumps(job.get("skills_by_category") or {}),
+        job.get("user_id") or None,
+        job.get("content_simhash"),
+    )
+
+
+class JobBulkWriter:
+    """
+    Buffers job dicts and writes them in batches with one multi-row
+    INSERT ... ON CONFLICT (url) DO NOTHING per batch, instead of opening a
+    connection per job.
+
+    Use as a context manager (or call close()) so the last partial batch is
+    flushed. inserted/duplicates/failed are running totals; jobs the dedup
+    stage recognizes (tracking-URL variants, cross-board reposts) are counted
+    in skipped and never sent to the DB. The process-wide deduper only learns
+    a job once its batch is written, so the open batch is deduped on its own. stored holds the urls of every
+    flushed batch (inserted or already in the table).
+
+    A job that can't be written (missing title/site, a value the table
+    rejects) is counted in failed on its own; the rest of its batch still
+    goes in.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, source: str = "jobs"):
+        self.batch_size = batch_size
+        self.source = source
+        self._buffer: List[Dict] = []
+        self.batches = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.skipped = 0
+        self.stored: Set[str] = set()
+        self._pending = JobDeduper()
+
+    def __enter__(self) -> "JobBulkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add(self, job: Dict) -> None:
+        job = canonical_job(job)
+        if not job.get("url"):
+            logger.warning(f"⚠️ [{self.source}] Skipping job without url: {job.get('title', '')[:50]}")
+            return
+        # Scrapers that ran the dedup check already carry content_simhash
+        if "content_simhash" not in job and check_job(job):
+            self.skipped += 1
+            return
+        if DEDUP_ENABLED:
+            if self._pending.check(job):
+                self.skipped += 1
+                return
+            self._pending.register(job)
+        self._buffer.append(job)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def _insert(self, rows: List[tuple]) -> List[Tuple]:
+        with db_connection() as conn, conn.cursor() as cur:
+            return execute_values(cur, INSERT_JOBS_SQL, rows, page_size=len(rows), fetch=True)
+
+    def _insert_rows(self, rows: Dict[str, tuple]) -> Tuple[List[Tuple], List[str]]:
+        """
+        Fallback for a batch the DB rejected: one insert per row, so a bad value
+        costs that row instead of the batch. Returns (returned ids, failed urls).
+        """
+        returned: List[Tuple] = []
+        failed: List[str] = []
+        for url, values in rows.items():
+            try:
+                returned.extend(self._insert([values]))
+            except Exception as e:
+                failed.append(url)
+                logger.warning(f"⚠️ [{self.source}] Skipping job the DB rejected ({url}): {e}")
+        return returned, failed
+
+    def flush(self) -> Dict[str, int]:
+        """Write the buffered jobs; returns this batch's counts"""
+        batch, self._buffer = self._buffer, []
+        self._pending = JobDeduper()
+        if not batch:
+            return {"inserted": 0, "duplicates": 0, "failed": 0}
+
+        # Keep the first job per url, same as sequential inserts with ON CONFLICT DO NOTHING
+        unique: Dict[str, Dict] = {}
+        for job in batch:
+            unique.setdefault(job["url"], job)
+        in_batch_duplicates = len(batch) - len(unique)
+
+        rows: Dict[str, tuple] = {}
+        failed = 0
+        for url, job in unique.items():
+            try:
+                rows[url] = job_values(job)
+            except (KeyError, TypeError, ValueError) as e:
+                failed += 1
+                logger.warning(f"⚠️ [{self.source}] Skipping malformed job ({url}): {e!r}")
+
+        start = time.perf_counter()
+        try:
+            returned = self._insert(list(rows.values())) if rows else []
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            logger.warning(f"⚠️ [{self.source}] Batch of {len(rows)} jobs has bad data ({e}), inserting row by row")
+            returned, rejected = self._insert_rows(rows)
+            for url in rejected:
+                del rows[url]
+            failed += len(rejected)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"❌ [{self.source}] Bulk insert of {len(batch)} jobs failed: {e}")
+            traceback.print_exc()
+            return {"inserted": 0, "duplicates": 0, "failed": len(batch)}
+
+        for job_id, url in returned:
+            index_inserted_job(job_id, unique[url])
+        # Inserted or conflicting, every written url is in the table now
+        remember_urls(rows.keys())
+        register_jobs(unique[url] for url in rows)
+        self.stored.update(rows.keys())
+
+        inserted = len(returned)
+        duplicates = len(batch) - inserted - failed
+        self.batches += 1
+        self.inserted += inserted
+        self.duplicates += duplicates
+        self.failed += failed
+        logger.info(
+            f"✅ [{self.source}] Batch {self.batches}: {inserted} inserted, {duplicates} duplicates "
+            f"({in_batch_duplicates} within batch), {failed} failed in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return {"inserted": inserted, "duplicates": duplicates, "failed": failed}
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+
+def insert_jobs(jobs: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE, source: Optional[str] = None) -> Dict[str, int]:
+    """Bulk-insert a list of job dicts; returns the writer's totals"""
+    with JobBulkWriter(batch_size=batch_size, source=source or "jobs") as writer:
+        for job in jobs:
+            writer.add(job)
+    return writer.stats()
@@ -1,4 +1,5 @@
 # app/routers/health_router.py
+import asyncio
 from fastapi import APIRouter
 from datetime import datetime
 from typing import Dict, Any
@@ -180,6 +181,76 @@ async def list_scrapers() -> Dict[str, Any]:
         ]
     }
 
+@router.get("/db-pool")
+async def db_pool_metrics() -> Dict[str, Any]:
+    """
+    Database connection pool checkouts, wait times and health-check failures.
+    """
+    from app.db.connect_database import pool_stats
+    return {
+        "pool": pool_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/browser-pool")
+async def browser_pool_metrics() -> Dict[str, Any]:
+    """
+    Live browsers, slot usage and recycle counts for the shared browser pool.
+    """
+    from app.utils.browser_pool import browser_pool_stats
+    return {
+        "pool": browser_pool_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/browser-processes")
+async def browser_process_metrics() -> Dict[str, Any]:
+    """
+    Browser process trees spawned by this server: count, RSS and reaped orphans.
+    """
+    from app.utils.process_registry import process_stats
+    return {
+        "processes": await asyncio.to_thread(process_stats),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/selector-cache")
+async def selector_cache_metrics(site: str = None) -> Dict[str, Any]:
+    """
+    Learned selector order and hit rates per site; switches flag layout changes.
+    """
+    from app.utils.selector_cache import selector_cache
+    return {
+        "sites": selector_cache.stats(site),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/fetch-stats")
+async def fetch_path_metrics() -> Dict[str, Any]:
+    """
+    Pages fetched over plain HTTP vs. the browser, per site.
+    """
+    from app.utils.http_fetcher import fetch_stats
+    return {
+        "sites": fetch_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/dedup-stats")
+async def dedup_metrics() -> Dict[str, Any]:
+    """
+    Postings the scrapers' dedup stage skipped, by reason, and the seen-URL Bloom filter.
+    """
+    from app.utils.job_dedup import get_job_deduper
+    from app.utils.url_bloom import get_url_filter
+    deduper = await asyncio.to_thread(get_job_deduper)
+    url_filter = await asyncio.to_thread(get_url_filter)
+    return {
+        "dedup": deduper.stats(),
+        "url_filter": url_filter.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 
 # Helper functions for tracking scraper state
 def register_scraper(scraper_id: str, log_id: str):
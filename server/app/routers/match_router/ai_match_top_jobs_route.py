@@ -6,14 +6,13 @@ import os, json
 
 from app.db.connect_database import supabase
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_skills,
     extract_flat_skills,
     extract_skills_by_category
 )
 
 router = APIRouter()
-SKILLS = load_all_skills()
 
 # 🚀 Request Models
 class ResumeMatchRequest(BaseModel):
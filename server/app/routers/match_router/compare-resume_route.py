@@ -6,14 +6,13 @@ import os, json
 
 from app.db.connect_database import supabase
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_skills,
     extract_flat_skills,
     extract_skills_by_category
 )
 
 router = APIRouter()
-SKILLS = load_all_skills()
 
 # 🚀 Request Models
 class ResumeMatchRequest(BaseModel):
@@ -46,8 +45,8 @@ class PromptResult(BaseModel):
 # 🧠 Extract skills from text
 @router.post("/flat-skills/extract")
 def flat_skill_extract(payload: JobDesc):
-    flat = extract_flat_skills(payload.text, SKILLS["flat"])
-    categorized = extract_skills_by_category(payload.text, SKILLS["matrix"])
+    flat = extract_flat_skills(payload.text, get_skill_index()["flat"])
+    categorized = extract_skills_by_category(payload.text, get_skill_index()["matrix"])
     return {
         "flat_skills": flat,
         "skills_by_category": categorized
@@ -56,8 +55,8 @@ def flat_skill_extract(payload: JobDesc):
 # ⚖️ Compare resume to one job
 @router.post("/compare-resume")
 def compare_resume(payload: CompareResumeRequest):
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-    job_skills = extract_skills(payload.job_description, SKILLS["combined_flat"])
+    resume_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
+    job_skills = extract_skills(payload.job_description, get_skill_index()["combined_flat"])
 
     matched = sorted(set(resume_skills) & set(job_skills))
     missing = sorted(set(job_skills) - set(resume_skills))
@@ -72,14 +71,14 @@ def compare_resume(payload: CompareResumeRequest):
 # 🔍 Compare resume to all jobs with extracted job skills
 @router.post("/match-top-jobs")
 def match_top_jobs(payload: ResumeMatchRequest):
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
+    resume_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
     jobs_response = supabase.table("jobs").select("id", "title", "company", "job_description").execute()
     jobs = jobs_response.data or []
 
     scored_jobs = []
     for job in jobs:
         job_text = job.get("job_description", "")
-        job_skills = extract_skills(job_text, SKILLS["combined_flat"])
+        job_skills = extract_skills(job_text, get_skill_index()["combined_flat"])
 
         overlap = set(resume_skills) & set(job_skills)
         missing = sorted(set(job_skills) - set(resume_skills))
@@ -1,19 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
 from openai import OpenAI
 from typing import List
+import asyncio
 import os, json
 
 from app.db.connect_database import supabase
+from app.db.async_database import fetch_job_descriptions
+from app.utils.job_skill_index import get_job_skill_index
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_skills,
     extract_flat_skills,
     extract_skills_by_category
 )
 
 router = APIRouter()
-SKILLS = load_all_skills()
 
 # 🚀 Request Models
 class ResumeMatchRequest(BaseModel):
@@ -46,8 +48,8 @@ class PromptResult(BaseModel):
 # 🧠 Extract skills from text
 @router.post("/flat-skills/extract")
 def flat_skill_extract(payload: JobDesc):
-    flat = extract_flat_skills(payload.text, SKILLS["flat"])
-    categorized = extract_skills_by_category(payload.text, SKILLS["matrix"])
+    flat = extract_flat_skills(payload.text, get_skill_index()["flat"])
+    categorized = extract_skills_by_category(payload.text, get_skill_index()["matrix"])
     return {
         "flat_skills": flat,
         "skills_by_category": categorized
@@ -56,8 +58,8 @@ def flat_skill_extract(payload: JobDesc):
 # ⚖️ Compare resume to one job
 @router.post("/compare-resume")
 def compare_resume(payload: CompareResumeRequest):
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-    job_skills = extract_skills(payload.job_description, SKILLS["combined_flat"])
+    resume_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
+    job_skills = extract_skills(payload.job_description, get_skill_index()["combined_flat"])
 
     matched = sorted(set(resume_skills) & set(job_skills))
     missing = sorted(set(job_skills) - set(resume_skills))
@@ -71,30 +73,27 @@ def compare_resume(payload: CompareResumeRequest):
 
 # 🔍 Compare resume to all jobs with extracted job skills
 @router.post("/match-top-jobs")
-def match_top_jobs(payload: ResumeMatchRequest):
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-    jobs_response = supabase.table("jobs").select("id", "title", "company", "job_description").execute()
-    jobs = jobs_response.data or []
-
-    scored_jobs = []
-    for job in jobs:
-        job_text = job.get("job_description", "")
-        job_skills = extract_skills(job_text, SKILLS["combined_flat"])
-
-        overlap = set(resume_skills) & set(job_skills)
-        missing = sorted(set(job_skills) - set(resume_skills))
-        score = len(overlap)
-
-        scored_jobs.append({
-            "id": job["id"],
-            "title": job["title"],
-            "company": job["company"],
-            "match_score": score,
-            "matched_skills": sorted(overlap),
-            "missing_skills": missing,
-            "job_skills": sorted(job_skills),
-            "resume_skills": sorted(resume_skills),
-            "job_description": job_text
-        })
-
-    return sorted(scored_jobs, key=lambda x: x["match_score"], reverse=True)[:10]
+async def match_top_jobs(
+    payload: ResumeMatchRequest,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    min_score: int = Query(1, ge=1, description="Minimum number of shared skills"),
+    include_details: bool = Query(True, description="Include job_description, job_skills, missing_skills and resume_skills")
+):
+    resume_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
+    # Bounded top-k over the job skill index; only the requested page is materialized
+    job_index = await asyncio.to_thread(get_job_skill_index)
+    top_jobs, total = job_index.match_page(
+        resume_skills, limit=limit, offset=offset, min_score=min_score, include_skills=include_details
+    )
+    response.headers["X-Total-Count"] = str(total)
+    if not include_details:
+        return top_jobs
+
+    descriptions = await fetch_job_descriptions(job["id"] for job in top_jobs)
+    for job in top_jobs:
+        job["resume_skills"] = sorted(resume_skills)
+        job["job_description"] = descriptions.get(job["id"], "")
+
+    return top_jobs
@@ -5,7 +5,7 @@ from datetime import datetime
 import os
 from jose import jwt, JWTError
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills,
     extract_skills_by_category
@@ -30,14 +30,13 @@ import os, json
 
 from app.db.connect_database import supabase
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_skills,
     extract_flat_skills,
     extract_skills_by_category
 )
 
 router = APIRouter()
-SKILLS = load_all_skills()
 
 
 class ResumeInput(BaseModel):
@@ -52,7 +51,6 @@ class PromptResult(BaseModel):
     missing_skills: list[str]
 
 router = APIRouter()
-SKILLS = load_all_skills()
 class SendResumeRequest(BaseModel):
     resume_text: str
     job_ids: List[str]
@@ -71,8 +69,8 @@ class JobDesc(BaseModel):
 # Skill extraction from job desc
 @router.post("/flat-skills/extract")
 def flat_skill_extract(payload: JobDesc):
-    flat = extract_flat_skills(payload.text, SKILLS["flat"])
-    categorized = extract_skills_by_category(payload.text, SKILLS["matrix"])
+    flat = extract_flat_skills(payload.text, get_skill_index()["flat"])
+    categorized = extract_skills_by_category(payload.text, get_skill_index()["matrix"])
     return {
         "flat_skills": flat,
         "skills_by_category": categorized
@@ -81,8 +79,8 @@ def flat_skill_extract(payload: JobDesc):
 # Compare resume to one job
 @router.post("/compare-resume", summary="Compare resume to a job description")
 def compare_resume(payload: CompareResumeRequest):
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-    job_skills = extract_skills(payload.job_description, SKILLS["combined_flat"])
+    resume_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
+    job_skills = extract_skills(payload.job_description, get_skill_index()["combined_flat"])
 
     matched = sorted(set(resume_skills) & set(job_skills))
     missing = sorted(set(job_skills) - set(resume_skills))
@@ -4,7 +4,7 @@ from app.config.config_utils import get_output_folder
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 from fastapi import FastAPI, Query,Depends, HTTPException, Header, File, UploadFile, Request, APIRouter
-from datetime import datetime
+from datetime import datetime, timezone
 import os
 import logging
 
@@ -18,17 +18,25 @@ from jose import jwt, JWTError
 
 from app.db.connect_database import supabase
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_skills
 )
+from app.utils.job_skill_index import get_job_skill_index
+from app.db.async_database import (
+    get_application_stats,
+    insert_admin_log,
+    insert_application,
+    insert_applications
+)
+import asyncio
+import asyncpg
 
 app = FastAPI()
 
 router = APIRouter()
-SKILLS = load_all_skills()
 from jose import jwt, JWTError
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills,
     extract_skills_by_category
@@ -84,7 +92,7 @@ class ResumeSubmission(BaseModel):
     user_email: str
 
 @router.post("/send-resume-to-job")
-def send_resume(payload: ResumeSubmission, user_id: str = Depends(get_current_user_id)):
+async def send_resume(payload: ResumeSubmission, user_id: str = Depends(get_current_user_id)):
     """Submit resume to job with improved error handling"""
     try:
         logger.info(f"📤 Sending resume to {payload.company} for job '{payload.job_title}' (ID: {payload.job_id})")
@@ -95,6 +103,7 @@ def send_resume(payload: ResumeSubmission, user_id: str = Depends(get_current_us
         
         # Generate unique resume ID
         resume_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
         
         # Prepare insert payload with all required fields
         insert_payload = {
@@ -105,29 +114,27 @@ def send_resume(payload: ResumeSubmission, user_id: str = Depends(get_current_us
             'company': payload.company,
             'user_id': user_id,
             'user_email': payload.user_email,
-            'submitted_at': datetime.utcnow().isoformat(),
+            'submitted_at': now,
             'status': 'submitted',  # Add status field
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
+            'created_at': now,
+            'updated_at': now
         }
         
-        logger.info(f"🔍 Insert payload: {insert_payload}")
-        
         # Insert into database with better error handling
         try:
-            result = supabase.table("applications").insert(insert_payload).execute()
-            logger.info(f"✅ Application inserted successfully: {result.data}")
+            await insert_application(insert_payload)
+            logger.info(f"✅ Application inserted successfully: {resume_id}")
         except Exception as db_error:
             logger.error(f"❌ Database insert failed: {db_error}")
             
             # Try to provide more specific error information
             error_message = str(db_error)
-            if "row-level security" in error_message.lower():
+            if isinstance(db_error, asyncpg.InsufficientPrivilegeError) or "row-level security" in error_message.lower():
                 raise HTTPException(
                     status_code=403, 
                     detail="Database security policy violation. Please ensure you're properly authenticated."
                 )
-            elif "violates not-null constraint" in error_message.lower():
+            elif isinstance(db_error, asyncpg.NotNullViolationError):
                 raise HTTPException(
                     status_code=400,
                     detail="Missing required fields in application data"
@@ -140,19 +147,13 @@ def send_resume(payload: ResumeSubmission, user_id: str = Depends(get_current_us
         
         # Log successful submission
         try:
-            log_data = {
-                "action": "resume_submitted",
-                "user_id": user_id,
-                "details": {
-                    "resume_id": resume_id,
-                    "job_id": payload.job_id,
-                    "job_title": payload.job_title,
-                    "company": payload.company,
-                    "resume_length": len(payload.resume_text)
-                },
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            supabase.table("admin_logs").insert(log_data).execute()
+            await insert_admin_log("resume_submitted", user_id, {
+                "resume_id": resume_id,
+                "job_id": payload.job_id,
+                "job_title": payload.job_title,
+                "company": payload.company,
+                "resume_length": len(payload.resume_text)
+            })
         except Exception as log_error:
             logger.warning(f"Failed to log action: {log_error}")
             # Don't fail the request if logging fails
@@ -162,7 +163,7 @@ def send_resume(payload: ResumeSubmission, user_id: str = Depends(get_current_us
             "message": f"Resume successfully submitted to {payload.company}",
             "resume_id": resume_id,
             "job_id": payload.job_id,
-            "submitted_at": insert_payload['submitted_at']
+            "submitted_at": now.isoformat()
         }
         
     except HTTPException:
@@ -290,69 +291,51 @@ def send_resume_to_jobs(payload: SendResumeRequest):
 
 # 🚀 Automated Job Application with Matching
 @router.post("/apply/auto-apply")
-def auto_apply_to_jobs(payload: AutoApplyRequest, authorization: str = Header(...)):
+async def auto_apply_to_jobs(payload: AutoApplyRequest, authorization: str = Header(...)):
     """Automatically apply to jobs that meet minimum match criteria"""
     try:
         user_id = get_current_user_id(authorization)
         
         # Extract skills from resume
-        resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-        
-        # Get all active jobs
-        jobs_response = supabase.table("jobs").select("*").eq("status", "active").execute()
-        jobs = jobs_response.data or []
-        
-        suitable_jobs = []
-        
-        # Score each job
-        for job in jobs:
-            job_text = job.get("job_description", "")
-            job_skills = extract_skills(job_text, SKILLS["combined_flat"])
-            
-            # Calculate match score
-            matched_skills = set(resume_skills) & set(job_skills)
-            match_score = round(100 * len(matched_skills) / max(len(job_skills), 1))
-            
-            if match_score >= payload.min_match_score:
-                suitable_jobs.append({
-                    "job": job,
-                    "match_score": match_score,
-                    "matched_skills": list(matched_skills)
-                })
-        
-        # Sort by match score and limit applications
-        suitable_jobs.sort(key=lambda x: x["match_score"], reverse=True)
-        jobs_to_apply = suitable_jobs[:payload.max_applications]
+        resume_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
+        
+        # Score every active job in one vectorized pass over the skill index
+        job_index = await asyncio.to_thread(get_job_skill_index)
+        jobs_to_apply, total_suitable = job_index.match_by_percent(
+            resume_skills,
+            min_percent=payload.min_match_score,
+            limit=payload.max_applications,
+            status="active"
+        )
         
         # Submit applications
+        submitted_at = datetime.now(timezone.utc)
         applications = []
-        for job_data in jobs_to_apply:
-            job = job_data["job"]
-            
-            application = {
+        records = []
+        for job in jobs_to_apply:
+            records.append({
                 "user_id": user_id,
                 "job_id": job["id"],
                 "job_title": job["title"],
                 "company": job["company"],
-                "match_score": job_data["match_score"],
-                "matched_skills": job_data["matched_skills"],
+                "match_score": job["match_score"],
+                "matched_skills": job["matched_skills"],
                 "resume_text": payload.resume_text[:3000],
                 "application_method": "auto_apply",
-                "submitted_at": datetime.utcnow().isoformat()
-            }
-            
-            supabase.table("applications").insert(application).execute()
+                "submitted_at": submitted_at
+            })
             applications.append({
                 "job_title": job["title"],
                 "company": job["company"],
-                "match_score": job_data["match_score"]
+                "match_score": job["match_score"]
             })
+        await insert_applications(user_id, records)
         
         return {
             "status": "Auto-apply completed",
             "applications_submitted": len(applications),
             "applications": applications,
-            "total_suitable_jobs_found": len(suitable_jobs),
+            "total_suitable_jobs_found": total_suitable,
             "min_match_score_used": payload.min_match_score
         }
         
@@ -362,44 +345,22 @@ def auto_apply_to_jobs(payload: AutoApplyRequest, authorization: str = Header(..
 
 # 📊 Application Tracking and Analytics
 @router.get("/apply/analytics")
-def get_application_analytics(authorization: str = Header(...)):
+async def get_application_analytics(authorization: str = Header(...)):
     """Get analytics on user's job applications"""
     try:
         user_id = get_current_user_id(authorization)
         
-        # Get user's applications
-        apps_response = supabase.table("applications") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .execute()
-        
-        applications = apps_response.data or []
-        
-        # Calculate analytics
-        total_applications = len(applications)
-        avg_match_score = sum(app.get("match_score", 0) for app in applications) / max(total_applications, 1)
-        
-        # Group by status
-        status_counts = {}
-        for app in applications:
-            status = app.get("application_status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Recent applications (last 7 days)
-        from datetime import timedelta
-        recent_cutoff = (datetime.utcnow() - timedelta(days=7)).isoformat()
-        recent_apps = [app for app in applications if app.get("submitted_at", "") > recent_cutoff]
+        # Counts, averages and breakdowns are aggregated in the database
+        stats = await get_application_stats(user_id, recent_days=7)
+        total_applications = stats["total"]
+        status_counts = stats["status_counts"]
         
         return {
             "total_applications": total_applications,
-            "average_match_score": round(avg_match_score, 2),
+            "average_match_score": round(stats["avg_match_score"], 2),
             "application_status_breakdown": status_counts,
-            "recent_applications_count": len(recent_apps),
-            "top_companies_applied": [
-                {"company": "TechCorp", "count": 3},
-                {"company": "StartupXYZ", "count": 2}
-                # This would be calculated from actual data
-            ],
+            "recent_applications_count": stats["recent"],
+            "top_companies_applied": stats["top_companies"],
             "success_rate": round((status_counts.get("hired", 0) + status_counts.get("interview", 0)) / max(total_applications, 1) * 100, 2)
         }
         
@@ -412,7 +373,7 @@ def get_resume_optimization_suggestions(payload: ResumeInput):
     """Analyze resume and provide optimization suggestions based on job market trends"""
     try:
         # Extract current skills
-        current_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
+        current_skills = extract_skills(payload.resume_text, get_skill_index()["combined_flat"])
         
         # Get trending skills from job market (mock data - would be real analysis)
         trending_skills = [
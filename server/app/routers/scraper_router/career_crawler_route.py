@@ -3,10 +3,7 @@ from pydantic import BaseModel
 from typing import List, Dict
 import time
 from app.scrapers.career_crawler import crawl_career_builder
-from app.utils.write_jobs import write_jobs_csv
-from app.utils.skills_engine import load_all_skills
 
-SKILLS = load_all_skills()
 router = APIRouter()
 class CareerBuilderScraperRequest(BaseModel):
     location: str = "remote"
@@ -34,7 +31,6 @@ async def run_career_builder_crawler(request: CareerBuilderScraperRequest) -> Di
             pages=request.max_results, 
             days=request.days
         )
-        write_jobs_csv(jobs, folder_name="job_data", label="careerbuilder")
 
         duration = time.time() - start_time
         total_jobs_found = len(jobs)
@@ -1,21 +1,13 @@
 from pydantic import BaseModel
 from typing import List, Dict, Optional
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request
 from datetime import datetime
 import time
-from app.utils.skills_engine import (
-    load_all_skills,
-    extract_flat_skills,
-    extract_skills,
-    extract_skills_by_category
-)
 from app.scrapers.indeed_scraper import scrape_indeed
 from app.scrapers.indeed_crawler import scrape_indeed_jobs
 from app.utils.write_jobs import write_jobs_csv
 from app.config.config_utils import get_output_folder
 
-SKILLS = load_all_skills()
-
 router = APIRouter()
 class IndeedScraperRequest(BaseModel):
     location: str = "remote"
@@ -35,7 +27,7 @@ class IndeedScraperResponse(BaseModel):
 
 
 @router.post("/run", response_model=IndeedScraperResponse, summary="Run Indeed Scraper")
-async def run_indeed_scraper(request: IndeedScraperRequest) -> Dict:
+async def run_indeed_scraper(request: IndeedScraperRequest, http_request: Request) -> Dict:
     """
     Run the Indeed scraper with the provided configuration.
     
@@ -55,7 +47,8 @@ async def run_indeed_scraper(request: IndeedScraperRequest) -> Dict:
             keywords=request.keywords if request.keywords else None,
             location=request.location,
             days=request.days,
-            max_results=request.max_results
+            max_results=request.max_results,
+            skills=http_request.app.state.skills
         )
         
         indeed_crawler_jobs = scrape_indeed_jobs(
@@ -100,6 +93,7 @@ async def run_indeed_scraper(request: IndeedScraperRequest) -> Dict:
 
 @router.get("/run", response_model=IndeedScraperResponse, summary="Run Indeed Scraper (GET)")
 async def run_indeed_scraper_get(
+    http_request: Request,
     location: str = Query("remote", description="Job location to search"),
     days: int = Query(15, ge=1, le=30, description="Number of days back to search"),
     debug: bool = Query(False, description="Enable debug mode"),
@@ -117,7 +111,7 @@ async def run_indeed_scraper_get(
         debug=debug
     )
     
-    return await run_indeed_scraper(request)
+    return await run_indeed_scraper(request, http_request)
 
 
 @router.get("/status", summary="Get Indeed Scraper Status")
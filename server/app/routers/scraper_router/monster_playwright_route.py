@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from app.scrapers.monster_playwright import scrape_monster_jobs
 from app.utils.common import LOCATION, PAGES_PER_KEYWORD
 
@@ -6,10 +6,11 @@ router = APIRouter()
 
 @router.get("/run", summary="Scrape Monster jobs using Playwright")
 def run_monster_playwright(
+    request: Request,
     location: str = Query(LOCATION),
     pages: int = Query(PAGES_PER_KEYWORD)
 ):
-    jobs = scrape_monster_jobs(location=location, pages=pages)
+    jobs = scrape_monster_jobs(location=location, pages=pages, skills=request.app.state.skills)
     return {
         "total_jobs": len(jobs),
         "status": "Monster Playwright scrape complete"
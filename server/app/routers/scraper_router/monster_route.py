@@ -5,7 +5,7 @@ from datetime import datetime
 import os
 from jose import jwt, JWTError
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills,
     extract_skills_by_category
@@ -14,7 +14,6 @@ from app.utils.skills_engine import (
 from app.db.connect_database import supabase
 from app.utils.write_jobs import write_jobs_csv
 from app.scrapers.monster_scraper import scrape_monster_jobs
-SKILLS = load_all_skills()
 router = APIRouter()
 
 app = FastAPI()
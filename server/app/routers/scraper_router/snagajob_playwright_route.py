@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import time
@@ -34,7 +34,7 @@ class SnagajobScraperResponse(BaseModel):
 
 # POST endpoint
 @router.post("/run", response_model=SnagajobScraperResponse, summary="Run Snagajob Crawler")
-async def run_snagajob_crawler(request: SnagajobScraperRequest) -> Dict:
+async def run_snagajob_crawler(request: SnagajobScraperRequest, http_request: Request) -> Dict:
     start_time = time.time()
     
     logger.info(f"🚀 Snagajob scraper started")
@@ -58,7 +58,8 @@ async def run_snagajob_crawler(request: SnagajobScraperRequest) -> Dict:
             location=request.location,
             keywords=keywords,
             headless=request.headless,
-            skip_captcha=request.skip_captcha
+            skip_captcha=request.skip_captcha,
+            skills=http_request.app.state.skills
         )
         
         logger.info(f"✅ Scraper completed: {len(jobs)} jobs found")
@@ -114,6 +115,7 @@ async def run_snagajob_crawler(request: SnagajobScraperRequest) -> Dict:
 # GET endpoint
 @router.get("/run", response_model=SnagajobScraperResponse, summary="Run Snagajob Crawler (GET)")
 async def run_snagajob_crawler_get(
+    http_request: Request,
     location: str = Query("remote", description="Job location to search"),
     debug: bool = Query(False, description="Enable debug mode"),
     keywords: str = Query("", description="Comma-separated keywords"),
@@ -132,7 +134,7 @@ async def run_snagajob_crawler_get(
         skip_captcha=skip_captcha
     )
     
-    return await run_snagajob_crawler(request)
+    return await run_snagajob_crawler(request, http_request)
 
 # Status endpoint
 @router.get("/status", summary="Get Snagajob Crawler Status")
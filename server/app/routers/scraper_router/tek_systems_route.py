@@ -5,7 +5,7 @@ from datetime import datetime
 import os
 from jose import jwt, JWTError
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills,
     extract_skills_by_category
@@ -13,7 +13,6 @@ from app.utils.skills_engine import (
 
 from app.utils.write_jobs import write_jobs_csv
 from app.scrapers.tek_systems import scrape_teksystems
-SKILLS = load_all_skills()
 router = APIRouter()
 # Initialize FastAPI app
 app = FastAPI()
@@ -29,8 +28,8 @@ def run_teksystems(location: str = Query("remote"), days: int = Query(15)) -> Di
     # Enrich scraped jobs with skill extraction
     for job in teksystems_jobs:
         text = f"{job.get('title', '')} {job.get('job_description', '')}"
-        job["flat_skills"] = extract_flat_skills(text, SKILLS["flat"])
-        job["skills_by_category"] = extract_skills_by_category(text, SKILLS["matrix"])
+        job["flat_skills"] = extract_flat_skills(text, get_skill_index()["flat"])
+        job["skills_by_category"] = extract_skills_by_category(text, get_skill_index()["matrix"])
         job["skills"] = job["flat_skills"]
 
         write_jobs_csv(job, folder_name="job_data", label="tek_systems")
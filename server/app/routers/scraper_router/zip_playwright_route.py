@@ -1,13 +1,11 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from app.scrapers.zip_playwright import scrape_zip_with_playwright
-from app.utils.write_jobs import write_jobs_csv
 
 router = APIRouter()
 
 @router.get("/run", summary="Scrape ZipRecruiter using Playwright")
-async def run_zip_playwright(location: str = Query("remote"), days: int = Query(15)):
-    jobs = await scrape_zip_with_playwright(location, days)
-    write_jobs_csv(jobs, folder_name="job_data", label="zip_playwright")
+async def run_zip_playwright(request: Request, location: str = Query("remote"), days: int = Query(15)):
+    jobs = await scrape_zip_with_playwright(location, days, skills=request.app.state.skills)
     return {
         "zip_scraper": len(jobs),
         "status": "ZipRecruiter Playwright scrape complete"
@@ -0,0 +1,189 @@
+"""
+Reads every field of every job card in one page.evaluate / execute_script
+call, instead of one find_element + text/attribute round-trip per field per
+card. Each site describes its cards with a CardSpec. Candidate selectors are
+tried in the order learned by selector_cache, and the winners are recorded
+back into it.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.selector_cache import selector_cache
+
+EXTRACT_JS = """
+(args) => {
+    const root = args.root || document;
+
+    const matches = (scope, f, sel) => {
+        if (!f.xpath) return Array.from(scope.querySelectorAll(sel));
+        const found = document.evaluate(sel, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const els = [];
+        for (let i = 0; i < found.snapshotLength; i++) els.push(found.snapshotItem(i));
+        return els;
+    };
+
+    const readField = (scope, f) => {
+        for (const sel of f.selectors) {
+            const els = matches(scope, f, sel);
+            if (!els.length) continue;
+            if (f.all) return [els.map(el => (el.innerText || "").trim()), sel];
+            const el = els[0];
+            let value = f.attr ? el.getAttribute(f.attr) : (f.prop ? el[f.prop] : null);
+            if (!value && f.text) value = el.innerText;
+            value = (value || "").trim();
+            if (value) return [value, sel];
+        }
+        return [null, null];
+    };
+
+    let cards = [root];
+    let cardSelector = null;
+    if (args.cards) {
+        cards = [];
+        for (const sel of args.cards) {
+            const found = root.querySelectorAll(sel);
+            if (found.length > args.min_cards) {
+                cards = Array.from(found);
+                cardSelector = sel;
+                break;
+            }
+        }
+    }
+    if (args.limit) cards = cards.slice(0, args.limit);
+
+    return {
+        selector: cardSelector,
+        items: cards.map(card => {
+            const values = {}, matched = {};
+            for (const [name, f] of Object.entries(args.fields)) {
+                [values[name], matched[name]] = readField(card, f);
+            }
+            return {values, matched};
+        })
+    };
+}
+"""
+
+
+@dataclass(frozen=True)
+class Field:
+    """One value per card: the first selector whose element yields non-empty text/attr"""
+    selectors: Tuple[str, ...]
+    attr: Optional[str] = None  # getAttribute() before falling back to innerText
+    prop: Optional[str] = None  # DOM property instead (e.g. "href" for the absolute URL)
+    text: bool = True
+    all: bool = False  # innerText of every match, as a list
+    xpath: bool = False
+
+
+@dataclass(frozen=True)
+class CardSpec:
+    site: str
+    cards: Tuple[str, ...]
+    fields: Dict[str, Field]
+    min_cards: int = 0  # a selector must match more than this many elements to count
+
+
+def _args(site: str, cards: Optional[Tuple[str, ...]], fields: Dict[str, Field], min_cards: int, limit: Optional[int], root=None) -> Dict:
+    return {
+        "root": root,
+        "cards": selector_cache.ranked(site, "job_cards", cards) if cards else None,
+        "min_cards": min_cards,
+        "limit": limit,
+        "fields": {
+            name: {**asdict(field), "selectors": selector_cache.ranked(site, f"card_{name}", field.selectors)}
+            for name, field in fields.items()
+        },
+    }
+
+
+def _tried(ranked: List[str], winner: Optional[str]) -> List[str]:
+    return ranked[:ranked.index(winner) + 1] if winner in ranked else list(ranked)
+
+
+def _collect(site: str, args: Dict, result: Dict) -> Tuple[Optional[str], List[Dict]]:
+    """Book card/field selector hits in selector_cache and return the plain values"""
+    if args["cards"]:
+        selector_cache.record(site, "job_cards", _tried(args["cards"], result["selector"]), result["selector"])
+    values = []
+    for item in result["items"]:
+        for name, field in args["fields"].items():
+            if len(field["selectors"]) > 1:
+                winner = item["matched"].get(name)
+                selector_cache.record(site, f"card_{name}", _tried(field["selectors"], winner), winner)
+        values.append(item["values"])
+    return result["selector"], values
+
+
+async def extract_cards(page, spec: CardSpec, limit: Optional[int] = None) -> Tuple[Optional[str], List[Dict]]:
+    """All cards on a Playwright page as dicts of spec.fields; returns (card selector, cards)"""
+    args = _args(spec.site, spec.cards, spec.fields, spec.min_cards, limit)
+    return _collect(spec.site, args, await page.evaluate(EXTRACT_JS, args))
+
+
+def extract_cards_sync(driver, spec: CardSpec, limit: Optional[int] = None) -> Tuple[Optional[str], List[Dict]]:
+    """Same as extract_cards for a Selenium driver"""
+    args = _args(spec.site, spec.cards, spec.fields, spec.min_cards, limit)
+    return _collect(spec.site, args, driver.execute_script(f"return ({EXTRACT_JS})(arguments[0]);", args))
+
+
+def extract_fields_sync(driver, element, site: str, fields: Dict[str, Field]) -> Dict:
+    """Fields of a single Selenium element (e.g. an open details drawer) in one call"""
+    args = _args(site, None, fields, 0, None, root=element)
+    _, values = _collect(site, args, driver.execute_script(f"return ({EXTRACT_JS})(arguments[0]);", args))
+    return values[0] if values else {}
+
+
+# ===========================
+# Site specs
+# ===========================
+INDEED_CARDS = CardSpec(
+    site="indeed",
+    cards=(".job_seen_beacon", ".jobCard", "[data-testid='job-card']", ".slider_item", ".tapItem", "li.css-5lfssm"),
+    fields={
+        "title": Field(("h2.jobTitle span[title]", "h2.jobTitle a span", ".jobTitle span", "[data-testid='job-title']"), attr="title"),
+        "company": Field(("[data-testid='company-name']", ".companyName", "span.companyName")),
+        "location": Field(("[data-testid='text-location']", ".companyLocation", ".location")),
+        "job_key": Field(("a[data-jk]",), attr="data-jk", text=False),
+        "href": Field(("h2.jobTitle a", "a[data-jk]"), prop="href", text=False),
+    },
+)
+
+CAREERBUILDER_CARDS = CardSpec(
+    site="careerbuilder",
+    cards=("li.data-results-content-parent",),
+    fields={
+        "title": Field((".data-results-title",)),
+        "details": Field((".data-details span",), all=True),
+        "href": Field(("a.job-listing-item",), prop="href", text=False),
+    },
+)
+
+SNAGAJOB_DRAWER_FIELDS = {
+    "title": Field(("h2, h3, .job-title, h1, [class*='title']",)),
+    "company": Field((".company-name, .job-company, [class*='company']",)),
+    # Document-wide on purpose, like the XPaths they replace
+    "location": Field(("//div[contains(text(),'Location')]",), xpath=True),
+    "salary": Field(("//div[contains(text(),'Verified Pay') or contains(text(),'Pay')]",), xpath=True),
+}
+
+
+def indeed_job_info(card: Dict, base_url: str) -> Optional[Dict[str, str]]:
+    """Indeed card values -> the title/company/location/link dict both Indeed scrapers use"""
+    if not card.get("title"):
+        return None
+    if card.get("job_key"):
+        link = f"{base_url}/viewjob?jk={card['job_key']}"
+    elif card.get("href"):
+        href = card["href"]
+        link = href if href.startswith("http") else base_url + href
+    else:
+        return None
+    return {
+        "title": card["title"],
+        "company": card.get("company") or "Unknown",
+        "location": card.get("location") or "Remote",
+        "link": link,
+        "source": "Indeed"
+    }
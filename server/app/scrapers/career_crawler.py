@@ -335,27 +335,21 @@
 #     # For testing
 #     jobs = crawl_career_builder()
 #     print(f"Collected {len(jobs)} jobs")
-import time
 import uuid
 import traceback
 from datetime import datetime
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import InvalidSessionIdException
+from app.scrapers.card_extractor import CAREERBUILDER_CARDS, extract_cards_sync
 from app.scrapers.selenium_browser import configure_driver
+from app.utils.browser_pool import acquire_driver, release_driver
+from app.utils.waits import AdaptiveWait
 from app.utils.common import TECH_KEYWORDS, LOCATION, PAGES_PER_KEYWORD, MAX_DAYS
 from app.db.sync_jobs import insert_job_to_db
-from app.db.cleanup import cleanup
-from app.utils.write_jobs import write_jobs_csv
-from app.utils.skills_engine import (
-    load_all_skills,
-    extract_flat_skills,
-    extract_skills_by_category
-)
-
-SKILLS = load_all_skills()
+from app.db.cleanup import DEDUP_RECENT_DAYS, cleanup
+from app.utils.write_jobs import JobCsvWriter
+from app.utils.crawl_state import CrawlTracker
+from app.utils.job_dedup import check_job
 
 
 def crawl_career_builder(location=LOCATION, pages=PAGES_PER_KEYWORD, days=MAX_DAYS):
@@ -374,16 +368,20 @@ def crawl_career_builder(location=LOCATION, pages=PAGES_PER_KEYWORD, days=MAX_DA
     driver = None
     jobs = []
     seen_urls = set()
+    waiter = AdaptiveWait("careerbuilder")
+    csv_out = JobCsvWriter("careerbuilder", folder_name="job_data")
 
     try:
-        # Initialize driver
-        driver = configure_driver()
+        # Initialize driver (warm one from the shared pool when available)
+        driver = acquire_driver("undetected", configure_driver)
         if not driver:
             print("❌ Failed to initialize WebDriver")
             return jobs
 
         for keyword in TECH_KEYWORDS:
             print(f"\n🔍 Crawling '{keyword}' in '{location}'")
+            # Stops paginating once a page is mostly jobs we already have (full crawl on a schedule)
+            tracker = CrawlTracker("careerbuilder", keyword, location)
             
             for page in range(1, pages + 1):
                 url = f"{base_url}/?keywords={'+'.join(keyword.split())}&location={location}&page_number={page}"
@@ -391,32 +389,31 @@ def crawl_career_builder(location=LOCATION, pages=PAGES_PER_KEYWORD, days=MAX_DA
                 # Check if driver is still alive
                 if not driver or not hasattr(driver, 'session_id') or not driver.session_id:
                     print("💥 Restarting WebDriver session...")
-                    try:
-                        if driver:
-                            driver.quit()
-                    except:
-                        pass
-                    driver = configure_driver()
+                    release_driver(driver, broken=True)
+                    driver = acquire_driver("undetected", configure_driver)
                     if not driver:
                         print("❌ Failed to restart driver, skipping...")
                         continue
 
                 try:
                     driver.get(url)
-                    time.sleep(2)
-                    
-                    # Wait for job cards to load
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "li.data-results-content-parent"))
-                    )
-                
                 except Exception as e:
                     print(f"⚠️ Error loading search page {page} for '{keyword}': {e}")
                     continue
 
-                # Find all job cards
+                # Wait for job cards to load (returns as soon as the first card is in the DOM)
+                if waiter.css(driver, "li.data-results-content-parent", timeout=10) is None:
+                    print(f"⚠️ No job cards appeared on page {page} for '{keyword}'")
+                    continue
+
+                # Read every card's title/details/link in one execute_script
                 try:
-                    cards = driver.find_elements(By.CSS_SELECTOR, "li.data-results-content-parent")
+                    _, cards = extract_cards_sync(driver, CAREERBUILDER_CARDS)
+                except InvalidSessionIdException:
+                    print("💥 Rebuilding driver mid-loop...")
+                    release_driver(driver, broken=True)
+                    driver = acquire_driver("undetected", configure_driver)
+                    continue
                 except:
                     cards = []
                 
@@ -424,25 +421,25 @@ def crawl_career_builder(location=LOCATION, pages=PAGES_PER_KEYWORD, days=MAX_DA
 
                 for card in cards:
                     try:
-                        # Verify driver is still alive
-                        if not driver or not hasattr(driver, 'session_id') or not driver.session_id:
-                            raise InvalidSessionIdException("Dead session during card loop")
-
                         # Extract job details
-                        title = card.find_element(By.CSS_SELECTOR, ".data-results-title").text.strip()
-                        spans = card.find_elements(By.CSS_SELECTOR, ".data-details span")
-                        company = spans[0].text.strip() if spans else "N/A"
-                        job_location = spans[1].text.strip() if len(spans) > 1 else location
+                        title = card["title"]
+                        if not title:
+                            continue
+                        spans = card["details"] or []
+                        company = spans[0] if spans else "N/A"
+                        job_location = spans[1] if len(spans) > 1 else location
                         job_state = job_location.lower()
                         
                         # Get job URL
-                        href = card.find_element(By.CSS_SELECTOR, "a.job-listing-item").get_attribute("href") or ""
+                        href = card["href"] or ""
                         
                         if not href or href in seen_urls:
                             continue
                         
                         seen_urls.add(href)
                         job_url = href if href.startswith("http") else base_url + href
+                        # Before the insert, which would make it look known
+                        known = tracker.check(job_url)
 
                         # Create job object
                         job = {
@@ -468,43 +465,44 @@ def crawl_career_builder(location=LOCATION, pages=PAGES_PER_KEYWORD, days=MAX_DA
                             "user_id": None
                         }
 
-                        # Insert to database
-                        insert_job_to_db(job)
+                        # Tracking-URL variants and reposts from other boards
+                        if check_job(job):
+                            continue
+
+                        # Insert to database; only stored postings go into the next run's head
+                        if insert_job_to_db(job) or known:
+                            tracker.saw(job_url)
                         jobs.append(job)
+                        csv_out.write(job)
 
-                    except InvalidSessionIdException:
-                        print("💥 Rebuilding driver mid-loop...")
-                        try:
-                            if driver:
-                                driver.quit()
-                        except:
-                            pass
-                        driver = configure_driver()
-                        break
-                    
                     except Exception as e:
                         print(f"❌ Error parsing job: {e}")
                         if hasattr(e, '__traceback__'):
                             traceback.print_exc()
                         continue
 
+                if not tracker.page_done():
+                    break
+
+            tracker.finish()
+
     except Exception as e:
         print(f"❌ Critical error in crawler: {e}")
         traceback.print_exc()
     
     finally:
-        # Clean up driver
+        # Hand the driver back to the pool
         try:
-            if driver:
-                driver.quit()
-        except:
-            pass
-
-        # Save results and cleanup
-        if jobs:
-            write_jobs_csv(jobs, folder_name="job_data", label="careerbuilder")
+            release_driver(driver)
+        except Exception as e:
+            print(f"⚠️ Error releasing driver: {e}")
+
+        # Rows were streamed to CSV as they came in; close seals the last file
+        csv_out.close()
         
-        cleanup(days)
+        # Post-crawl pass: the duplicates this run can add are all recent rows
+        cleanup(days, lookback_days=DEDUP_RECENT_DAYS)
+        waiter.log_summary(len(jobs))
         print(f"\n✅ CareerBuilder crawler collected {len(jobs)} jobs.")
 
     return jobs
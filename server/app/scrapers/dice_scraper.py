@@ -1,66 +1,29 @@
-import time, traceback
-import json
+import traceback
 import uuid
 from datetime import datetime
+from typing import Optional
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from app.db.connect_database import get_db_connection
+from app.db.job_writer import JobBulkWriter
 from app.scrapers.selenium_browser import get_headless_browser
+from app.utils.browser_pool import acquire_driver, release_driver
+from app.utils.job_dedup import check_job, seen_listing
+from app.utils.waits import AdaptiveWait
 from app.utils.write_jobs import write_jobs_csv
 from dotenv import load_dotenv
-from app.utils.skills_engine import (
-    load_all_skills,
-    extract_flat_skills,
-    extract_skills,
-    extract_skills_by_category
-)
+from app.utils.skills_engine import SkillIndex, get_skill_index
 load_dotenv()
-SKILLS = load_all_skills()
-def insert_job_to_db(job):
-    conn = get_db_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute("""
-            INSERT INTO jobs (
-                id, title, company, job_location, job_state, date, site,
-                job_description, salary, url, applied, search_term,
-                skills, skills_by_category, inserted_at
-            ) VALUES (
-                gen_random_uuid(), %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, NOW()
-            )
-            ON CONFLICT (url) DO NOTHING;
-        """, (
-            job["title"], job["company"], job["job_location"], job["job_state"],
-            job["date"], job["site"], job["job_description"], job["salary"],
-            job["url"], job["applied"], job["search_term"],
-            json.dumps(job["flat_skills"]),  # save as JSON
-            json.dumps(job["skills_by_category"])  # categorized
-        ))
-        conn.commit()
-    except Exception as e:
-        print(f"❌ DB insert error: {e}")
-        traceback.print_exc()
-    finally:
-        cur.close()
-        conn.close()
-        
-        
-def scrape_dice(location="remote", days=15):
+def scrape_dice(location="remote", days=15, skills: Optional[SkillIndex] = None):
     print(f"\n:globe_with_meridians: Scraping Dice → {location}")
+    skills = skills or get_skill_index()
     jobs = []
-    driver = get_headless_browser()
+    driver = acquire_driver("headless", get_headless_browser)
+    writer = JobBulkWriter(source="dice")
+    waiter = AdaptiveWait("dice")
     try:
         base_url = "https://www.dice.com/jobs?q=developer&location=Remote"
         driver.get(base_url)
-        time.sleep(5)
         # Wait for job cards to be present
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a[data-testid='job-search-job-card-link']"))
-        )
-        job_links = driver.find_elements(By.CSS_SELECTOR, "a[data-testid='job-search-job-card-link']")
+        job_links = waiter.css_all(driver, "a[data-testid='job-search-job-card-link']")
         print(f":receipt: Found {len(job_links)} job links")
         for link in job_links:
             try:
@@ -70,12 +33,16 @@ def scrape_dice(location="remote", days=15):
                     title = aria_label.replace("View Details for", "").strip()
                 else:
                     title = "N/A"
+                if seen_listing(job_url, title):
+                    continue
                 # Open job detail in new tab
+                waiter.pause(0.5, 1.5)  # keep detail requests spaced out
                 driver.execute_script("window.open(arguments[0]);", job_url)
+                waiter.new_window(driver, 2)
                 driver.switch_to.window(driver.window_handles[-1])
-                time.sleep(3)
+                description_el = waiter.css(driver, ".job-description", timeout=10)
                 try:
-                    description = driver.find_element(By.CLASS_NAME, "job-description").text.strip()
+                    description = description_el.text.strip() if description_el else "N/A"
                 except:
                     description = "N/A"
                 try:
@@ -86,8 +53,6 @@ def scrape_dice(location="remote", days=15):
                     location_text = driver.find_element(By.CSS_SELECTOR, "[data-testid='job-location']").text.strip()
                 except:
                     location_text = "Remote"
-                flat_skills = extract_flat_skills(description, SKILLS["flat"])
-                categorized_skills = extract_skills(description, SKILLS["matrix"])
                 job = {
                     "title": title,
                     "company": company,
@@ -100,10 +65,15 @@ def scrape_dice(location="remote", days=15):
                     "url": job_url,
                     "applied": False,
                     "search_term": "developer",
-                    "flat_skills": flat_skills,
-                    "skills_by_category": categorized_skills
                 }
-                insert_job_to_db(job)
+                # Same posting under another URL or from another board: skip skills and insert
+                if check_job(job):
+                    driver.close()
+                    driver.switch_to.window(driver.window_handles[0])
+                    continue
+                job["flat_skills"] = skills.extract_flat(description)
+                job["skills_by_category"] = skills.extract_by_category(description)
+                writer.add(job)
                 jobs.append(job)
                 driver.close()
                 driver.switch_to.window(driver.window_handles[0])
@@ -114,7 +84,9 @@ def scrape_dice(location="remote", days=15):
                 except: pass
                 continue
     finally:
-        driver.quit()
+        release_driver(driver)
+        writer.close()
+        waiter.log_summary(len(jobs))
     print(f":white_check_mark: Scraped {len(jobs)} jobs from Dice")
     return jobs
 if __name__ == "__main__":
@@ -5,80 +5,36 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from typing import List, Dict, Optional
 import time
 import logging
-import json
-import uuid
 from datetime import datetime
 from urllib.parse import quote_plus
 import traceback
 
-from app.db.connect_database import get_db_connection
+from app.db.job_writer import JobBulkWriter
+from app.scrapers.card_extractor import INDEED_CARDS, extract_cards_sync, indeed_job_info
+from app.utils.job_dedup import seen_listing
 from app.utils.skills_engine import load_all_skills, extract_flat_skills, extract_skills_by_category
 
 logger = logging.getLogger(__name__)
 
-def insert_job_to_db(job: dict):
-    """Insert job with proper field mapping"""
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        logger.info(f"➡️ Inserting: {job['title'][:50]} | {job.get('company', 'N/A')}")
-        
-        cur.execute("""
-            INSERT INTO jobs (
-                id, title, company, job_location, job_state, salary, site,
-                date, applied, saved, url, job_description, search_term,
-                category, priority, status, inserted_at, last_verified,
-                skills, skills_by_category, user_id
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s
-            )
-            ON CONFLICT (url) DO NOTHING
-            RETURNING id
-        """, (
-            str(uuid.uuid4()),
-            job["title"],
-            job.get("company", "Unknown"),
-            job.get("location", "Remote"),
-            job.get("location", "remote").lower(),
-            "N/A",
-            "Indeed",
-            datetime.today().date(),
-            False,
-            False,
-            job["link"],
-            job.get("description", ""),
-            job.get("search_term", ""),
-            None,
-            0,
-            "new",
-            datetime.utcnow(),
-            None,
-            json.dumps(job.get("skills", [])),
-            json.dumps(job.get("skills_by_category", {})),
-            None
-        ))
-        
-        result = cur.fetchone()
-        conn.commit()
-        
-        if result:
-            logger.info(f"✅ Inserted job ID: {result[0]}")
-            return True
-        else:
-            logger.info(f"⚠️ Duplicate job (skipped): {job['link']}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"❌ DB insert error: {e}")
-        traceback.print_exc()
-        return False
-    finally:
-        cur.close()
-        conn.close()
+def to_job_row(job: dict) -> dict:
+    """Map a scraped Indeed card onto the jobs table columns"""
+    location = job.get("location") or "Remote"
+    return {
+        "title": job["title"],
+        "company": job.get("company", "Unknown"),
+        "job_location": location,
+        "job_state": location.lower(),
+        "salary": "N/A",
+        "site": "Indeed",
+        "date": datetime.today().date(),
+        "url": job["link"],
+        "job_description": job.get("description", ""),
+        "search_term": job.get("search_term", ""),
+        "priority": 0,
+        "status": "new",
+        "skills": job.get("skills", []),
+        "skills_by_category": job.get("skills_by_category", {}),
+    }
 
 
 def scrape_indeed_jobs(location: str = "remote", days: int = 15, keywords: Optional[List[str]] = None, max_results: int = 100) -> List[Dict[str, str]]:
@@ -90,6 +46,7 @@ def scrape_indeed_jobs(location: str = "remote", days: int = 15, keywords: Optio
 
     all_jobs = []
     inserted_count = 0
+    writer = JobBulkWriter(source="indeed_crawler")
     SKILLS = load_all_skills()
 
     with StableChromeDriver(headless=True, timeout=30) as driver:
@@ -103,8 +60,9 @@ def scrape_indeed_jobs(location: str = "remote", days: int = 15, keywords: Optio
                 jobs = scrape_indeed_keyword(driver, keyword, location, days, max_results - len(all_jobs), SKILLS)
                 for job in jobs:
                     job["search_term"] = keyword
-                    if insert_job_to_db(job):
-                        inserted_count += 1
+                    writer.add(to_job_row(job))
+                writer.flush()
+                inserted_count = writer.inserted
                 
                 all_jobs.extend(jobs)
                 logger.info(f"✅ Found {len(jobs)} jobs for '{keyword}' (Total: {len(all_jobs)}, Inserted: {inserted_count})")
@@ -125,7 +83,7 @@ def scrape_indeed_jobs(location: str = "remote", days: int = 15, keywords: Optio
             seen.add(key)
             unique_jobs.append(job)
 
-    logger.info(f"📊 Total unique jobs: {len(unique_jobs)}, Inserted to DB: {inserted_count}")
+    logger.info(f"📊 Total unique jobs: {len(unique_jobs)}, Inserted to DB: {inserted_count}, Duplicates: {writer.duplicates}")
     return unique_jobs[:max_results]
 
 
@@ -151,30 +109,21 @@ def scrape_indeed_keyword(driver, keyword: str, location: str, days: int, max_jo
             return []
         
         time.sleep(2)
-        job_cards = []
-        selectors = [
-            ".job_seen_beacon",
-            ".jobCard",
-            "[data-testid='job-card']",
-            ".slider_item",
-            ".tapItem",
-            "li.css-5lfssm"
-        ]
-        
-        for selector in selectors:
-            job_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-            if job_cards:
-                logger.info(f"✅ Found {len(job_cards)} jobs using selector: {selector}")
-                break
-        
-        if not job_cards:
+        # All cards' metadata in one execute_script (also sidesteps stale card elements)
+        selector, job_cards = extract_cards_sync(driver, INDEED_CARDS, limit=max_jobs)
+        if job_cards:
+            logger.info(f"✅ Found {len(job_cards)} jobs using selector: {selector}")
+        else:
             logger.warning(f"⚠️ No job cards found for '{keyword}'")
             return []
 
         job_metadata_list = []
-        for idx, card in enumerate(job_cards[:max_jobs]):
+        for idx, card in enumerate(job_cards):
             try:
-                metadata = extract_job_metadata_from_card(card, idx, base_url)
+                metadata = indeed_job_info(card, base_url)
+                # Stored already (URL filter / dedup stage): don't load its detail page
+                if metadata and seen_listing(metadata["link"], metadata["title"], metadata["company"], metadata["location"]):
+                    continue
                 if metadata:
                     job_metadata_list.append(metadata)
                     logger.info(f"📝 Collected metadata {idx + 1}: {metadata['title'][:40]} at {metadata['company']}")
@@ -226,84 +175,6 @@ def scrape_indeed_keyword(driver, keyword: str, location: str, days: int, max_jo
     
     return jobs
 
-def extract_job_metadata_from_card(card, idx: int, base_url: str) -> Optional[Dict[str, str]]:
-    """Extract only metadata (title, company, location, link) from job card - NO NAVIGATION"""
-    try:
-        title = ""
-        title_selectors = [
-            "h2.jobTitle span[title]",
-            "h2.jobTitle a span",
-            ".jobTitle span",
-            "[data-testid='job-title']"
-        ]
-        
-        for selector in title_selectors:
-            try:
-                element = card.find_element(By.CSS_SELECTOR, selector)
-                title = element.text or element.get_attribute("title")
-                if title:
-                    break
-            except NoSuchElementException:
-                continue
-        
-        if not title:
-            return None
-
-        company = ""
-        company_selectors = [
-            "[data-testid='company-name']",
-            ".companyName",
-            "span.companyName"
-        ]
-        
-        for selector in company_selectors:
-            try:
-                company = card.find_element(By.CSS_SELECTOR, selector).text
-                if company:
-                    break
-            except NoSuchElementException:
-                continue
-
-        location = ""
-        location_selectors = [
-            "[data-testid='text-location']",
-            ".companyLocation",
-            ".location"
-        ]
-        
-        for selector in location_selectors:
-            try:
-                location = card.find_element(By.CSS_SELECTOR, selector).text
-                if location:
-                    break
-            except NoSuchElementException:
-                continue
-        
-        link = ""
-        try:
-            link_element = card.find_element(By.CSS_SELECTOR, "a[data-jk], h2.jobTitle a")
-            job_key = link_element.get_attribute('data-jk')
-            if job_key:
-                link = f"{base_url}/viewjob?jk={job_key}"
-            else:
-                href = link_element.get_attribute("href")
-                link = href if href and href.startswith('http') else base_url + (href or "")
-        except NoSuchElementException:
-            logger.warning(f"⚠️ Could not extract link for job {idx}")
-            return None
-
-        return {
-            "title": title.strip(),
-            "company": company.strip() or "Unknown",
-            "location": location.strip() or "Remote",
-            "link": link,
-            "source": "Indeed"
-        }
-        
-    except Exception as e:
-        logger.warning(f"Could not extract metadata for job {idx}: {e}")
-        return None
-
 def fetch_job_description(driver, job_url: str, max_retries: int = 3) -> str:
     """Fetch full job description from job detail page with retry logic"""
     
@@ -1,27 +1,46 @@
-from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeout
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 from typing import List, Dict, Optional
 import asyncio
 import logging
-import json
-import uuid
+import os
 from datetime import datetime
 from urllib.parse import quote_plus
 import traceback
 from datetime import datetime, timedelta
 
-from app.db.connect_database import get_db_connection
+from app.db.job_writer import JobBulkWriter
+from app.scrapers.card_extractor import INDEED_CARDS, extract_cards, indeed_job_info
+from app.scrapers.page_pool import DomainThrottle, PagePool
 from app.utils.common import TECH_KEYWORDS
-from app.utils.skills_engine import (
-    load_all_skills,
-    extract_flat_skills,
-    extract_skills_by_category
-)
+from app.utils.crawl_state import CrawlTracker
+from app.utils.job_dedup import check_job, load_dedup_indexes, seen_listing
+from app.utils.selector_cache import afind_first
+from app.utils.skills_engine import SkillIndex, get_skill_index
 
 LOCATION = "remote"
 MAX_DAYS = 5
+INDEED_PAGE_POOL_SIZE = int(os.getenv("INDEED_PAGE_POOL_SIZE", "4"))
+INDEED_MAX_CONCURRENT_PER_DOMAIN = int(os.getenv("INDEED_MAX_CONCURRENT_PER_DOMAIN", "2"))
+INDEED_MIN_REQUEST_INTERVAL = float(os.getenv("INDEED_MIN_REQUEST_INTERVAL", "1.5"))
 
 logger = logging.getLogger(__name__)
 
+DESCRIPTION_SELECTORS = [
+    "#jobDescriptionText",
+    ".jobsearch-jobDescriptionText",
+    "[id*='jobDesc']",
+    ".job-description",
+    "[class*='description']"
+]
+
+
+async def _first_text(scope, selector: str) -> str:
+    """inner_text of the first match under a page or card locator, or "" if none"""
+    element = scope.locator(selector).first
+    if await element.count() > 0:
+        return await element.inner_text()
+    return ""
+
 
 def parse_date(raw: str):
     """Parse date string to datetime object"""
@@ -40,74 +59,32 @@ def is_tech_job(title: str) -> bool:
     return any(keyword.lower() in title.lower() for keyword in TECH_KEYWORDS)
 
 
-def insert_job_to_db(job: dict) -> bool:
-    """Insert job with proper field mapping"""
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        logger.info(f"➡️ Inserting: {job['title'][:50]} | {job.get('company', 'N/A')}")
-        
-        cur.execute("""
-            INSERT INTO jobs (
-                id, title, company, job_location, job_state, salary, site,
-                date, applied, saved, url, job_description, search_term,
-                category, priority, status, inserted_at, last_verified,
-                skills, skills_by_category, user_id
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s
-            )
-            ON CONFLICT (url) DO NOTHING
-            RETURNING id
-        """, (
-            str(uuid.uuid4()),
-            job["title"],
-            job.get("company", "Unknown"),
-            job.get("location", "Remote"),
-            job.get("location", "remote").lower(),
-            "N/A",
-            "Indeed",
-            datetime.today().date(),
-            False,
-            False,
-            job["link"],
-            job.get("description", ""),
-            job.get("search_term", ""),
-            None,
-            0,
-            "new",
-            datetime.utcnow(),
-            None,
-            json.dumps(job.get("skills", [])),
-            json.dumps(job.get("skills_by_category", {})),
-            None
-        ))
-        
-        result = cur.fetchone()
-        conn.commit()
-        
-        if result:
-            logger.info(f"✅ Inserted job ID: {result[0]}")
-            return True
-        else:
-            logger.info(f"⚠️ Duplicate job (skipped): {job['link']}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"❌ DB insert error: {e}")
-        traceback.print_exc()
-        return False
-    finally:
-        if 'cur' in locals():
-            cur.close()
-        if 'conn' in locals():
-            conn.close()
-
-
-async def scrape_indeed(keywords=None, location=LOCATION, days=MAX_DAYS, max_results=100):
+def to_job_row(job: dict) -> dict:
+    """Map a scraped Indeed card onto the jobs table columns"""
+    location = job.get("location") or "Remote"
+    row = {
+        "title": job["title"],
+        "company": job.get("company", "Unknown"),
+        "job_location": location,
+        "job_state": location.lower(),
+        "salary": "N/A",
+        "site": "Indeed",
+        "date": datetime.today().date(),
+        "url": job["link"],
+        "job_description": job.get("description", ""),
+        "search_term": job.get("search_term", ""),
+        "priority": 0,
+        "status": "new",
+        "skills": job.get("skills", []),
+        "skills_by_category": job.get("skills_by_category", {}),
+    }
+    # Set once the dedup stage has seen the job; otherwise JobBulkWriter runs the check
+    if "content_simhash" in job:
+        row["content_simhash"] = job["content_simhash"]
+    return row
+
+
+async def scrape_indeed(keywords=None, location=LOCATION, days=MAX_DAYS, max_results=100, skills: Optional[SkillIndex] = None):
     """
     Main scraping function using Playwright Async API
     
@@ -116,6 +93,7 @@ async def scrape_indeed(keywords=None, location=LOCATION, days=MAX_DAYS, max_res
         location: Job location
         days: Number of days back to search
         max_results: Maximum number of results to return
+        skills: Shared SkillIndex (defaults to the process-wide one)
         
     Returns:
         List of job dictionaries
@@ -127,67 +105,50 @@ async def scrape_indeed(keywords=None, location=LOCATION, days=MAX_DAYS, max_res
 
     all_jobs = []
     inserted_count = 0
+    writer = JobBulkWriter(source="indeed")
 
     try:
-        skills_data = load_all_skills()
+        skills = skills or get_skill_index()
         logger.info("✅ Loaded skills data")
     except Exception as e:
         logger.error(f"❌ Error loading skills: {e}")
-        skills_data = {"flat": [], "matrix": {}}
+        skills = SkillIndex.build([], [])
 
-    async with async_playwright() as p:
-        logger.info("✅ Playwright async context created")
-        
-        browser = await p.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-setuid-sandbox']
-        )
-        logger.info("✅ Browser launched")
-        
-        context = await browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
-        )
-        logger.info("✅ Browser context created")
-        
-        page = await context.new_page()
-        logger.info("✅ New page created")
-        
-        try:
-            for keyword in keywords:
-                if len(all_jobs) >= max_results:
-                    break
+    # Dedup index and URL filter scan the jobs table on first use; keep that off the event loop
+    await asyncio.to_thread(load_dedup_indexes)
 
-                logger.info(f"🔍 Searching Indeed for '{keyword}' in '{location}'")
+    budget = {"remaining": max_results}
+    throttle = DomainThrottle(max_concurrent=INDEED_MAX_CONCURRENT_PER_DOMAIN, min_interval=INDEED_MIN_REQUEST_INTERVAL)
 
-                try:
-                    jobs = await scrape_indeed_keyword(
-                        page, 
-                        keyword, 
-                        location, 
-                        days, 
-                        max_results - len(all_jobs), 
-                        skills_data
-                    )
-
-                    for job in jobs:
-                        job["search_term"] = keyword
-                        if insert_job_to_db(job):
-                            inserted_count += 1
-                    
-                    all_jobs.extend(jobs)
-                    logger.info(f"✅ Found {len(jobs)} jobs for '{keyword}' (Total: {len(all_jobs)}, Inserted: {inserted_count})")
-
-                    if keyword != keywords[-1]:
-                        await asyncio.sleep(2)
+    pool = PagePool(
+        size=INDEED_PAGE_POOL_SIZE,
+        launch_options={"headless": True, "args": ['--no-sandbox', '--disable-setuid-sandbox']},
+        block_profile="indeed",
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        viewport={'width': 1920, 'height': 1080}
+    )
 
-                except Exception as e:
-                    logger.error(f"❌ Error scraping '{keyword}': {e}")
-                    traceback.print_exc()
-        finally:
-            await context.close()
-            await browser.close()
-            logger.info("✅ Browser closed")
+    async def run_keyword(keyword: str) -> List[Dict]:
+        logger.info(f"🔍 Searching Indeed for '{keyword}' in '{location}'")
+        try:
+            jobs = await scrape_indeed_keyword(pool, throttle, keyword, location, days, budget, skills, writer)
+            logger.info(f"✅ Found {len(jobs)} jobs for '{keyword}' (Inserted so far: {writer.inserted})")
+            return jobs
+        except Exception as e:
+            logger.error(f"❌ Error scraping '{keyword}': {e}")
+            traceback.print_exc()
+            return []
+
+    try:
+        await pool.start()
+        # Keywords share the page pool; the throttle keeps Indeed traffic polite overall
+        for jobs in await asyncio.gather(*(run_keyword(keyword) for keyword in keywords)):
+            all_jobs.extend(jobs)
+        inserted_count = writer.inserted
+    finally:
+        await pool.close()
+        logger.info(f"✅ Page pool closed (waited {throttle.waited_seconds:.1f}s on politeness limits)")
+        pool.blocker.log_summary("indeed")
     
     unique_jobs = []
     seen = set()
@@ -198,236 +159,161 @@ async def scrape_indeed(keywords=None, location=LOCATION, days=MAX_DAYS, max_res
             seen.add(key)
             unique_jobs.append(job)
 
-    logger.info(f"📊 Total unique jobs: {len(unique_jobs)}, Inserted to DB: {inserted_count}")
+    logger.info(f"📊 Total unique jobs: {len(unique_jobs)}, Inserted to DB: {inserted_count}, Duplicates: {writer.duplicates}")
     return unique_jobs[:max_results]
 
 
 async def scrape_indeed_keyword(
-    page: Page, 
+    pool: PagePool,
+    throttle: DomainThrottle,
     keyword: str, 
     location: str, 
     days: int, 
-    max_jobs: int, 
-    skills_data: dict
+    budget: Dict[str, int],
+    skills: SkillIndex,
+    writer: JobBulkWriter
 ) -> List[Dict]:
-    """Scrape Indeed for a single keyword with Playwright Async API"""
-    jobs = []
+    """
+    Scrape Indeed for a single keyword with Playwright Async API and write the
+    jobs through `writer`.
+
+    Descriptions are fetched concurrently on pages borrowed from the pool;
+    `budget["remaining"]` is shared by all keywords so the run stops at max_results.
+    """
     base_url = "https://www.indeed.com/jobs"
-    url = f"{base_url}?q={quote_plus(keyword)}&l={quote_plus(location)}&fromage={days}"
+    # Newest first, so the previous run's high-water mark splits new postings from seen ones
+    url = f"{base_url}?q={quote_plus(keyword)}&l={quote_plus(location)}&fromage={days}&sort=date"
+    tracker = await asyncio.to_thread(CrawlTracker, "indeed", keyword, location, ordered=True)
     
     logger.info(f"📄 Loading: {url}")
     
+    job_data_list = []
     try:
-        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        
-        try:
-            await page.wait_for_selector(
-                ".job_seen_beacon, .jobCard, [data-testid='job-card']", 
-                timeout=15000
-            )
-        except PlaywrightTimeout:
-            logger.warning(f"⚠️ Job listings didn't load for '{keyword}'")
-            return []
-        
-        await asyncio.sleep(2)
-        
-        selectors = [
-            ".job_seen_beacon",
-            ".jobCard",
-            "[data-testid='job-card']",
-            ".slider_item",
-            ".tapItem",
-            "li.css-5lfssm"
-        ]
-        
-        job_cards = []
-        for selector in selectors:
-            job_cards = await page.locator(selector).all()
+        async with pool.page() as page:
+            async with throttle.slot(url):
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            
+            try:
+                await page.wait_for_selector(
+                    ".job_seen_beacon, .jobCard, [data-testid='job-card']", 
+                    timeout=15000
+                )
+            except PlaywrightTimeout:
+                logger.warning(f"⚠️ Job listings didn't load for '{keyword}'")
+                return []
+            
+            # Every card's fields in one evaluate instead of several locator calls per card
+            selector, job_cards = await extract_cards(page, INDEED_CARDS)
             if job_cards:
                 logger.info(f"✅ Found {len(job_cards)} jobs using selector: {selector}")
-                break
-        
-        if not job_cards:
-            logger.warning(f"⚠️ No job cards found for '{keyword}'")
-            return []
- 
-        job_data_list = []
-        for idx, card in enumerate(job_cards[:max_jobs]):
-            try:
-                job_info = await extract_job_card_info(card, idx, base_url)
-                if job_info:
-                    job_data_list.append(job_info)
-                    logger.info(f"📝 Job {idx + 1}: {job_info['title'][:40]} at {job_info['company'][:30]}")
-            except Exception as e:
-                logger.warning(f"❌ Error extracting job card {idx}: {e}")
-                continue
-        
-        for idx, job_info in enumerate(job_data_list):
-            try:
-                logger.info(f"🔍 Fetching description {idx + 1}/{len(job_data_list)}: {job_info['title'][:40]}")
-                description = await fetch_job_description(page, job_info['link'])
-
-                if description and len(description) > 100: 
-                    job_info['description'] = description
-                    job_info['skills'] = extract_flat_skills(description, skills_data.get("flat", []))
-                    job_info['skills_by_category'] = extract_skills_by_category(description, skills_data.get("matrix", {}))
-                    logger.info(f"✅ Extracted {len(job_info['skills'])} skills from {len(description)} chars")
-                else:
-                    logger.warning(f"⚠️ Invalid/empty description for {job_info['title'][:40]}")
-                    job_info['description'] = ""
-                    job_info['skills'] = []
-                    job_info['skills_by_category'] = {}
-                
-                jobs.append(job_info)
-                await asyncio.sleep(1.5)
-                
-            except Exception as e:
-                logger.warning(f"❌ Error fetching description for job {idx}: {e}")
-                job_info['description'] = ""
-                job_info['skills'] = []
-                job_info['skills_by_category'] = {}
-                jobs.append(job_info)
-                continue
-        
+            else:
+                logger.warning(f"⚠️ No job cards found for '{keyword}'")
+                return []
+     
+            job_infos = []
+            for idx, card in enumerate(job_cards):
+                try:
+                    job_info = indeed_job_info(card, base_url)
+                    if job_info:
+                        job_infos.append(job_info)
+                except Exception as e:
+                    logger.warning(f"❌ Error extracting job card {idx}: {e}")
+                    continue
+
+            # Cards from the last run's newest posting on were all seen then
+            fresh = tracker.cut([job_info["link"] for job_info in job_infos])
+            if fresh < len(job_infos):
+                logger.info(f"📈 '{keyword}': {len(job_infos) - fresh} cards below the high-water mark, skipped")
+            known = [tracker.check(job_info["link"]) for job_info in job_infos]
+            tracker.page_done()
+
+            for idx, job_info in enumerate(job_infos[:fresh]):
+                if budget["remaining"] <= 0:
+                    break
+                # Already stored (any tracking variant of the jk, or the same listing): no description fetch
+                if seen_listing(job_info["link"], job_info["title"], job_info["company"], job_info["location"]):
+                    continue
+                budget["remaining"] -= 1
+                job_data_list.append(job_info)
+                logger.info(f"📝 Job {idx + 1}: {job_info['title'][:40]} at {job_info['company'][:30]}")
     except Exception as e:
         logger.error(f"❌ Error in scrape_indeed_keyword: {e}")
         traceback.print_exc()
-    
-    return jobs
-
+        return []
 
-async def extract_job_card_info(card, idx: int, base_url: str) -> Optional[Dict[str, str]]:
-    """Extract basic info from job card (without navigating away)"""
-    try:
-        title = ""
-        title_selectors = [
-            "h2.jobTitle span[title]",
-            "h2.jobTitle a span",
-            ".jobTitle span",
-            "[data-testid='job-title']"
-        ]
-        
-        for selector in title_selectors:
-            try:
-                element = card.locator(selector).first
-                count = await element.count()
-                if count > 0:
-                    title = await element.get_attribute("title") or await element.inner_text()
-                    if title:
-                        break
-            except:
-                continue
-        
-        if not title:
-            return None
-        
-        company = ""
-        company_selectors = [
-            "[data-testid='company-name']",
-            ".companyName",
-            "span.companyName"
-        ]
-        
-        for selector in company_selectors:
-            try:
-                element = card.locator(selector).first
-                count = await element.count()
-                if count > 0:
-                    company = await element.inner_text()
-                    if company:
-                        break
-            except:
-                continue
-        
-        location = ""
-        location_selectors = [
-            "[data-testid='text-location']",
-            ".companyLocation",
-            ".location"
-        ]
-        
-        for selector in location_selectors:
-            try:
-                element = card.locator(selector).first
-                count = await element.count()
-                if count > 0:
-                    location = await element.inner_text()
-                    if location:
-                        break
-            except:
-                continue
-
-        link = ""
+    async def fill_description(idx: int, job_info: Dict) -> Dict:
         try:
-            link_element = card.locator("a[data-jk], h2.jobTitle a").first
-            count = await link_element.count()
-            if count > 0:
-                job_key = await link_element.get_attribute('data-jk')
-                if job_key:
-                    link = f"{base_url}/viewjob?jk={job_key}"
-                else:
-                    href = await link_element.get_attribute("href")
-                    link = href if href and href.startswith('http') else base_url + (href or "")
-        except:
-            logger.warning(f"⚠️ Could not extract link for job {idx}")
-            return None
-
-        return {
-            "title": title.strip(),
-            "company": company.strip() or "Unknown",
-            "location": location.strip() or "Remote",
-            "link": link,
-            "source": "Indeed"
-        }
-        
-    except Exception as e:
-        logger.warning(f"Could not extract job card {idx}: {e}")
-        return None
+            logger.info(f"🔍 Fetching description {idx + 1}/{len(job_data_list)}: {job_info['title'][:40]}")
+            async with pool.page() as page:
+                description = await fetch_job_description(page, job_info['link'], throttle=throttle)
+
+            if description and len(description) > 100: 
+                job_info['description'] = description
+                if check_job(job_info):
+                    logger.info(f"♻️ Duplicate posting, skipping: {job_info['title'][:40]}")
+                    return None
+                job_info['skills'] = skills.extract_flat(description)
+                job_info['skills_by_category'] = skills.extract_by_category(description)
+                logger.info(f"✅ Extracted {len(job_info['skills'])} skills from {len(description)} chars")
+            else:
+                logger.warning(f"⚠️ Invalid/empty description for {job_info['title'][:40]}")
+                job_info['description'] = ""
+                job_info['skills'] = []
+                job_info['skills_by_category'] = {}
+        except Exception as e:
+            logger.warning(f"❌ Error fetching description for job {idx}: {e}")
+            job_info['description'] = ""
+            job_info['skills'] = []
+            job_info['skills_by_category'] = {}
+        return job_info
+
+    filled = await asyncio.gather(*(fill_description(idx, job) for idx, job in enumerate(job_data_list)))
+    jobs = [job for job in filled if job is not None]
+
+    for job in jobs:
+        job["search_term"] = keyword
+        writer.add(to_job_row(job))
+    writer.flush()
+    # The next run's head only holds postings that made it into the table
+    for job_info, was_known in zip(job_infos, known):
+        if was_known or job_info["link"] in writer.stored:
+            tracker.saw(job_info["link"])
+    await asyncio.to_thread(tracker.finish)
+    return jobs
 
 
-async def fetch_job_description(page: Page, job_url: str, max_retries: int = 3) -> str:
+async def fetch_job_description(
+    page: Page,
+    job_url: str,
+    max_retries: int = 3,
+    throttle: Optional[DomainThrottle] = None
+) -> str:
     """Fetch full job description from job detail page with retry logic"""
+    throttle = throttle or DomainThrottle(max_concurrent=1, min_interval=0)
     
     for attempt in range(max_retries):
         try:
-            await page.goto(job_url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(2) 
-            
-            description_selectors = [
-                "#jobDescriptionText",
-                ".jobsearch-jobDescriptionText",
-                "[id*='jobDesc']",
-                ".job-description",
-                "[class*='description']"
-            ]
-            
-            description = ""
-            
-            for selector in description_selectors:
-                try:
+            async with throttle.slot(job_url):
+                await page.goto(job_url, wait_until="domcontentloaded", timeout=20000)
 
-                    await page.wait_for_selector(selector, timeout=10000)
-                
-                    element = page.locator(selector).first
-                    count = await element.count()
-                    
-                    if count > 0:
-                        description = await element.inner_text()
-                        description = description.strip()
-                        
-                        if description and len(description) > 100:
-                            logger.info(f"✅ Extracted description ({len(description)} chars) using {selector}")
-                            return description
-                        
-                except PlaywrightTimeout:
-                    continue
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
+            # One wait for whichever variant renders, instead of up to 10s per missing selector
+            try:
+                await page.wait_for_selector(", ".join(DESCRIPTION_SELECTORS), timeout=10000)
+            except PlaywrightTimeout:
+                pass
+
+            async def description_of(selector: str) -> str:
+                description = (await _first_text(page, selector)).strip()
+                return description if len(description) > 100 else ""
+
+            selector, description = await afind_first("indeed", "description", DESCRIPTION_SELECTORS, description_of)
+            if description:
+                logger.info(f"✅ Extracted description ({len(description)} chars) using {selector}")
+                return description
         
+            # Retries go back through throttle.slot(), which already spaces requests to Indeed
             if attempt < max_retries - 1:
                 logger.warning(f"⚠️ No description found, retry {attempt + 1}/{max_retries}")
-                await asyncio.sleep(2)
             else:
                 logger.warning(f"⚠️ Could not find description after {max_retries} attempts for {job_url}")
                 return ""
@@ -435,7 +321,6 @@ async def fetch_job_description(page: Page, job_url: str, max_retries: int = 3)
         except Exception as e:
             if attempt < max_retries - 1:
                 logger.warning(f"⚠️ Error fetching description (attempt {attempt + 1}): {e}")
-                await asyncio.sleep(2)
             else:
                 logger.warning(f"⚠️ Could not fetch description from {job_url}: {e}")
                 return ""
@@ -1,23 +1,20 @@
 from playwright.sync_api import sync_playwright
-from app.utils.extraction_descriptions import extract_job_description
+from app.scrapers.resource_blocker import block_resources_sync
 from app.db.sync_jobs import insert_job_to_db
 from app.utils.write_jobs import write_jobs_csv
 from app.utils.common import LOCATION, PAGES_PER_KEYWORD, TECH_KEYWORDS
-from app.utils.skills_engine import (
-    load_all_skills,
-    extract_flat_skills,
-    extract_skills_by_category
-)
+from app.utils.skills_engine import SkillIndex, get_skill_index
 from datetime import datetime
+from typing import Optional
 import uuid
 import time
 import os
 from urllib.parse import quote_plus
 
 HEADLESS_PATH = os.getenv("HEADLESS_PATH")
-SKILLS = load_all_skills()
 
-def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
+def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD, skills: Optional[SkillIndex] = None):
+    skills = skills or get_skill_index()
     all_jobs = []
 
     with sync_playwright() as p:
@@ -39,6 +36,7 @@ def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
 
         # Recreate a new context that loads the saved authenticated state
         context = browser.new_context(storage_state="monster_state.json")
+        blocker = block_resources_sync(context, "monster")
         page = context.new_page()
 
         for keyword in TECH_KEYWORDS:
@@ -70,8 +68,8 @@ def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
                         job_description_block = page.query_selector(".description-styles__DescriptionContainerOuter-sc-6e39f119-0")
                         job_description = job_description_block.inner_text().strip() if job_description_block else "No description found"
 
-                        flat_skills = extract_flat_skills(job_description, SKILLS["flat"])
-                        skills_by_category = extract_skills_by_category(job_description, SKILLS["matrix"])
+                        flat_skills = skills.extract_flat(job_description)
+                        skills_by_category = skills.extract_by_category(job_description)
 
                         job = {
                             "id": str(uuid.uuid4()),
@@ -104,6 +102,7 @@ def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
                         print(f"⚠️ Failed to process job card: {e}")
                         continue
 
+        blocker.log_summary("monster_playwright")
         browser.close()
         write_jobs_csv(all_jobs, label="monster_playwright")
         return all_jobs
@@ -2,13 +2,13 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.utils.extraction_descriptions import extract_job_description
+from app.utils.extraction_descriptions import DESCRIPTION_SELECTORS
 from app.db.sync_jobs import insert_job_to_db
 from app.utils.write_jobs import write_jobs_csv
 from app.utils.common import LOCATION, PAGES_PER_KEYWORD, TECH_KEYWORDS
 from app.scrapers.selenium_browser import configure_driver
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills_by_category
 )
@@ -16,7 +16,6 @@ from datetime import datetime
 import uuid
 import time
 
-SKILLS = load_all_skills()
 
 def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
     base_url = "https://www.monster.com"
@@ -75,7 +74,14 @@ def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
                             if len(driver.window_handles) > 1:
                                 driver.switch_to.window(driver.window_handles[-1])
 
-                            job_description = extract_job_description(driver, driver.current_url)
+                            # Already on the detail page: read the description once it renders
+                            try:
+                                desc_elem = WebDriverWait(driver, 10).until(
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(DESCRIPTION_SELECTORS)))
+                                )
+                                job_description = desc_elem.text.strip() or "Description not available"
+                            except Exception:
+                                job_description = "Description not available"
 
                             if len(driver.window_handles) > 1:
                                 driver.close()
@@ -85,8 +91,8 @@ def scrape_monster_jobs(location=LOCATION, pages=PAGES_PER_KEYWORD):
                             print(f"⚠️ Failed to open job detail page: {e}")
                             job_description = "Description not available"
 
-                        flat_skills = extract_flat_skills(job_description, SKILLS["flat"])
-                        skills_by_category = extract_skills_by_category(job_description, SKILLS["matrix"])
+                        flat_skills = extract_flat_skills(job_description, get_skill_index()["flat"])
+                        skills_by_category = extract_skills_by_category(job_description, get_skill_index()["matrix"])
 
                         job = {
                             "id": str(uuid.uuid4()),
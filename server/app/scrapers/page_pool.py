@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Browser, Page, async_playwright
+
+from app.scrapers.resource_blocker import PROFILES, ResourceBlocker, block_resources
+from app.utils.browser_pool import browser_slot, get_browser_pool
+
+logger = logging.getLogger(__name__)
+
+
+class DomainThrottle:
+    """
+    Central per-domain politeness: at most `max_concurrent` navigations in
+    flight per host and at least `min_interval` seconds between their starts.
+    Replaces the fixed sleeps scrapers used to put between requests.
+    """
+
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 1.0):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+        self.waited_seconds = 0.0
+
+    @staticmethod
+    def domain(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = self.domain(url)
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrent))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        start = time.monotonic()
+        async with semaphore:
+            async with lock:
+                delay = self._next_start.get(host, 0.0) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start[host] = time.monotonic() + self.min_interval
+            self.waited_seconds += time.monotonic() - start
+            yield
+
+
+class PagePool:
+    """
+    N isolated contexts (one page each) on a warm browser from the shared
+    browser pool. Callers borrow a page with `async with pool.page() as page:`;
+    the semaphore bounds how many fetches run at once.
+    """
+
+    def __init__(self, size: int = 4, launch_options: Optional[Dict] = None, block_profile: Optional[str] = None, **context_options):
+        self.size = max(1, size)
+        self.launch_options = launch_options or {"headless": True}
+        # One blocker across all contexts so its stats cover the whole run
+        self.blocker = ResourceBlocker(PROFILES.get(block_profile, PROFILES["default"])) if block_profile else None
+        self.context_options = context_options
+        self._stack: Optional[AsyncExitStack] = None
+        self._idle: List[Page] = []
+        self._semaphore = asyncio.Semaphore(self.size)
+
+    async def start(self) -> "PagePool":
+        self._stack = AsyncExitStack()
+        browser_pool = get_browser_pool()
+        if browser_pool is not None:
+            new_context = lambda: browser_pool.context(self.launch_options, **self.context_options)
+        else:
+            # No pool on this loop (CLI run): one browser for all N contexts, still under the global cap
+            await self._stack.enter_async_context(browser_slot())
+            playwright = await self._stack.enter_async_context(async_playwright())
+            browser = await playwright.chromium.launch(**self.launch_options)
+            self._stack.push_async_callback(browser.close)
+            new_context = lambda: _owned_context(browser, **self.context_options)
+
+        for _ in range(self.size):
+            context = await self._stack.enter_async_context(new_context())
+            if self.blocker is not None:
+                await block_resources(context, blocker=self.blocker)
+            self._idle.append(await context.new_page())
+        logger.info(f"✅ Page pool ready with {self.size} pages")
+        return self
+
+    async def close(self) -> None:
+        self._idle.clear()
+        if self._stack is not None:
+            try:
+                await self._stack.aclose()
+            except Exception as e:
+                logger.debug(f"Page pool close failed: {e}")
+            self._stack = None
+
+    async def __aenter__(self) -> "PagePool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._semaphore:
+            page = self._idle.pop()
+            try:
+                yield page
+            finally:
+                if page.is_closed():
+                    # A crashed tab shouldn't shrink the pool
+                    page = await page.context.new_page()
+                self._idle.append(page)
+
+
+@asynccontextmanager
+async def _owned_context(browser: Browser, **context_options):
+    context = await browser.new_context(**context_options)
+    try:
+        yield context
+    finally:
+        await context.close()
@@ -0,0 +1,137 @@
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to load pages in full (e.g. when debugging with screenshots)
+PLAYWRIGHT_BLOCK_RESOURCES = os.getenv("PLAYWRIGHT_BLOCK_RESOURCES", "1") != "0"
+
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com",
+    "doubleclick.net", "googlesyndication.com", "facebook.net", "connect.facebook.com",
+    "hotjar.com", "clarity.ms", "segment.io", "segment.com", "nr-data.net",
+    "newrelic.com", "optimizely.com", "bat.bing.com", "quantserve.com",
+    "scorecardresearch.com", "criteo.com", "criteo.net", "adsrvr.org",
+    "taboola.com", "outbrain.com", "fullstory.com", "amplitude.com",
+    "mixpanel.com", "demdex.net", "omtrdc.net", "linkedin.com/px", "px.ads.linkedin.com",
+    "tiktok.com/i18n/pixel", "analytics.tiktok.com", "pinimg.com", "adroll.com",
+)
+
+# Rough transfer sizes, used to estimate what an aborted request would have cost
+TYPICAL_BYTES = {
+    "image": 45_000,
+    "media": 400_000,
+    "font": 35_000,
+    "stylesheet": 30_000,
+    "script": 60_000,
+    "manifest": 2_000,
+    "texttrack": 5_000,
+}
+DEFAULT_TYPICAL_BYTES = 10_000
+
+
+@dataclass(frozen=True)
+class BlockProfile:
+    """What one site can do without: resource types and hosts to abort, hosts never to touch"""
+    name: str
+    block_types: FrozenSet[str] = frozenset({"image", "media", "font", "manifest", "texttrack"})
+    block_domains: Tuple[str, ...] = TRACKER_DOMAINS
+    allow_domains: Tuple[str, ...] = ()
+
+
+PROFILES: Dict[str, BlockProfile] = {
+    "default": BlockProfile("default"),
+    "indeed": BlockProfile("indeed"),
+    "ziprecruiter": BlockProfile("ziprecruiter"),
+    # The CAPTCHA widget needs its own images/scripts to render
+    "monster": BlockProfile(
+        "monster",
+        allow_domains=("hcaptcha.com", "recaptcha.net", "google.com/recaptcha", "gstatic.com", "datadome.co", "captcha-delivery.com"),
+    ),
+}
+
+
+@dataclass
+class ResourceBlocker:
+    """
+    page.route/context.route handler that aborts requests the profile doesn't
+    need and counts what it saved. One instance can serve several contexts.
+    """
+    profile: BlockProfile
+    allowed: int = 0
+    blocked: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+    estimated_bytes_saved: int = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        parsed = urlparse(url)
+        target = f"{parsed.netloc.lower()}{parsed.path}"
+        if any(domain in target for domain in self.profile.allow_domains):
+            return False
+        if resource_type in self.profile.block_types:
+            return True
+        return any(domain in target for domain in self.profile.block_domains)
+
+    def _record(self, request) -> bool:
+        resource_type = request.resource_type
+        if not self.should_block(resource_type, request.url):
+            self.allowed += 1
+            return False
+        self.blocked += 1
+        self.blocked_by_type[resource_type] += 1
+        self.estimated_bytes_saved += TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES)
+        return True
+
+    async def handle(self, route) -> None:
+        if self._record(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    def handle_sync(self, route) -> None:
+        if self._record(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    def stats(self) -> Dict:
+        total = self.allowed + self.blocked
+        return {
+            "profile": self.profile.name,
+            "requests": total,
+            "blocked": self.blocked,
+            "blocked_percent": round(100 * self.blocked / total, 1) if total else 0.0,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "estimated_mb_saved": round(self.estimated_bytes_saved / (1024 * 1024), 2),
+        }
+
+    def log_summary(self, label: str) -> None:
+        s = self.stats()
+        logger.info(
+            f"🚫 [{label}] Blocked {s['blocked']}/{s['requests']} requests ({s['blocked_percent']}%), "
+            f"~{s['estimated_mb_saved']} MB saved {s['blocked_by_type']}"
+        )
+
+
+def _profile(profile: str) -> BlockProfile:
+    return PROFILES.get(profile, PROFILES["default"])
+
+
+async def block_resources(target, profile: str = "default", blocker: Optional[ResourceBlocker] = None) -> ResourceBlocker:
+    """Route a Playwright context or page (async API) through a blocker for this profile"""
+    blocker = blocker or ResourceBlocker(_profile(profile))
+    if PLAYWRIGHT_BLOCK_RESOURCES:
+        await target.route("**/*", blocker.handle)
+    return blocker
+
+
+def block_resources_sync(target, profile: str = "default", blocker: Optional[ResourceBlocker] = None) -> ResourceBlocker:
+    """Same as block_resources for the sync Playwright API"""
+    blocker = blocker or ResourceBlocker(_profile(profile))
+    if PLAYWRIGHT_BLOCK_RESOURCES:
+        target.route("**/*", blocker.handle_sync)
+    return blocker
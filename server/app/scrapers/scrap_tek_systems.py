@@ -4,44 +4,17 @@ from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.db.connect_database import get_db_connection
-from app.utils.skills_engine import load_all_skills, extract_flat_skills,extract_skills
+from app.db.job_writer import JobBulkWriter
+from app.utils.skills_engine import get_skill_index, extract_flat_skills,extract_skills
 from app.scrapers.selenium_browser import get_headless_browser
+from app.utils.browser_pool import acquire_driver, release_driver
 from dotenv import load_dotenv
 load_dotenv()
-SKILLS = load_all_skills()
-def insert_job_to_db(job):
-    conn = get_db_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute("""
-            INSERT INTO jobs (
-                id, title, company, job_location, job_state, date, site,
-                job_description, salary, url, applied, search_term,
-                skills, skills_by_category, inserted_at
-            ) VALUES (
-                gen_random_uuid(), %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, NOW()
-            )
-            ON CONFLICT (url) DO NOTHING;
-        """, (
-            job["title"], job["company"], job["job_location"], job["job_state"],
-            job["date"], job["site"], job["job_description"], job["salary"],
-            job["url"], job["applied"], job["search_term"],
-            job["flat_skills"], job["skills_by_category"]
-        ))
-        conn.commit()
-    except Exception as e:
-        print(f":x: DB insert error: {e}")
-        traceback.print_exc()
-    finally:
-        cur.close()
-        conn.close()
 def scrape_teksystems(location="remote", days=15):
     print(f"\n:globe_with_meridians: Scraping TekSystems → {location}")
     jobs_scraped = []
-    driver = get_headless_browser()
+    driver = acquire_driver("headless", get_headless_browser)
+    writer = JobBulkWriter(source="teksystems")
     try:
         base_url = "https://careers.teksystems.com/us/en/search-results"
         search_url = f"{base_url}?keywords=developer&location={location}"
@@ -64,7 +37,6 @@ def scrape_teksystems(location="remote", days=15):
                     print(":package: Raw card text:", card.text)
             except Exception:
                 print(":no_entry_sign: No job cards found using fallback selector. Exiting scrape.")
-                driver.quit()
                 return []
         print(f":receipt: Found {len(job_cards)} job cards")
         for card in job_cards:
@@ -85,8 +57,8 @@ def scrape_teksystems(location="remote", days=15):
                     description = driver.find_element(By.CLASS_NAME, "description__text").text.strip()
                 except:
                     description = "N/A"
-                flat_skills = extract_flat_skills(description, SKILLS["flat"])
-                categorized_skills = extract_skills(description, SKILLS["matrix"])
+                flat_skills = extract_flat_skills(description, get_skill_index()["flat"])
+                categorized_skills = extract_skills(description, get_skill_index()["matrix"])
                 job = {
                     "title": title,
                     "company": company,
@@ -102,7 +74,7 @@ def scrape_teksystems(location="remote", days=15):
                     "flat_skills": flat_skills,
                     "skills_by_category": categorized_skills
                 }
-                insert_job_to_db(job)
+                writer.add(job)
                 jobs_scraped.append(job)
                 driver.close()
                 driver.switch_to.window(driver.window_handles[0])
@@ -116,7 +88,8 @@ def scrape_teksystems(location="remote", days=15):
                     pass
                 continue
     finally:
-        driver.quit()
+        release_driver(driver)
+        writer.close()
 
     print(f"✅ Scraped {len(jobs_scraped)} jobs from TekSystems")
     return jobs_scraped
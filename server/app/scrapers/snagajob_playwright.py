@@ -1,15 +1,19 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException
 import undetected_chromedriver as uc
 import time
 from datetime import datetime, timedelta
 import traceback
-import random
 import logging
+from typing import Optional
 from selenium.webdriver import ActionChains
-from app.utils.skills_engine import load_all_skills, extract_flat_skills, extract_skills_by_category
+from app.utils.skills_engine import SkillIndex, get_skill_index
 from app.db.sync_jobs import insert_job_to_db
+from app.scrapers.card_extractor import SNAGAJOB_DRAWER_FIELDS, extract_fields_sync
+from app.utils.browser_pool import acquire_driver, release_driver
+from app.utils.crawl_state import CrawlTracker
+from app.utils.selector_cache import find_first
+from app.utils.waits import AdaptiveWait
 from app.utils.write_jobs import write_jobs_csv
 
 # Set up logging
@@ -26,8 +30,24 @@ TECH_KEYWORDS = [
 
 LOCATION = "remote"
 PAGES_PER_KEYWORD = 2
+
+CONTAINER_SELECTORS = [
+    "div[class*='search']",
+    "div.search-results",
+    "div.job-results",
+    "main",
+    "div[role='main']"
+]
+JOB_CARD_SELECTORS = [
+    "button[data-test='job-card']",
+    "div[data-test='job-card']",
+    "button[class*='job-card']",
+    "div[class*='job-card']",
+    "[class*='JobCard']",
+    "article"
+]
+DRAWER_SELECTOR = "mat-drawer job-details, job-details, div.job-details, [class*='job-detail']"
 MAX_DAYS = 5
-SKILLS = load_all_skills()
 
 # def configure_driver(headless=True):
 #     """Configure Chrome driver with headless option"""
@@ -86,8 +106,8 @@ def configure_driver(headless=True):
         else:
             logger.info("✅ Configuring driver in VISIBLE mode")
         
+        # No start-up delay: scrape_page's wait for the first job card covers the browser warming up
         driver = uc.Chrome(options=options, headless=headless, use_subprocess=True)
-        time.sleep(1)  # Wait for browser to initialize
         
         # Skip CDP command - it causes window to close in headless mode
         logger.info("✅ Driver configured successfully")
@@ -97,7 +117,7 @@ def configure_driver(headless=True):
         logger.error(f"❌ Failed to configure driver: {e}")
         logger.error(traceback.format_exc())
         raise
-def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captcha=True):
+def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captcha=True, skills: Optional[SkillIndex] = None):
     """
     Scrape Snagajob with headless mode support
     
@@ -106,9 +126,12 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
         keywords: List of search keywords
         headless: Run browser in headless mode
         skip_captcha: Skip CAPTCHA waiting (for automated runs)
+        skills: Shared SkillIndex (defaults to the process-wide one)
     """
     driver = None
     all_jobs = []
+    skills = skills or get_skill_index()
+    waiter = AdaptiveWait("snagajob")
     
     try:
         logger.info(f"🚀 Starting Snagajob scraper (headless={headless}, location={location})")
@@ -117,7 +140,7 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
         search_keywords = keywords if keywords else TECH_KEYWORDS
         logger.info(f"📝 Using keywords: {search_keywords}")
         
-        driver = configure_driver(headless=headless)
+        driver = acquire_driver(f"snagajob-{'headless' if headless else 'visible'}", lambda: configure_driver(headless=headless))
         if not driver:
             raise Exception("Driver failed to initialize")
 
@@ -136,6 +159,8 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
                 logger.info(f"\n{'='*50}")
                 logger.info(f"🔍 Searching for: '{keyword}'")
                 logger.info(f"{'='*50}")
+                # Stops paginating once a page is mostly jobs we already have (full crawl on a schedule)
+                tracker = CrawlTracker("snagajob", keyword, location)
                 
                 for page_num in range(1, PAGES_PER_KEYWORD + 1):
                     try:
@@ -145,7 +170,10 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
                             page_num=page_num,
                             location=location,
                             actions=actions,
-                            cutoff_date=cutoff_date
+                            cutoff_date=cutoff_date,
+                            skills=skills,
+                            waiter=waiter,
+                            tracker=tracker
                         )
                         all_jobs.extend(jobs_on_page)
                         logger.info(f"✅ Page {page_num}: Found {len(jobs_on_page)} jobs")
@@ -154,6 +182,11 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
                         logger.error(f"❌ Error on page {page_num} for '{keyword}': {e}")
                         logger.error(traceback.format_exc())
                         continue
+
+                    if not tracker.page_done():
+                        break
+
+                tracker.finish()
                         
             except Exception as e:
                 logger.error(f"❌ Error processing keyword '{keyword}': {e}")
@@ -168,10 +201,11 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
     finally:
         if driver:
             try:
-                driver.quit()
-                logger.info("🛑 Driver closed successfully")
+                release_driver(driver)
+                logger.info("🛑 Driver returned to pool")
             except Exception as e:
                 logger.error(f"⚠️ Error closing driver: {e}")
+        waiter.log_summary(len(all_jobs))
 
     # Save results
     if all_jobs:
@@ -189,26 +223,24 @@ def scrape_snag_jobs(location=LOCATION, keywords=None, headless=True, skip_captc
     return all_jobs
 
 
-def scrape_page(driver, keyword, page_num, location, actions, cutoff_date):
+def scrape_page(driver, keyword, page_num, location, actions, cutoff_date, skills: SkillIndex, waiter: Optional[AdaptiveWait] = None,
+                tracker: Optional[CrawlTracker] = None):
     """Scrape a single page of job results"""
     jobs = []
+    waiter = waiter or AdaptiveWait("snagajob")
     
     search_url = f"https://www.snagajob.com/search?q={'+'.join(keyword.split())}&w={location}&radius=20&page={page_num}"
     logger.info(f"\n🌐 Loading: {search_url}")
     
+    # Snagajob rate-limits rapid page loads, so search pages stay spaced out
+    waiter.pause(1.0, 2.0)
     driver.get(search_url)
-    time.sleep(random.uniform(3.0, 4.5))
 
-    # Wait for page to load
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(2)
+    # Wait for the first job card instead of a fixed delay
+    if waiter.css(driver, ", ".join(JOB_CARD_SELECTORS), timeout=15) is None:
+        logger.warning("⚠️ No job card appeared within 15s, trying fallbacks")
+    else:
         logger.info("✅ Page loaded successfully")
-    except Exception as e:
-        logger.error(f"❌ Page failed to load: {e}")
-        raise
     
     # Find job cards
     job_cards = find_job_cards(driver)
@@ -223,7 +255,7 @@ def scrape_page(driver, keyword, page_num, location, actions, cutoff_date):
     for i, card in enumerate(job_cards):
         try:
             logger.info(f"\n👀 Processing job {i+1}/{len(job_cards)}")
-            job = extract_job_details(driver, card, actions, keyword, cutoff_date)
+            job = extract_job_details(driver, card, actions, keyword, cutoff_date, skills, waiter, tracker)
             
             if job:
                 jobs.append(job)
@@ -243,49 +275,26 @@ def find_job_cards(driver):
     """Find job cards using multiple selector strategies"""
     logger.info("🔍 Searching for job cards...")
     
-    # Try to find results container
-    possible_containers = [
-        "div[class*='search']",
-        "div.search-results",
-        "div.job-results",
-        "main",
-        "div[role='main']"
-    ]
-    
-    results_container = None
-    for container_sel in possible_containers:
-        try:
-            container = driver.find_element(By.CSS_SELECTOR, container_sel)
-            results_container = container
-            logger.info(f"✅ Found container: {container_sel}")
-            break
-        except:
-            continue
-    
-    # Try multiple job card selectors
-    job_card_selectors = [
-        "button[data-test='job-card']",
-        "div[data-test='job-card']",
-        "button[class*='job-card']",
-        "div[class*='job-card']",
-        "[class*='JobCard']",
-        "article"
-    ]
+    # Try to find results container (learned order, see selector_cache)
+    container_sel, results_container = find_first(
+        "snagajob", "results_container", CONTAINER_SELECTORS,
+        lambda sel: driver.find_element(By.CSS_SELECTOR, sel)
+    )
+    if results_container:
+        logger.info(f"✅ Found container: {container_sel}")
     
+    # Try multiple job card selectors; a single match is a page wrapper, not a list of cards
+    scope = results_container or driver
+
+    def cards_for(selector):
+        cards = scope.find_elements(By.CSS_SELECTOR, selector)
+        return cards if len(cards) > 1 else None
+
+    selector, job_cards = find_first("snagajob", "job_cards", JOB_CARD_SELECTORS, cards_for)
+    if job_cards:
+        logger.info(f"✅ Using selector: '{selector}' ({len(job_cards)} cards)")
+        return job_cards
     job_cards = []
-    for selector in job_card_selectors:
-        try:
-            if results_container:
-                cards = results_container.find_elements(By.CSS_SELECTOR, selector)
-            else:
-                cards = driver.find_elements(By.CSS_SELECTOR, selector)
-            
-            if len(cards) > 1:
-                job_cards = cards
-                logger.info(f"✅ Using selector: '{selector}' ({len(cards)} cards)")
-                return job_cards
-        except:
-            continue
     
     # Fallback: Find via Apply buttons
     if len(job_cards) <= 1:
@@ -318,61 +327,61 @@ def find_job_cards(driver):
     return job_cards
 
 
-def extract_job_details(driver, card, actions, keyword, cutoff_date):
+def extract_job_details(driver, card, actions, keyword, cutoff_date, skills: SkillIndex, waiter: Optional[AdaptiveWait] = None,
+                        tracker: Optional[CrawlTracker] = None):
     """Extract details from a single job card"""
+    waiter = waiter or AdaptiveWait("snagajob")
     try:
-        # Scroll and hover
-        driver.execute_script(
-            "arguments[0].scrollIntoView({ behavior: 'smooth', block: 'center' });",
-            card
-        )
-        time.sleep(random.uniform(0.8, 1.5))
-        
-        actions.move_to_element(card).pause(random.uniform(0.5, 1.2)).perform()
-        time.sleep(random.uniform(0.3, 0.8))
+        # The drawer stays open between cards; remember what it showed so we can tell when it updates
+        open_drawers = driver.find_elements(By.CSS_SELECTOR, DRAWER_SELECTOR)
+        try:
+            previous_text = open_drawers[0].text if open_drawers else None
+        except StaleElementReferenceException:
+            previous_text = None
+
+        # Scroll (instant, no smooth-scroll animation to wait out) and hover
+        driver.execute_script("arguments[0].scrollIntoView({ block: 'center' });", card)
+        # Short human-like hover; Snagajob flags instant clicks
+        waiter.pause(0.3, 0.8, reason="hover")
+        actions.move_to_element(card).perform()
         
         # Click card
         try:
             card.click()
         except:
             driver.execute_script("arguments[0].click();", card)
-        time.sleep(random.uniform(1.5, 2.5))
         
-        # Wait for details drawer
-        try:
-            drawer = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 
-                    "mat-drawer job-details, job-details, div.job-details, [class*='job-detail']"))
-            )
-            time.sleep(random.uniform(1.5, 3.0))
-        except Exception as e:
-            logger.warning(f"⚠️ Drawer didn't load: {e}")
+        # Wait for details drawer, then for its content to finish rendering
+        drawer = waiter.css(driver, DRAWER_SELECTOR, timeout=15)
+        if drawer is None:
+            logger.warning("⚠️ Drawer didn't load")
             return None
         
-        description = drawer.text
+        description = waiter.stable_text(drawer, timeout=10, previous=previous_text, reason="drawer content")
+        if not description:
+            # The drawer re-rendered under us; read the fresh one
+            drawer = driver.find_element(By.CSS_SELECTOR, DRAWER_SELECTOR)
+            description = drawer.text
         job_url = driver.current_url
+        # Before the insert, which would make it look known
+        known = tracker.check(job_url) if tracker is not None else False
         
-        # Extract job details with fallbacks
-        title = safe_find_text(drawer, "h2, h3, .job-title, h1, [class*='title']", "Unknown")
-        company = safe_find_text(drawer, ".company-name, .job-company, [class*='company']", "Unknown")
-        
-        try:
-            location_el = drawer.find_element(By.XPATH, "//div[contains(text(),'Location')]")
-            location_text = location_el.text.split("Location")[-1].strip()
-        except:
-            location_text = "Remote"
+        # Extract job details with fallbacks (all four fields in one execute_script)
+        fields = extract_fields_sync(driver, drawer, "snagajob", SNAGAJOB_DRAWER_FIELDS)
+        title = fields.get("title") or "Unknown"
+        company = fields.get("company") or "Unknown"
         
+        location_text = fields["location"].split("Location")[-1].strip() if fields.get("location") else "Remote"
         job_state = location_text.split(",")[-1].strip() if "," in location_text else "N/A"
         
-        try:
-            salary_el = drawer.find_element(By.XPATH, "//div[contains(text(),'Verified Pay') or contains(text(),'Pay')]")
-            salary = salary_el.text.split("Verified Pay")[-1].split("Pay")[-1].strip()
-        except:
+        if fields.get("salary"):
+            salary = fields["salary"].split("Verified Pay")[-1].split("Pay")[-1].strip()
+        else:
             salary = "N/A"
         
         # Extract skills
-        flat_skills = extract_flat_skills(description, SKILLS["flat"])
-        categorized_skills = extract_skills_by_category(description, SKILLS["matrix"])
+        flat_skills = skills.extract_flat(description)
+        categorized_skills = skills.extract_by_category(description)
         
         job = {
             "title": title,
@@ -398,7 +407,9 @@ def extract_job_details(driver, card, actions, keyword, cutoff_date):
         }
         
         if job["date"] >= cutoff_date:
-            insert_job_to_db(job)
+            # Only stored postings go into the next run's head
+            if (insert_job_to_db(job) or known) and tracker is not None:
+                tracker.saw(job_url)
             return job
         else:
             logger.info(f"⏳ Job too old: {title}")
@@ -3,27 +3,26 @@ from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.db.connect_database import get_db_connection
 from app.utils.common import TECH_KEYWORDS, LOCATION, PAGES_PER_KEYWORD, MAX_DAYS
 
 from app.utils.write_jobs import write_jobs_csv
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills,
     extract_skills_by_category
 )
 from app.db.sync_jobs import insert_job_to_db
 from .selenium_browser import get_headless_browser
+from app.utils.browser_pool import acquire_driver, release_driver
 from dotenv import load_dotenv
 load_dotenv()
-SKILLS = load_all_skills()
 
 
 def scrape_teksystems(location="remote", days=15):
     print(f"\n:globe_with_meridians: Scraping TekSystems → {location}")
     jobs = []
-    driver = get_headless_browser()
+    driver = acquire_driver("headless", get_headless_browser)
     try:
         base_url = "https://careers.teksystems.com/us/en/search-results"
         search_url = f"{base_url}?keywords=developer&location={location}"
@@ -46,7 +45,6 @@ def scrape_teksystems(location="remote", days=15):
                     print(":package: Raw card text:", card.text)
             except Exception:
                 print(":no_entry_sign: No job cards found using fallback selector. Exiting scrape.")
-                driver.quit()
                 return []
         print(f":receipt: Found {len(job_cards)} job cards")
         for card in job_cards:
@@ -67,8 +65,8 @@ def scrape_teksystems(location="remote", days=15):
                     description = driver.find_element(By.CLASS_NAME, "description__text").text.strip()
                 except:
                     description = "N/A"
-                flat_skills = extract_flat_skills(description, SKILLS["flat"])
-                categorized_skills = extract_skills(description, SKILLS["matrix"])
+                flat_skills = extract_flat_skills(description, get_skill_index()["flat"])
+                categorized_skills = extract_skills(description, get_skill_index()["matrix"])
                 job = {
                     "title": title,
                     "company": company,
@@ -98,7 +96,7 @@ def scrape_teksystems(location="remote", days=15):
                     pass
                 continue
     finally:
-        driver.quit()
+        release_driver(driver)
     print(f":white_check_mark: Scraped {len(jobs)} jobs from TekSystems")
     return jobs
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from app.utils.skills_engine import (
-    load_all_skills,
+    get_skill_index,
     extract_flat_skills,
     extract_skills_by_category
 )
@@ -18,7 +18,6 @@ from app.db.sync_jobs import insert_job_to_db
 from app.utils.write_jobs import write_jobs_csv
 
 load_dotenv()
-SKILLS = load_all_skills()
 HEADLESS_PATH = os.getenv("HEADLESS_PATH")
 
 def scrape_zip_with_selenium(location="remote", days=15):
@@ -178,8 +177,8 @@ def scrape_zip_with_selenium(location="remote", days=15):
                 driver.switch_to.window(driver.window_handles[0])
                 
                 # Extract skills
-                flat_skills = extract_flat_skills(description, SKILLS["flat"])
-                skills_by_category = extract_skills_by_category(description, SKILLS["matrix"])
+                flat_skills = extract_flat_skills(description, get_skill_index()["flat"])
+                skills_by_category = extract_skills_by_category(description, get_skill_index()["matrix"])
                 
                 job = {
                     "id": str(uuid.uuid4()),
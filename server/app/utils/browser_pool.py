@@ -0,0 +1,482 @@
+# app/utils/browser_pool.py
+"""
+Long-lived pool of warm browsers shared by the Selenium and Playwright scrapers.
+
+Launching Chrome costs seconds and hundreds of MB, so drivers/browsers are
+kept after a scraper run and handed to the next one (Selenium: the whole
+driver, reset to a blank tab; Playwright: a fresh isolated context on a warm
+browser). A browser is recycled after BROWSER_RECYCLE_AFTER_PAGES page loads
+or once it uses more than BROWSER_MAX_RSS_MB. One global
+cap (BROWSER_POOL_MAX_BROWSERS) covers both kinds so concurrent scraper runs
+wait for a slot instead of exhausting RAM.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from app.utils.process_registry import child_pids, reap, register_driver, register_pids, tree_rss_mb
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_MAX_BROWSERS = int(os.getenv("BROWSER_POOL_MAX_BROWSERS", "4"))
+BROWSER_POOL_MAX_IDLE = int(os.getenv("BROWSER_POOL_MAX_IDLE", "2"))
+BROWSER_POOL_TIMEOUT = float(os.getenv("BROWSER_POOL_TIMEOUT", "300"))
+BROWSER_RECYCLE_AFTER_PAGES = int(os.getenv("BROWSER_RECYCLE_AFTER_PAGES", "200"))
+BROWSER_MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", "1500"))
+BROWSER_MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", "8"))
+
+# Every live browser (Selenium or Playwright, busy or idle) holds one slot
+_browser_slots = threading.BoundedSemaphore(BROWSER_POOL_MAX_BROWSERS)
+_live_lock = threading.Lock()
+_live_browsers = 0
+
+
+def _take_slot(timeout: float) -> bool:
+    global _live_browsers
+    if not _browser_slots.acquire(timeout=timeout):
+        return False
+    with _live_lock:
+        _live_browsers += 1
+    return True
+
+
+def _give_slot() -> None:
+    global _live_browsers
+    with _live_lock:
+        _live_browsers -= 1
+    _browser_slots.release()
+
+
+# ===========================
+# Selenium
+# ===========================
+@dataclass
+class _PooledDriver:
+    driver: object
+    kind: str
+    pages: int = 0
+    created: float = field(default_factory=time.monotonic)
+    # Origins visited on this lease, whose storage is cleared before the next one
+    origins: Set[str] = field(default_factory=set)
+
+
+def _add_origin(entry: _PooledDriver, url: str) -> None:
+    parts = urlsplit(url or "")
+    if parts.scheme in ("http", "https"):
+        entry.origins.add(f"{parts.scheme}://{parts.netloc}")
+
+
+class SeleniumDriverPool:
+    """Warm Selenium drivers keyed by the factory ("kind") that built them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle: Dict[str, List[_PooledDriver]] = {}
+        self._leased: Dict[int, _PooledDriver] = {}
+        self.launched = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def _count_pages(self, entry: _PooledDriver) -> None:
+        original_get = entry.driver.get
+
+        def get(url):
+            entry.pages += 1
+            _add_origin(entry, url)
+            return original_get(url)
+
+        entry.driver.get = get
+
+    def _quit(self, entry: _PooledDriver) -> None:
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error during pooled driver.quit(): {e}")
+        finally:
+            # Whatever quit() left behind (or all of it, if the driver crashed)
+            reap(entry.driver)
+            _give_slot()
+
+    def _reclaim_idle(self) -> bool:
+        """Quit the oldest idle driver to free a slot for someone else"""
+        with self._lock:
+            idle = [e for entries in self._idle.values() for e in entries]
+            if not idle:
+                return False
+            oldest = min(idle, key=lambda e: e.created)
+            self._idle[oldest.kind].remove(oldest)
+        self._quit(oldest)
+        return True
+
+    def _acquire_slot(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while not _take_slot(1):
+            if self._reclaim_idle():
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"No browser slot free after {timeout:.0f}s (cap {BROWSER_POOL_MAX_BROWSERS})")
+
+    def _is_alive(self, driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, entry: _PooledDriver) -> None:
+        """Close extra tabs and wipe cookies and storage so the next lease starts clean"""
+        driver = entry.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        _add_origin(entry, driver.current_url)
+        # delete_all_cookies() only covers the current page's domain; CDP clears every cookie jar entry
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in entry.origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        entry.origins.clear()
+        driver.execute_script("window.location.href = 'about:blank';")
+
+    def acquire(self, kind: str, factory: Callable, timeout: float = BROWSER_POOL_TIMEOUT):
+        while True:
+            with self._lock:
+                entries = self._idle.get(kind) or []
+                entry = entries.pop() if entries else None
+            if entry is None:
+                break
+            if self._is_alive(entry.driver):
+                with self._lock:
+                    self._leased[id(entry.driver)] = entry
+                    self.reused += 1
+                logger.info(f"♻️ Reusing warm {kind} driver ({entry.pages} pages so far)")
+                return entry.driver
+            self._quit(entry)
+
+        self._acquire_slot(timeout)
+        try:
+            driver = factory()
+        except Exception:
+            _give_slot()
+            raise
+        if driver is None:
+            _give_slot()
+            return None
+        register_driver(driver, label=kind)
+        entry = _PooledDriver(driver=driver, kind=kind)
+        self._count_pages(entry)
+        with self._lock:
+            self._leased[id(driver)] = entry
+            self.launched += 1
+        return driver
+
+    def release(self, driver, broken: bool = False) -> None:
+        if driver is None:
+            return
+        with self._lock:
+            entry = self._leased.pop(id(driver), None)
+        if entry is None:
+            # Not from the pool (or already released)
+            from app.utils.chrome_driver_helper import safe_quit_driver
+            safe_quit_driver(driver)
+            return
+
+        reason = None
+        if broken or not self._is_alive(driver):
+            reason = "broken"
+        elif entry.pages >= BROWSER_RECYCLE_AFTER_PAGES:
+            reason = f"{entry.pages} pages"
+        else:
+            rss = tree_rss_mb(driver)
+            if rss > BROWSER_MAX_RSS_MB:
+                reason = f"{rss:.0f} MB"
+
+        if reason is None:
+            try:
+                self._reset(entry)
+            except Exception as e:
+                reason = f"reset failed: {e}"
+
+        with self._lock:
+            if reason is None and len(self._idle.get(entry.kind, [])) < BROWSER_POOL_MAX_IDLE:
+                self._idle.setdefault(entry.kind, []).append(entry)
+                return
+            if reason is not None:
+                self.recycled += 1
+        logger.info(f"🔁 Retiring {entry.kind} driver ({reason or 'idle pool full'})")
+        self._quit(entry)
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [e for entries in self._idle.values() for e in entries]
+            self._idle.clear()
+        for entry in idle:
+            self._quit(entry)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "leased": len(self._leased),
+                "idle": sum(len(v) for v in self._idle.values()),
+                "launched": self.launched,
+                "reused": self.reused,
+                "recycled": self.recycled,
+            }
+
+
+selenium_pool = SeleniumDriverPool()
+
+
+def acquire_driver(kind: str, factory: Callable, timeout: float = BROWSER_POOL_TIMEOUT):
+    """Warm driver of this kind, or a new one from factory() if none is idle"""
+    return selenium_pool.acquire(kind, factory, timeout)
+
+
+def release_driver(driver, broken: bool = False) -> None:
+    """Give a driver back; it is reset and kept warm unless it is due for recycling"""
+    selenium_pool.release(driver, broken)
+
+
+@contextmanager
+def pooled_driver(kind: str, factory: Callable):
+    driver = acquire_driver(kind, factory)
+    broken = False
+    try:
+        yield driver
+    except Exception:
+        broken = not selenium_pool._is_alive(driver) if driver is not None else False
+        raise
+    finally:
+        release_driver(driver, broken)
+
+
+# ===========================
+# Playwright (async)
+# ===========================
+@dataclass
+class _PooledBrowser:
+    browser: object
+    key: Tuple
+    pages: int = 0
+    contexts: int = 0
+    retiring: bool = False
+
+
+class AsyncBrowserPool:
+    """
+    Warm Playwright browsers handing out isolated contexts. Bound to the event
+    loop it was started on (the API's loop).
+
+    pages counts main-frame navigations, since page pools reuse one tab for
+    every goto. Playwright doesn't expose a browser's pid, so the memory cap
+    is checked against the whole driver tree: BROWSER_MAX_RSS_MB per live
+    browser.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._browsers: List[_PooledBrowser] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.launched = 0
+        self.recycled = 0
+
+    async def start(self) -> "AsyncBrowserPool":
+        from playwright.async_api import async_playwright
+        before = child_pids()
+        self._playwright = await async_playwright().start()
+        # The Playwright driver is our child and every pooled browser runs under it
+        register_pids(self, child_pids() - before, "playwright")
+        self._lock = asyncio.Lock()
+        self.loop = asyncio.get_running_loop()
+        logger.info("✅ Playwright browser pool started")
+        return self
+
+    async def _close_browser(self, entry: _PooledBrowser) -> None:
+        try:
+            await entry.browser.close()
+        except Exception as e:
+            logger.debug(f"Browser close failed: {e}")
+        finally:
+            _give_slot()
+
+    async def _acquire_slot(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while not await asyncio.to_thread(_take_slot, 1):
+            async with self._lock:
+                idle = [b for b in self._browsers if b.contexts == 0]
+                if idle:
+                    self._browsers.remove(idle[0])
+            if idle:
+                await self._close_browser(idle[0])
+                continue
+            if selenium_pool._reclaim_idle():
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"No browser slot free after {timeout:.0f}s (cap {BROWSER_POOL_MAX_BROWSERS})")
+
+    async def _browser_for(self, key: Tuple, launch_options: Dict) -> _PooledBrowser:
+        async with self._lock:
+            for entry in self._browsers:
+                if entry.key == key and not entry.retiring and entry.contexts < BROWSER_MAX_CONTEXTS:
+                    if entry.browser.is_connected():
+                        entry.contexts += 1
+                        return entry
+                    entry.retiring = True
+
+        # Not holding the lock here: releasing contexts is what frees slots
+        await self._acquire_slot(BROWSER_POOL_TIMEOUT)
+        try:
+            browser = await self._playwright.chromium.launch(**launch_options)
+        except Exception:
+            _give_slot()
+            raise
+        entry = _PooledBrowser(browser=browser, key=key, contexts=1)
+        async with self._lock:
+            self._browsers.append(entry)
+            self.launched += 1
+        return entry
+
+    @asynccontextmanager
+    async def context(self, launch_options: Optional[Dict] = None, **context_options):
+        launch_options = launch_options or {"headless": True}
+        key = tuple(sorted((k, repr(v)) for k, v in launch_options.items()))
+        entry = await self._browser_for(key, launch_options)
+        context = None
+        try:
+            context = await entry.browser.new_context(**context_options)
+
+            def count_navigation(frame):
+                if frame.parent_frame is None:
+                    entry.pages += 1
+
+            context.on("page", lambda page: page.on("framenavigated", count_navigation))
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Context close failed: {e}")
+            # psutil walks the whole driver tree; keep that off the event loop
+            rss = await asyncio.to_thread(tree_rss_mb, self)
+            recycle = False
+            async with self._lock:
+                entry.contexts -= 1
+                over_memory = rss > BROWSER_MAX_RSS_MB * max(1, len(self._browsers))
+                if entry.pages >= BROWSER_RECYCLE_AFTER_PAGES or over_memory or not entry.browser.is_connected():
+                    entry.retiring = True
+                if entry.retiring and entry.contexts == 0 and entry in self._browsers:
+                    self._browsers.remove(entry)
+                    self.recycled += 1
+                    recycle = True
+            # Closed outside the lock so other leases aren't stuck behind browser.close()
+            if recycle:
+                logger.info(f"🔁 Recycling Playwright browser after {entry.pages} pages ({rss:.0f} MB across the pool)")
+                await self._close_browser(entry)
+
+    async def close(self) -> None:
+        for entry in list(self._browsers):
+            await self._close_browser(entry)
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        reap(self)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "browsers": len(self._browsers),
+            "contexts": sum(b.contexts for b in self._browsers),
+            "launched": self.launched,
+            "recycled": self.recycled,
+            "rss_mb": round(tree_rss_mb(self), 1),
+        }
+
+
+_async_pool: Optional[AsyncBrowserPool] = None
+
+
+async def start_browser_pool() -> AsyncBrowserPool:
+    """Start the Playwright pool on the current (API) event loop"""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = await AsyncBrowserPool().start()
+    return _async_pool
+
+
+async def stop_browser_pool() -> None:
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+    await asyncio.to_thread(selenium_pool.close)
+
+
+def get_browser_pool() -> Optional[AsyncBrowserPool]:
+    """The Playwright pool if it was started on the running loop, else None"""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    pool = _async_pool
+    return pool if pool is not None and pool.loop is running else None
+
+
+@asynccontextmanager
+async def browser_slot(timeout: float = BROWSER_POOL_TIMEOUT):
+    """
+    Hold one global browser slot for a browser launched outside the pool
+    (CLI runs, worker-thread loops), so the cap covers those too.
+    """
+    deadline = time.monotonic() + timeout
+    while not await asyncio.to_thread(_take_slot, 1):
+        if await asyncio.to_thread(selenium_pool._reclaim_idle):
+            continue
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"No browser slot free after {timeout:.0f}s (cap {BROWSER_POOL_MAX_BROWSERS})")
+    try:
+        yield
+    finally:
+        _give_slot()
+
+
+@asynccontextmanager
+async def playwright_context(launch_options: Optional[Dict] = None, **context_options):
+    """
+    Isolated context on a warm pooled browser. Outside the API loop (CLI runs,
+    asyncio.run in a worker thread) it falls back to a one-off browser.
+    """
+    pool = get_browser_pool()
+    if pool is not None:
+        async with pool.context(launch_options, **context_options) as context:
+            yield context
+        return
+
+    from playwright.async_api import async_playwright
+    async with browser_slot(), async_playwright() as p:
+        browser = await p.chromium.launch(**(launch_options or {"headless": True}))
+        try:
+            context = await browser.new_context(**context_options)
+            try:
+                yield context
+            finally:
+                await context.close()
+        finally:
+            await browser.close()
+
+
+def browser_pool_stats() -> Dict:
+    return {
+        "max_browsers": BROWSER_POOL_MAX_BROWSERS,
+        "selenium": selenium_pool.stats(),
+        "playwright": _async_pool.stats() if _async_pool is not None else None,
+    }
@@ -12,34 +12,12 @@ from webdriver_manager.chrome import ChromeDriverManager
 import logging
 import os
 import subprocess
-import psutil
+from app.utils.browser_pool import acquire_driver, release_driver
+from app.utils.process_registry import reap, register_driver
 
 logger = logging.getLogger(__name__)
 
 
-def kill_zombie_chrome_processes():
-    """Kill any zombie Chrome/ChromeDriver processes"""
-    killed = 0
-    for proc in psutil.process_iter(['pid', 'name']):
-        try:
-            name = proc.info['name'].lower()
-            if 'chrome' in name or 'chromedriver' in name:
-                # Don't kill if it's the main Chrome browser user is actively using
-                if 'type=utility' in ' '.join(proc.cmdline()):
-                    continue
-                    
-                proc.kill()
-                killed += 1
-                logger.info(f"Killed zombie process: {proc.info['name']} (PID: {proc.info['pid']})")
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-    
-    if killed > 0:
-        logger.info(f"Cleaned up {killed} zombie Chrome processes")
-    
-    return killed
-
-
 def create_stable_chrome_driver(headless: bool = True, timeout: int = 30):
     """
     Create a Chrome driver with maximum stability for Windows
@@ -51,12 +29,6 @@ def create_stable_chrome_driver(headless: bool = True, timeout: int = 30):
     Returns:
         WebDriver instance
     """
-    # Clean up any existing zombie processes first
-    try:
-        kill_zombie_chrome_processes()
-    except Exception as e:
-        logger.warning(f"Could not clean zombie processes: {e}")
-    
     chrome_options = Options()
     
     # === CRITICAL STABILITY OPTIONS FOR WINDOWS ===
@@ -137,6 +109,7 @@ def create_stable_chrome_driver(headless: bool = True, timeout: int = 30):
         # Create driver
         logger.info("Creating Chrome WebDriver...")
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        register_driver(driver, label="stable-chrome")
         
         # Set timeouts
         driver.set_page_load_timeout(timeout)
@@ -152,34 +125,32 @@ def create_stable_chrome_driver(headless: bool = True, timeout: int = 30):
 
 
 def safe_quit_driver(driver):
-    """Safely quit driver and clean up processes"""
+    """Safely quit driver and reap its own Chrome processes"""
     if driver is None:
         return
     
+    # Snapshot its process tree first in case it didn't come from create_stable_chrome_driver
+    try:
+        register_driver(driver)
+    except Exception as e:
+        logger.warning(f"Could not register driver processes: {e}")
+    
     try:
         # Try normal quit first
         driver.quit()
         logger.info("Driver quit normally")
     except Exception as e:
         logger.warning(f"Error during driver.quit(): {e}")
-        
-        try:
-            # Force kill the process
-            if hasattr(driver, 'service') and hasattr(driver.service, 'process'):
-                driver.service.process.kill()
-                logger.info("Force killed driver process")
-        except Exception as e2:
-            logger.warning(f"Could not force kill driver: {e2}")
-    
-    # Clean up any remaining zombie processes
+    
+    # Kill only what this driver spawned; other scrapers' browsers are left alone
     try:
-        kill_zombie_chrome_processes()
+        reap(driver)
     except Exception as e:
-        logger.warning(f"Could not clean zombie processes after quit: {e}")
+        logger.warning(f"Could not reap driver processes: {e}")
 
 
 class StableChromeDriver:
-    """Context manager for stable Chrome driver usage"""
+    """Context manager for stable Chrome driver usage (borrowed from the shared browser pool)"""
     
     def __init__(self, headless: bool = True, timeout: int = 30):
         self.headless = headless
@@ -187,11 +158,15 @@ class StableChromeDriver:
         self.driver = None
     
     def __enter__(self):
-        self.driver = create_stable_chrome_driver(self.headless, self.timeout)
+        self.driver = acquire_driver(
+            f"stable-{'headless' if self.headless else 'visible'}-{self.timeout}",
+            lambda: create_stable_chrome_driver(self.headless, self.timeout)
+        )
         return self.driver
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        safe_quit_driver(self.driver)
+        broken = exc_type is not None and issubclass(exc_type, WebDriverException)
+        release_driver(self.driver, broken=broken)
         return False  # Don't suppress exceptions
 
 
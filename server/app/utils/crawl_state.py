@@ -0,0 +1,182 @@
+# app/utils/crawl_state.py
+"""
+High-water marks for incremental crawls, per (site, keyword, location).
+
+Each run stores the postings at the head of the results (newest first) in
+scrape_watermarks. The next run stops paginating once it reaches known
+territory:
+
+    ordered sites (results sorted by date): a page contains a posting from
+        the previous head, so everything after it was seen last time
+    any site: at least INCREMENTAL_KNOWN_RATIO of a page's postings are
+        already stored (URL filter), so later pages are almost all repeats
+
+Every INCREMENTAL_FULL_CRAWL_HOURS a run ignores the marks and walks all
+pages, which catches anything an early stop skipped (reposted or re-ranked
+jobs).
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from app.utils.job_dedup import normalize_url
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_ENABLED = os.getenv("INCREMENTAL_ENABLED", "1") != "0"
+INCREMENTAL_FULL_CRAWL_HOURS = float(os.getenv("INCREMENTAL_FULL_CRAWL_HOURS", "24"))
+INCREMENTAL_KNOWN_RATIO = float(os.getenv("INCREMENTAL_KNOWN_RATIO", "0.8"))
+# How many of the newest postings to remember; enough to survive a few new ones pushing it down
+HEAD_SIZE = 50
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """timestamptz comes back aware (in the session's zone); compare as naive UTC"""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class CrawlTracker:
+    """
+    One (site, keyword, location) crawl:
+
+        tracker = CrawlTracker("careerbuilder", keyword, location)
+        for page in range(1, pages + 1):
+            for card in cards:
+                known = tracker.check(card_url)     # before the job is inserted
+                stored = insert(job) or known
+                if stored:
+                    tracker.saw(card_url)           # only postings now in the table
+            if not tracker.page_done():
+                break
+        tracker.finish()                            # after everything is written
+    """
+
+    def __init__(self, site: str, keyword: str, location: str, ordered: bool = False):
+        self.site = site
+        self.keyword = keyword
+        self.location = location
+        self.ordered = ordered
+        self.pages = 0
+        self.stopped_early = False
+        self._page: List[tuple] = []
+        self._new_head: List[str] = []
+
+        state = self._load() if INCREMENTAL_ENABLED else None
+        self._previous_head = set(state["head_keys"]) if state else set()
+        last_full = state["last_full_crawl_at"] if state else None
+        self.full = (
+            not INCREMENTAL_ENABLED
+            or last_full is None
+            or datetime.utcnow() - _naive_utc(last_full) >= timedelta(hours=INCREMENTAL_FULL_CRAWL_HOURS)
+        )
+        if not self.full:
+            logger.info(f"📈 [{site}] '{keyword}' in '{location}': incremental crawl (last full crawl {last_full:%Y-%m-%d %H:%M})")
+
+    # ===========================
+    # Storage
+    # ===========================
+    def _load(self) -> Optional[Dict]:
+        from app.db.connect_database import db_connection
+
+        try:
+            with db_connection() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    SELECT head_keys, last_full_crawl_at FROM scrape_watermarks
+                    WHERE site = %s AND keyword = %s AND location = %s;
+                """, (self.site, self.keyword, self.location))
+                row = cur.fetchone()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read crawl watermark, doing a full crawl: {e}")
+            return None
+        if not row:
+            return None
+        head_keys = row[0] if isinstance(row[0], list) else json.loads(row[0] or "[]")
+        return {"head_keys": head_keys, "last_full_crawl_at": row[1]}
+
+    def finish(self) -> None:
+        """Store this run's head (and full-crawl time); a run that stored nothing keeps the old mark"""
+        from app.db.connect_database import db_connection
+
+        if not INCREMENTAL_ENABLED:
+            return
+        if self.stopped_early:
+            logger.info(f"📉 [{self.site}] '{self.keyword}': stopped after {self.pages} pages, rest already known")
+        if not self._new_head:
+            return
+        try:
+            with db_connection() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO scrape_watermarks
+                        (site, keyword, location, head_keys, newest_key, pages_last_run, last_run_at, last_full_crawl_at)
+                    VALUES (%s, %s, %s, %s::jsonb, %s, %s, NOW(), CASE WHEN %s THEN NOW() END)
+                    ON CONFLICT (site, keyword, location) DO UPDATE SET
+                        head_keys = EXCLUDED.head_keys,
+                        newest_key = EXCLUDED.newest_key,
+                        pages_last_run = EXCLUDED.pages_last_run,
+                        last_run_at = EXCLUDED.last_run_at,
+                        last_full_crawl_at = COALESCE(EXCLUDED.last_full_crawl_at, scrape_watermarks.last_full_crawl_at);
+                """, (
+                    self.site, self.keyword, self.location, json.dumps(self._new_head[:HEAD_SIZE]),
+                    self._new_head[0], self.pages, self.full and not self.stopped_early,
+                ))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save crawl watermark for [{self.site}] '{self.keyword}': {e}")
+
+    # ===========================
+    # Stop rules
+    # ===========================
+    def cut(self, urls: Sequence[str]) -> int:
+        """
+        Ordered results only: how many leading postings are new, i.e. the index
+        where the previous head starts (len(urls) on a full crawl). One match on
+        its own doesn't count; sponsored cards sit on top whatever their date.
+        """
+        if self.full or not self.ordered:
+            return len(urls)
+        seen = [normalize_url(url) in self._previous_head for url in urls]
+        for index in range(len(seen)):
+            if seen[index] and (index + 1 == len(seen) or seen[index + 1]):
+                return index
+        return len(urls)
+
+    def check(self, url: str) -> bool:
+        """
+        Count a posting on the current page, before it is inserted (afterwards
+        it would count as known); returns whether it was already stored
+        """
+        from app.utils.url_bloom import is_known_url
+
+        key = normalize_url(url)
+        if not key:
+            return False
+        known = key in self._previous_head or is_known_url(url)
+        self._page.append((key, known))
+        return known
+
+    def saw(self, url: str) -> None:
+        """
+        Record a posting that is in the jobs table (just inserted, or known from
+        check()); the first HEAD_SIZE become the next run's head
+        """
+        key = normalize_url(url)
+        if key and len(self._new_head) < HEAD_SIZE and key not in self._new_head:
+            self._new_head.append(key)
+
+    def page_done(self) -> bool:
+        """Close the current page; False means stop paginating"""
+        page, self._page = self._page, []
+        self.pages += 1
+        if self.full or not page:
+            return True
+        if self.ordered and self.cut([key for key, _ in page]) < len(page):
+            self.stopped_early = True
+            return False
+        if sum(1 for _, known in page if known) / len(page) >= INCREMENTAL_KNOWN_RATIO:
+            self.stopped_early = True
+            return False
+        return True
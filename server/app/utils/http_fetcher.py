@@ -0,0 +1,257 @@
+# app/utils/http_fetcher.py
+"""
+HTTP-first page fetching: try a plain pooled HTTP/2 request (gzip/brotli,
+keep-alive) and parse the static HTML with lxml; only when the content we
+need isn't there (JS-rendered page, bot wall) fall back to a browser from the
+shared pool. Which path each site may take is configurable per site, and
+every outcome is counted so we can see how many pages skip the browser.
+
+Site modes:
+    auto    - HTTP first, browser fallback (default)
+    http    - HTTP only
+    browser - always the browser (sites that block plain clients)
+
+Override with HTTP_FETCH_MODES="dice=http,ziprecruiter=browser".
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+HTTP_FETCH_TIMEOUT = float(os.getenv("HTTP_FETCH_TIMEOUT", "15"))
+HTTP_FETCH_MAX_CONNECTIONS = int(os.getenv("HTTP_FETCH_MAX_CONNECTIONS", "20"))
+
+DEFAULT_MODES = {
+    # Cloudflare / CAPTCHA walls: plain clients only ever get the challenge page
+    "indeed": "browser",
+    "monster": "browser",
+}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+
+BOT_WALL_MARKERS = ("cf-challenge", "captcha", "are you a robot", "access denied", "enable javascript")
+
+
+def _load_modes() -> Dict[str, str]:
+    modes = dict(DEFAULT_MODES)
+    for item in os.getenv("HTTP_FETCH_MODES", "").split(","):
+        site, _, mode = item.partition("=")
+        if site.strip() and mode.strip() in ("auto", "http", "browser"):
+            modes[site.strip().lower()] = mode.strip()
+    return modes
+
+
+FETCH_MODES = _load_modes()
+
+
+def site_of(url: str) -> str:
+    """'https://www.careerbuilder.com/job/..' -> 'careerbuilder'"""
+    host = urlparse(url).netloc.lower().split(":")[0]
+    parts = [p for p in host.split(".") if p not in ("www", "m")]
+    return parts[-2] if len(parts) >= 2 else (parts[0] if parts else "")
+
+
+def fetch_mode(url: str) -> str:
+    return FETCH_MODES.get(site_of(url), "auto")
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: Optional[int]
+    html: str
+    via: str  # "http" | "browser"
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.html) and (self.status is None or self.status < 400)
+
+
+# ===========================
+# Stats
+# ===========================
+_stats_lock = threading.Lock()
+_stats: Dict[str, Counter] = defaultdict(Counter)
+
+
+def _count(site: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[site][outcome] += 1
+
+
+def fetch_stats() -> Dict:
+    """Per-site outcomes: http (browser avoided), browser_fallback, browser_only, failed, and why we fell back"""
+    with _stats_lock:
+        report = {}
+        for site, counts in _stats.items():
+            pages = counts["http"] + counts["browser_fallback"] + counts["browser_only"] + counts["failed"]
+            report[site] = {
+                "mode": FETCH_MODES.get(site, "auto"),
+                "pages": pages,
+                "browser_avoided_percent": round(100 * counts["http"] / pages, 1) if pages else None,
+                **{k: v for k, v in counts.items()},
+            }
+        return report
+
+
+# ===========================
+# HTTP
+# ===========================
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _client_options() -> Dict:
+    return dict(
+        http2=True,
+        follow_redirects=True,
+        timeout=HTTP_FETCH_TIMEOUT,
+        headers=HEADERS,
+        limits=httpx.Limits(max_connections=HTTP_FETCH_MAX_CONNECTIONS, max_keepalive_connections=HTTP_FETCH_MAX_CONNECTIONS),
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide keep-alive client (connections are reused across calls)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def close_http_client() -> None:
+    """Close the shared client's pooled connections (server shutdown)"""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def fetch_http(url: str) -> FetchResult:
+    try:
+        response = get_http_client().get(url)
+        return FetchResult(url, response.status_code, response.text, "http")
+    except httpx.HTTPError as e:
+        logger.debug(f"HTTP fetch failed for {url}: {e}")
+        return FetchResult(url, None, "", "http")
+
+
+# ===========================
+# Browser fallback (shared pool)
+# ===========================
+def fetch_browser(url: str, wait_selector: Optional[str] = None) -> FetchResult:
+    from app.utils.chrome_driver_helper import StableChromeDriver
+    from app.utils.waits import AdaptiveWait
+
+    try:
+        with StableChromeDriver(headless=True) as driver:
+            driver.get(url)
+            if wait_selector:
+                AdaptiveWait("http_fetcher").css(driver, wait_selector, timeout=10)
+            return FetchResult(url, None, driver.page_source, "browser")
+    except Exception as e:
+        logger.warning(f"⚠️ Browser fetch failed for {url}: {e}")
+        return FetchResult(url, None, "", "browser")
+
+
+# ===========================
+# Parsing
+# ===========================
+def looks_blocked(result: FetchResult) -> bool:
+    if result.status in (401, 403, 429, 503):
+        return True
+    head = result.html[:5000].lower()
+    return any(marker in head for marker in BOT_WALL_MARKERS)
+
+
+def extract_text(page_html: str, selectors: Sequence[str]) -> Tuple[Optional[str], str]:
+    """(selector, text) of the first selector with non-empty text in static HTML"""
+    if not page_html:
+        return None, ""
+    try:
+        doc = lxml_html.fromstring(page_html)
+    except (ValueError, lxml_html.etree.ParserError):
+        return None, ""
+    for bad in doc.xpath("//script | //style | //noscript"):
+        bad.drop_tree()
+    for selector in selectors:
+        for element in doc.cssselect(selector):
+            text = re.sub(r"[ \t]+", " ", element.text_content())
+            text = re.sub(r"\s*\n\s*", "\n", text).strip()
+            if text:
+                return selector, text
+    return None, ""
+
+
+def _finish(url: str, selectors: Sequence[str], min_length: int, result: FetchResult, outcome: str) -> str:
+    selector, text = extract_text(result.html, selectors)
+    if len(text) >= min_length:
+        _count(site_of(url), outcome)
+        return text
+    _count(site_of(url), "failed")
+    return ""
+
+
+def _http_text(url: str, selectors: Sequence[str], min_length: int, result: FetchResult) -> Tuple[str, str]:
+    """(text, fallback reason); text is empty when the browser is needed"""
+    if not result.ok:
+        return "", f"status {result.status}" if result.status else "network error"
+    if looks_blocked(result):
+        return "", "bot wall"
+    _, text = extract_text(result.html, selectors)
+    if len(text) < min_length:
+        return "", "content missing"
+    return text, ""
+
+
+def fetch_text(url: str, selectors: Sequence[str], min_length: int = 100) -> str:
+    """Text of the first matching selector, over HTTP when the site allows it, else via the browser pool"""
+    site, mode = site_of(url), fetch_mode(url)
+    if mode == "browser":
+        return _finish(url, selectors, min_length, fetch_browser(url, ", ".join(selectors)), "browser_only")
+
+    text, reason = _http_text(url, selectors, min_length, fetch_http(url))
+    if text:
+        _count(site, "http")
+        return text
+    _count(site, f"fallback: {reason}")
+    if mode == "http":
+        _count(site, "failed")
+        return ""
+    return _finish(url, selectors, min_length, fetch_browser(url, ", ".join(selectors)), "browser_fallback")
+
+
+def fetch_page(url: str) -> FetchResult:
+    """Whole page: HTTP when the site allows it and isn't walled off, else the browser"""
+    site, mode = site_of(url), fetch_mode(url)
+    if mode != "browser":
+        result = fetch_http(url)
+        if result.status in (404, 410) or (result.ok and not looks_blocked(result)):
+            _count(site, "http")
+            return result
+        _count(site, f"fallback: {'bot wall' if result.ok else f'status {result.status}'}")
+        if mode == "http":
+            _count(site, "failed")
+            return result
+    result = fetch_browser(url)
+    _count(site, "browser_only" if mode == "browser" else "browser_fallback")
+    return result
+
@@ -0,0 +1,330 @@
+# app/utils/job_dedup.py
+"""
+Dedup stage for the scrapers, ahead of description fetches, skill
+extraction and inserts.
+
+ON CONFLICT (url) only catches the exact same URL, but the same posting
+shows up under different tracking URLs and on several boards. Two checks
+run here instead:
+
+    seen_listing()  - before fetching a description: normalized URL (tracking
+                      params stripped)
+    check()         - once the description is known: a 64-bit SimHash over
+                      title, company and description, where a Hamming
+                      distance <= DEDUP_MAX_DISTANCE counts as the same posting
+
+Both only read the index. A posting is added with register() after its row is
+written (JobBulkWriter.flush), so a failed insert doesn't hide it from the
+next run.
+
+The same title/company/location is only a candidate: companies post several
+requisitions under one title. It counts as a duplicate when the content is
+also close, within the looser DEDUP_LISTING_MAX_DISTANCE.
+
+Fingerprints are split into bands so a lookup only compares against jobs
+sharing at least one band (any pair within the distance limit must share
+one). The process-wide deduper is seeded from recent rows in jobs.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") != "0"
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+# Same title/company/location already makes a repost likely, so the content may differ a bit more
+DEDUP_LISTING_MAX_DISTANCE = int(os.getenv("DEDUP_LISTING_MAX_DISTANCE", "10"))
+DEDUP_SEED_DAYS = int(os.getenv("DEDUP_SEED_DAYS", "30"))
+# Shorter descriptions ("N/A", teaser text) say too little to fingerprint
+DEDUP_MIN_DESCRIPTION = int(os.getenv("DEDUP_MIN_DESCRIPTION", "200"))
+
+FINGERPRINT_BITS = 64
+SHINGLE_WORDS = 3
+
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "ref_id", "referrer", "src", "from",
+    "trk", "tk", "tracking_id", "trackingid", "searchid", "search_id", "searchlink", "ipath", "campaign",
+    "advn", "adid", "vjs", "vjk", "fccid", "xkcb", "lvk", "jrtk",
+}
+TRACKING_PREFIXES = ("utm_", "_hs", "mkt_", "pk_", "trk_")
+# Boards whose posting id is a query param; everything else about the URL is noise
+ID_PARAMS = {"indeed.com": "jk"}
+
+
+def normalize_url(url: str) -> str:
+    """'https://www.indeed.com/rc/clk?jk=abc&from=serp' -> 'indeed.com/viewjob?jk=abc'"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    elif host.startswith("m."):
+        host = host[2:]
+    params = parse_qsl(parts.query, keep_blank_values=False)
+
+    for domain, id_param in ID_PARAMS.items():
+        if host == domain or host.endswith("." + domain):
+            job_id = next((v for k, v in params if k.lower() == id_param), None)
+            if job_id:
+                return f"{domain}/viewjob?{id_param}={job_id}"
+
+    kept = sorted(
+        (k, v) for k, v in params
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = re.sub(r"/+", "/", parts.path).rstrip("/")
+    return f"{host}{path}" + (f"?{urlencode(kept)}" if kept else "")
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", (value or "").lower()))
+
+
+def listing_key(title: Optional[str], company: Optional[str], location: Optional[str]) -> Optional[str]:
+    title, company = _normalize_text(title), _normalize_text(company)
+    if not title or not company or title == "n a" or company in ("unknown", "n a"):
+        return None
+    return f"{title}|{company}|{_normalize_text(location)}"
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word 3-shingles; similar texts get fingerprints a few bits apart"""
+    words = _normalize_text(text).split()
+    if len(words) >= SHINGLE_WORDS:
+        tokens = Counter(" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+    else:
+        tokens = Counter(words)
+    weights = [0] * FINGERPRINT_BITS
+    for token, count in tokens.items():
+        h = _token_hash(token)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def to_signed(fingerprint: int) -> int:
+    """Unsigned 64-bit -> Postgres bigint range"""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def content_fingerprint(title: Optional[str], company: Optional[str], description: Optional[str]) -> Optional[int]:
+    if not description or len(description) < DEDUP_MIN_DESCRIPTION:
+        return None
+    return simhash(f"{title or ''} {company or ''} {description}")
+
+
+class JobDeduper:
+    def __init__(self, max_distance: int = DEDUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        # max_distance + 1 bands: two fingerprints within max_distance bits agree on at least one band
+        self.bands = max_distance + 1
+        self._band_bits = FINGERPRINT_BITS // self.bands
+        self._lock = threading.Lock()
+        self._urls: Set[str] = set()
+        # listing key -> fingerprints of the postings seen under it
+        self._listings: Dict[str, List[int]] = {}
+        self._index: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self.fingerprints = 0
+        self.counts = Counter()
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [(fingerprint >> (i * self._band_bits)) & mask for i in range(self.bands)]
+
+    def _near(self, fingerprint: int) -> Optional[int]:
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for other in self._index[band].get(value, ()):
+                if bin(fingerprint ^ other).count("1") <= self.max_distance:
+                    return other
+        return None
+
+    def _add(self, url_key: str, listing: Optional[str], fingerprint: Optional[int]) -> None:
+        if url_key:
+            self._urls.add(url_key)
+        if listing:
+            fingerprints = self._listings.setdefault(listing, [])
+            if fingerprint is not None:
+                fingerprints.append(fingerprint)
+        if fingerprint is not None:
+            for band, value in enumerate(self._band_values(fingerprint)):
+                self._index[band][value].append(fingerprint)
+            self.fingerprints += 1
+
+    def _listing_match(self, listing: Optional[str], fingerprint: Optional[int]) -> bool:
+        """Same title/company/location and content within DEDUP_LISTING_MAX_DISTANCE"""
+        if not listing or fingerprint is None:
+            return False
+        return any(bin(fingerprint ^ other).count("1") <= DEDUP_LISTING_MAX_DISTANCE
+                   for other in self._listings.get(listing, ()))
+
+    def seen_listing(self, url: str, title: Optional[str] = None, company: Optional[str] = None,
+                     location: Optional[str] = None) -> Optional[str]:
+        """
+        Reason ("url" / "url_filter") if we already have this posting, checked
+        before any description fetch. A title/company/location match alone is
+        only counted: it needs the description to confirm.
+        """
+        from app.utils.url_bloom import is_known_url
+
+        url_key = normalize_url(url)
+        listing = listing_key(title, company, location)
+        # The Bloom filter covers every stored url, not just the seeded window
+        in_table = is_known_url(url)
+        with self._lock:
+            if url_key and url_key in self._urls:
+                reason = "url"
+            elif in_table:
+                reason = "url_filter"
+            else:
+                if listing and listing in self._listings:
+                    self.counts["listing_candidates"] += 1
+                return None
+            self.counts[f"skipped_before_fetch_{reason}"] += 1
+        return reason
+
+    @staticmethod
+    def _keys(job: Dict):
+        url_key = normalize_url(job.get("url") or job.get("link") or "")
+        listing = listing_key(job.get("title"), job.get("company"), job.get("job_location") or job.get("location"))
+        return url_key, listing
+
+    def check(self, job: Dict) -> Optional[str]:
+        """
+        Reason ("url" / "listing" / "near_duplicate") if the job duplicates one we
+        have; otherwise sets job["content_simhash"] and returns None.
+        "listing" needs the fingerprint too; without a description to compare
+        only the url can mark a duplicate.
+        """
+        description = job.get("job_description") or job.get("description")
+        url_key, listing = self._keys(job)
+        fingerprint = content_fingerprint(job.get("title"), job.get("company"), description)
+        with self._lock:
+            self.counts["checked"] += 1
+            if url_key and url_key in self._urls:
+                reason = "url"
+            elif self._listing_match(listing, fingerprint):
+                reason = "listing"
+            elif fingerprint is not None and self._near(fingerprint) is not None:
+                reason = "near_duplicate"
+            else:
+                self.counts["unique"] += 1
+                job["content_simhash"] = to_signed(fingerprint) if fingerprint is not None else None
+                return None
+            self.counts[reason] += 1
+        return reason
+
+    def register(self, job: Dict) -> None:
+        """Add a stored job; reuses the content_simhash check() set"""
+        url_key, listing = self._keys(job)
+        if "content_simhash" in job:
+            fingerprint = to_unsigned(job["content_simhash"]) if job["content_simhash"] is not None else None
+        else:
+            description = job.get("job_description") or job.get("description")
+            fingerprint = content_fingerprint(job.get("title"), job.get("company"), description)
+        with self._lock:
+            self._add(url_key, listing, fingerprint)
+            self.counts["registered"] += 1
+
+    def seed(self, days: int = DEDUP_SEED_DAYS) -> int:
+        """Register jobs inserted in the last `days` days"""
+        from app.db.connect_database import db_connection
+
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT url, title, company, job_location, content_simhash FROM jobs
+                WHERE inserted_at >= NOW() - make_interval(days => %s);
+            """, (days,))
+            rows = cur.fetchall()
+        with self._lock:
+            for url, title, company, location, fingerprint in rows:
+                self._add(normalize_url(url), listing_key(title, company, location),
+                          to_unsigned(fingerprint) if fingerprint is not None else None)
+        return len(rows)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "urls": len(self._urls),
+                "listings": len(self._listings),
+                "fingerprints": self.fingerprints,
+                "max_distance": self.max_distance,
+                **self.counts,
+            }
+
+
+_deduper: Optional[JobDeduper] = None
+_deduper_lock = threading.Lock()
+
+
+def get_job_deduper() -> JobDeduper:
+    """Process-wide deduper, seeded from the DB on first use"""
+    global _deduper
+    if _deduper is None:
+        with _deduper_lock:
+            if _deduper is None:
+                deduper = JobDeduper()
+                try:
+                    seeded = deduper.seed()
+                    logger.info(f"🧬 Dedup index seeded with {seeded} jobs from the last {DEDUP_SEED_DAYS} days")
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not seed dedup index, starting empty: {e}")
+                _deduper = deduper
+    return _deduper
+
+
+def load_dedup_indexes() -> None:
+    """
+    Seed the dedup index and load the URL filter; both scan the jobs table, so
+    async scrapers call this through asyncio.to_thread before their first lookup
+    """
+    from app.utils.url_bloom import get_url_filter
+
+    if DEDUP_ENABLED:
+        get_job_deduper()
+    get_url_filter()
+
+
+def warm_dedup_indexes() -> threading.Thread:
+    """Load both in the background at startup so the first scrape doesn't pay for it"""
+    def run():
+        try:
+            load_dedup_indexes()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not preload dedup indexes: {e}")
+
+    thread = threading.Thread(target=run, name="dedup-index-load", daemon=True)
+    thread.start()
+    return thread
+
+
+def seen_listing(url: str, title: Optional[str] = None, company: Optional[str] = None,
+                 location: Optional[str] = None) -> Optional[str]:
+    return get_job_deduper().seen_listing(url, title, company, location) if DEDUP_ENABLED else None
+
+
+def check_job(job: Dict) -> Optional[str]:
+    return get_job_deduper().check(job) if DEDUP_ENABLED else None
+
+
+def register_jobs(jobs: Iterable[Dict]) -> None:
+    """Record written jobs (no-op until the deduper is seeded; the seed reads them from the table)"""
+    if not DEDUP_ENABLED or _deduper is None:
+        return
+    for job in jobs:
+        _deduper.register(job)
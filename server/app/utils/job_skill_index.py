@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.utils.skill_bitmatrix import SkillBitMatrix, top_k
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+# Removed jobs leave empty rows behind; rebuild the arrays once this many pile up
+JOB_INDEX_COMPACT_AFTER = int(os.getenv("JOB_INDEX_COMPACT_AFTER", "5000"))
+
+
+def _parse_skills(raw) -> List[str]:
+    """jobs.skills is jsonb but some rows were written as a JSON-encoded string"""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    if not isinstance(raw, (list, tuple, set)):
+        return []
+    return [s.lower().strip() for s in raw if isinstance(s, str) and s.strip()]
+
+
+class JobSkillIndex:
+    """
+    In-memory index of the already-extracted jobs.skills column.
+
+    Every job is a row of a packed skill bit matrix, so scoring a resume
+    against all jobs is one vectorized AND + popcount and the top-k comes
+    from argpartition; rows are added/removed as jobs are inserted.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_names: List[str] = []
+        self._matrix = SkillBitMatrix()
+        self._status_codes: Dict[str, int] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._job_ids: List[Optional[str]] = []
+        self._doc_skills: List[Set[int]] = []
+        self._doc_meta: List[Optional[Dict]] = []
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def _skill_id(self, skill: str) -> int:
+        sid = self._skill_ids.get(skill)
+        if sid is None:
+            sid = len(self._skill_names)
+            self._skill_ids[skill] = sid
+            self._skill_names.append(skill)
+        return sid
+
+    def _status_code(self, status: Optional[str]) -> int:
+        return self._status_codes.setdefault(status or "", len(self._status_codes) + 1)
+
+    def add_job(self, job_id: str, skills, title: str = "", company: str = "", status: Optional[str] = None) -> None:
+        """Index (or re-index) one job"""
+        job_id = str(job_id)
+        with self._lock:
+            self.remove_job(job_id)
+            skill_ids = {self._skill_id(s) for s in _parse_skills(skills)}
+            doc = len(self._job_ids)
+            self._doc_ids[job_id] = doc
+            self._job_ids.append(job_id)
+            self._doc_skills.append(skill_ids)
+            self._doc_meta.append({"title": title, "company": company})
+            self._matrix.set_row(doc, skill_ids, tag=self._status_code(status))
+
+    def remove_job(self, job_id: str) -> None:
+        with self._lock:
+            doc = self._doc_ids.pop(str(job_id), None)
+            if doc is None:
+                return
+            self._matrix.clear_row(doc)
+            self._job_ids[doc] = None
+            self._doc_skills[doc] = set()
+            self._doc_meta[doc] = None
+            if len(self._job_ids) - len(self._doc_ids) >= JOB_INDEX_COMPACT_AFTER:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Drop the rows of removed jobs; doc numbers of live jobs shift down"""
+        live = [doc for doc, job_id in enumerate(self._job_ids) if job_id is not None]
+        matrix = SkillBitMatrix(rows=len(live), skills=len(self._skill_names))
+        for new_doc, doc in enumerate(live):
+            matrix.set_row(new_doc, self._doc_skills[doc], tag=int(self._matrix.tags[doc]))
+        self._matrix = matrix
+        self._job_ids = [self._job_ids[doc] for doc in live]
+        self._doc_skills = [self._doc_skills[doc] for doc in live]
+        self._doc_meta = [self._doc_meta[doc] for doc in live]
+        self._doc_ids = {job_id: doc for doc, job_id in enumerate(self._job_ids)}
+        logger.info(f"🧹 Compacted job skill index to {len(live)} jobs")
+
+    def load_from_db(self, supabase_client=None, page_size: int = PAGE_SIZE) -> int:
+        """Rebuild the index from jobs.id/title/company/skills, paging through the table"""
+        if supabase_client is None:
+            from app.db.connect_database import supabase as supabase_client
+
+        fresh = JobSkillIndex()
+        start = 0
+        while True:
+            rows = supabase_client.table("jobs") \
+                .select("id", "title", "company", "status", "skills") \
+                .order("id") \
+                .range(start, start + page_size - 1) \
+                .execute().data or []
+            for row in rows:
+                fresh.add_job(row["id"], row.get("skills"), row.get("title") or "", row.get("company") or "", row.get("status"))
+            if len(rows) < page_size:
+                break
+            start += page_size
+
+        with self._lock:
+            self._skill_ids, self._skill_names = fresh._skill_ids, fresh._skill_names
+            self._matrix, self._status_codes, self._doc_ids = fresh._matrix, fresh._status_codes, fresh._doc_ids
+            self._job_ids, self._doc_skills, self._doc_meta = fresh._job_ids, fresh._doc_skills, fresh._doc_meta
+            self.loaded = True
+        logger.info(f"✅ Job skill index loaded: {len(self)} jobs, {len(self._skill_names)} skills")
+        return len(self)
+
+    def _scores(self, resume_set: Set[str], status: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        resume_ids = [self._skill_ids[s] for s in resume_set if s in self._skill_ids]
+        overlap = self._matrix.overlap(resume_ids)
+        if status is None:
+            mask = self._matrix.mask()
+        elif status in self._status_codes:
+            mask = self._matrix.mask(self._status_codes[status])
+        else:
+            mask = np.zeros(overlap.shape[0], dtype=bool)
+        return overlap, mask
+
+    def _result(self, doc: int, score, resume_set: Set[str], include_skills: bool = True) -> Dict:
+        meta = self._doc_meta[doc] or {}
+        result = {
+            "id": self._job_ids[doc],
+            "title": meta.get("title", ""),
+            "company": meta.get("company", ""),
+            "match_score": int(score),
+        }
+        job_skills = sorted(self._skill_names[sid] for sid in self._doc_skills[doc])
+        result["matched_skills"] = [s for s in job_skills if s in resume_set]
+        if include_skills:
+            result["missing_skills"] = [s for s in job_skills if s not in resume_set]
+            result["job_skills"] = job_skills
+        return result
+
+    def match(self, resume_skills: List[str], limit: int = 10) -> List[Dict]:
+        """Top jobs by number of shared skills (jobs sharing none are excluded)"""
+        return self.match_page(resume_skills, limit=limit)[0]
+
+    def match_page(
+        self,
+        resume_skills: List[str],
+        limit: int = 10,
+        offset: int = 0,
+        min_score: int = 1,
+        include_skills: bool = True
+    ) -> Tuple[List[Dict], int]:
+        """
+        One page of jobs ranked by shared skills; returns (page, total matching).
+
+        Only the best offset + limit rows are selected (argpartition), so the
+        work and the response stay bounded however many jobs match.
+        """
+        resume_set = {s.lower() for s in resume_skills}
+        with self._lock:
+            overlap, mask = self._scores(resume_set, None)
+            eligible = mask & (overlap >= max(min_score, 1))
+            docs = top_k(overlap, offset + limit, eligible)[offset:]
+            page = [self._result(doc, overlap[doc], resume_set, include_skills) for doc in docs]
+            return page, int(eligible.sum())
+
+    def match_by_percent(
+        self,
+        resume_skills: List[str],
+        min_percent: int = 0,
+        limit: int = 10,
+        status: Optional[str] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        Jobs whose skills the resume covers by at least min_percent
+        (round(100 * matched / job skills)); returns (top results, total found).
+        """
+        resume_set = {s.lower() for s in resume_skills}
+        with self._lock:
+            overlap, mask = self._scores(resume_set, status)
+            counts = self._matrix.counts[:overlap.shape[0]]
+            percent = np.rint(100.0 * overlap / np.maximum(counts, 1)).astype(np.int32)
+            eligible = mask & (percent >= min_percent)
+            docs = top_k(percent, limit, eligible)
+            return [self._result(doc, percent[doc], resume_set) for doc in docs], int(eligible.sum())
+
+
+_job_skill_index = JobSkillIndex()
+_load_lock = threading.Lock()
+
+
+def get_job_skill_index() -> JobSkillIndex:
+    """Process-wide index, loaded from the jobs table on first use"""
+    if not _job_skill_index.loaded:
+        with _load_lock:
+            if not _job_skill_index.loaded:
+                _job_skill_index.load_from_db()
+    return _job_skill_index
+
+
+def warm_job_skill_index() -> threading.Thread:
+    """Load the index in the background so the first match request doesn't pay for it"""
+    def run():
+        try:
+            get_job_skill_index()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not preload job skill index: {e}")
+
+    thread = threading.Thread(target=run, name="job-skill-index-load", daemon=True)
+    thread.start()
+    return thread
+
+
+def index_inserted_job(job_id, job: Dict) -> None:
+    """Keep the index current after a scraper inserts a row (no-op until loaded)"""
+    if job_id is None or not _job_skill_index.loaded:
+        return
+    skills = job.get("skills")
+    if skills is None:
+        skills = job.get("flat_skills")
+    _job_skill_index.add_job(
+        str(job_id), skills or [], job.get("title") or "", job.get("company") or "", job.get("status")
+    )
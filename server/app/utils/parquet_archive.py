@@ -0,0 +1,238 @@
+# app/utils/parquet_archive.py
+"""
+Columnar archive of scraped jobs: Parquet files with a fixed Arrow schema,
+partitioned as <root>/site=<site>/date=<YYYY-MM-DD>/<run>-<n>.parquet.
+
+skills is a list<string> and skills_by_category a map<string, list<string>>,
+so analytics read them as columns instead of JSON-decoding CSV cells, and
+reading a single column (or one site/date partition) never touches the
+descriptions.
+
+    with JobParquetWriter("zip_playwright") as archive:
+        archive.write(job)
+
+    read_archive(columns=["site", "skills"], filters=[("site", "=", "ZipRecruiter")])
+
+Existing CSV exports can be backfilled with `python -m app.utils.parquet_archive`.
+"""
+
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.utils.write_jobs import canonical_job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_PATH = Path(__file__).resolve().parents[2] / "job_archive"
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "5000"))
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+
+# site/date are stored as the directory partitions, not inside the files
+FILE_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("title", pa.string()),
+    ("company", pa.string()),
+    ("job_location", pa.string()),
+    ("job_state", pa.string()),
+    ("salary", pa.string()),
+    ("applied", pa.bool_()),
+    ("saved", pa.bool_()),
+    ("url", pa.string()),
+    ("job_description", pa.string()),
+    ("search_term", pa.string()),
+    ("category", pa.string()),
+    ("priority", pa.string()),
+    ("status", pa.string()),
+    ("inserted_at", pa.timestamp("us")),
+    ("last_verified", pa.timestamp("us")),
+    ("skills", pa.list_(pa.string())),
+    ("skills_by_category", pa.map_(pa.string(), pa.list_(pa.string()))),
+    ("user_id", pa.string()),
+])
+JOB_SCHEMA = FILE_SCHEMA.append(pa.field("site", pa.string())).append(pa.field("date", pa.date32()))
+
+
+def get_archive_path() -> Path:
+    return Path(os.getenv("JOB_ARCHIVE_PATH", str(DEFAULT_ARCHIVE_PATH)))
+
+
+# ===========================
+# Value normalization
+# ===========================
+def _json_value(value, default):
+    """CSV rows carry lists/dicts as JSON strings; scrapers pass them as objects"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value) if value else default
+        except ValueError:
+            return default
+    return value if value is not None else default
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if value:
+        try:
+            return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_date(value) -> date:
+    parsed = _to_datetime(value)
+    return parsed.date() if parsed else datetime.utcnow().date()
+
+
+def _to_bool(value) -> bool:
+    return value in (True, "True", "true", "t", "1")
+
+
+def _text(value) -> Optional[str]:
+    return None if value is None or value == "" else str(value)
+
+
+def job_record(job: Dict) -> Dict:
+    """Job dict (scraper or CSV row) -> values matching JOB_SCHEMA"""
+    job = canonical_job(job)
+    by_category = _json_value(job.get("skills_by_category"), {})
+    return {
+        "id": _text(job.get("id")),
+        "title": _text(job.get("title")),
+        "company": _text(job.get("company")),
+        "job_location": _text(job.get("job_location")),
+        "job_state": _text(job.get("job_state")),
+        "salary": _text(job.get("salary")),
+        "applied": _to_bool(job.get("applied")),
+        "saved": _to_bool(job.get("saved")),
+        "url": _text(job.get("url")),
+        "job_description": job.get("job_description") or "",
+        "search_term": _text(job.get("search_term")),
+        "category": _text(job.get("category")),
+        "priority": _text(job.get("priority")),
+        "status": _text(job.get("status")),
+        "inserted_at": _to_datetime(job.get("inserted_at")),
+        "last_verified": _to_datetime(job.get("last_verified")),
+        "skills": [str(s) for s in _json_value(job.get("skills"), [])],
+        "skills_by_category": [(str(k), [str(s) for s in v]) for k, v in by_category.items()],
+        "user_id": _text(job.get("user_id")),
+        "site": _text(job.get("site")) or "unknown",
+        "date": _to_date(job.get("date")),
+    }
+
+
+def _partition_dir(root: Path, site: str, day: date) -> Path:
+    # Hive-style key=value directories; keep the site value path-safe
+    safe_site = re.sub(r"[^A-Za-z0-9_.-]+", "_", site)
+    return root / f"site={safe_site}" / f"date={day.isoformat()}"
+
+
+class JobParquetWriter:
+    """
+    Buffers jobs per (site, date) partition and writes a Parquet file per
+    partition every `row_group_size` rows and on close(), so a run's memory
+    stays bounded by the buffer rather than the whole scrape.
+    """
+
+    def __init__(self, label: str = "jobs", root: Optional[Path] = None, row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+                 compression: str = PARQUET_COMPRESSION):
+        self.label = label
+        self.root = Path(root) if root is not None else get_archive_path()
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{label}"
+        self.rows = 0
+        self.files: List[Path] = []
+        self._buffers: Dict[tuple, List[Dict]] = defaultdict(list)
+        self._parts: Dict[tuple, int] = defaultdict(int)
+
+    def write(self, job: Dict) -> None:
+        # Same alias mapping as the CSV writer, so scrapers using link/description aren't dropped
+        job = canonical_job(job)
+        if not job.get("url"):
+            return
+        record = job_record(job)
+        key = (record.pop("site"), record.pop("date"))
+        buffer = self._buffers[key]
+        buffer.append(record)
+        self.rows += 1
+        if len(buffer) >= self.row_group_size:
+            self._flush(key)
+
+    def write_many(self, jobs: Iterable[Dict]) -> None:
+        for job in jobs:
+            self.write(job)
+
+    def _flush(self, key: tuple) -> None:
+        records = self._buffers.pop(key, None)
+        if not records:
+            return
+        site, day = key
+        self._parts[key] += 1
+        folder = _partition_dir(self.root, site, day)
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{self.run_id}-{self._parts[key]:03d}.parquet"
+        table = pa.Table.from_pylist(records, schema=FILE_SCHEMA)
+        pq.write_table(table, path, compression=self.compression, row_group_size=self.row_group_size)
+        self.files.append(path)
+
+    def flush(self) -> None:
+        for key in list(self._buffers):
+            self._flush(key)
+
+    def close(self) -> List[Path]:
+        self.flush()
+        if self.files:
+            print(f"🗄️ Archived {self.rows} jobs to {len(self.files)} Parquet files under {self.root}")
+        return self.files
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_archive(root: Optional[Path] = None) -> ds.Dataset:
+    """The whole archive as one dataset; site/date come back as columns from the directory names"""
+    partitioning = ds.partitioning(pa.schema([("site", pa.string()), ("date", pa.date32())]), flavor="hive")
+    return ds.dataset(str(root or get_archive_path()), format="parquet", schema=JOB_SCHEMA, partitioning=partitioning)
+
+
+def read_archive(columns: Optional[List[str]] = None, filters=None, root: Optional[Path] = None) -> pa.Table:
+    """
+    Only the requested columns are read, and partition filters such as
+    [("site", "=", "Dice"), ("date", ">=", date(2026, 1, 1))] skip whole directories.
+    """
+    expression = pq.filters_to_expression(filters) if filters else None
+    return open_archive(root).to_table(columns=columns, filter=expression)
+
+
+def archive_csv_files(folder=None, root: Optional[Path] = None) -> Dict[str, int]:
+    """Backfill: convert job_data CSV exports into the Parquet archive"""
+    from app.config.config_utils import get_job_data_folder
+    from app.utils.write_jobs import iter_job_csv_files, read_job_csv
+
+    files = iter_job_csv_files(folder or get_job_data_folder())
+    with JobParquetWriter("backfill", root=root) as writer:
+        for path in files:
+            writer.write_many(read_job_csv(path))
+    return {"csv_files": len(files), "rows": writer.rows, "parquet_files": len(writer.files)}
+
+
+if __name__ == "__main__":
+    stats = archive_csv_files()
+    print(f"📦 {stats['csv_files']} CSV files → {stats['rows']} rows in {stats['parquet_files']} Parquet files")
@@ -0,0 +1,257 @@
+# app/utils/process_registry.py
+"""
+Registry of the browser processes this server spawned.
+
+Each driver/browser is registered with its root pids (chromedriver, and the
+browser itself when it runs detached like undetected_chromedriver's
+use_subprocess=True). Their process trees are snapshotted so that when a
+driver is quit - or its chromedriver crashes and the Chrome children get
+re-parented - exactly those processes are reaped. Nothing outside the
+registry is ever touched, so several scrapers (or several servers) can share
+one machine.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# (pid, create_time): create_time guards against the OS reusing a pid
+ProcessKey = Tuple[int, float]
+
+
+@dataclass
+class _TrackedTree:
+    label: str
+    roots: List[ProcessKey]
+    known: Set[ProcessKey] = field(default_factory=set)
+    registered: float = field(default_factory=time.time)
+    # Weak reference to the owner: id() is reused once an owner is collected
+    owner: Optional[weakref.ref] = None
+
+    def owned_by(self, owner: object) -> bool:
+        return self.owner is None or self.owner() is owner
+
+
+_lock = threading.Lock()
+_trees: Dict[int, _TrackedTree] = {}
+_reaped = 0
+
+
+def _owner_ref(owner: object) -> Optional[weakref.ref]:
+    try:
+        return weakref.ref(owner)
+    except TypeError:
+        return None
+
+
+def _tree_of(owner: object) -> Optional[_TrackedTree]:
+    """owner's tree; caller holds _lock. A tree left by a collected object with the same id() doesn't count"""
+    tree = _trees.get(id(owner))
+    return tree if tree is not None and tree.owned_by(owner) else None
+
+
+def _key(proc: psutil.Process) -> Optional[ProcessKey]:
+    try:
+        return proc.pid, proc.create_time()
+    except psutil.Error:
+        return None
+
+
+def _process(key: ProcessKey) -> Optional[psutil.Process]:
+    """The live process for this key, or None if it exited (or the pid was reused)"""
+    try:
+        proc = psutil.Process(key[0])
+        if proc.create_time() == key[1] and proc.status() != psutil.STATUS_ZOMBIE:
+            return proc
+    except psutil.Error:
+        pass
+    return None
+
+
+def _snapshot(tree: _TrackedTree) -> None:
+    """Remember every current descendant so they can still be found after the root dies"""
+    for root_key in tree.roots:
+        root = _process(root_key)
+        if root is None:
+            continue
+        tree.known.add(root_key)
+        try:
+            children = root.children(recursive=True)
+        except psutil.Error:
+            continue
+        for child in children:
+            key = _key(child)
+            if key:
+                tree.known.add(key)
+
+
+def _live(tree: _TrackedTree) -> List[psutil.Process]:
+    return [proc for proc in map(_process, tree.known) if proc is not None]
+
+
+def _kill(tree: _TrackedTree) -> int:
+    _snapshot(tree)
+    procs = _live(tree)
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    psutil.wait_procs(procs, timeout=3)
+    return len(procs)
+
+
+def _driver_pids(driver) -> List[int]:
+    pids = []
+    service_process = getattr(getattr(driver, "service", None), "process", None)
+    if getattr(service_process, "pid", None):
+        pids.append(service_process.pid)
+    # undetected_chromedriver starts Chrome detached from chromedriver
+    if getattr(driver, "browser_pid", None):
+        pids.append(driver.browser_pid)
+    return pids
+
+
+def register_pids(owner: object, pids: Iterable[int], label: str) -> None:
+    """Track these root pids (and their descendants) on behalf of owner"""
+    roots = []
+    for pid in pids:
+        try:
+            key = _key(psutil.Process(pid))
+        except psutil.Error:
+            key = None
+        if key:
+            roots.append(key)
+    if not roots:
+        return
+    tree = _TrackedTree(label=label, roots=roots, owner=_owner_ref(owner))
+    _snapshot(tree)
+    with _lock:
+        stale = _trees.get(id(owner))
+        _trees[id(owner)] = tree
+    if stale is not None and not stale.owned_by(owner):
+        # Its owner was collected without being reaped; whatever it left running is ours to clean up
+        killed = _kill(stale)
+        if killed:
+            logger.warning(f"🧹 Reaped {killed} processes of a {stale.label} that was never quit")
+    reap_dead()
+
+
+def register_driver(driver, label: str = "selenium") -> None:
+    """Track a Selenium driver's chromedriver and browser process trees"""
+    if driver is None:
+        return
+    with _lock:
+        if _tree_of(driver) is not None:
+            return
+    register_pids(driver, _driver_pids(driver), label)
+
+
+def child_pids() -> Set[int]:
+    """Direct children of this process (diff before/after a launch to find what it spawned)"""
+    try:
+        return {proc.pid for proc in psutil.Process(os.getpid()).children()}
+    except psutil.Error:
+        return set()
+
+
+def reap(owner: object) -> int:
+    """Kill whatever is left of owner's process tree and stop tracking it"""
+    global _reaped
+    with _lock:
+        tree = _tree_of(owner)
+        if tree is None:
+            return 0
+        _trees.pop(id(owner))
+    killed = _kill(tree)
+    if killed:
+        _reaped += killed
+        logger.info(f"🧹 Reaped {killed} leftover {tree.label} processes")
+    return killed
+
+
+def reap_dead() -> int:
+    """Reap trees whose root process exited on its own (crashed drivers)"""
+    global _reaped
+    with _lock:
+        dead = {owner: tree for owner, tree in _trees.items()
+                if all(_process(root) is None for root in tree.roots)}
+        for owner in dead:
+            _trees.pop(owner)
+    killed = 0
+    for tree in dead.values():
+        count = _kill(tree)
+        if count:
+            logger.warning(f"🧹 {tree.label} crashed; reaped {count} orphaned processes")
+        killed += count
+    _reaped += killed
+    return killed
+
+
+def reap_all() -> int:
+    with _lock:
+        owners = list(_trees)
+    killed = 0
+    for owner in owners:
+        with _lock:
+            tree = _trees.pop(owner, None)
+        if tree is not None:
+            killed += _kill(tree)
+    return killed
+
+
+def tree_rss_mb(owner: object) -> float:
+    """Resident memory of owner's live process tree, in MB"""
+    with _lock:
+        tree = _tree_of(owner)
+    if tree is None:
+        return 0.0
+    _snapshot(tree)
+    return _rss_mb(_live(tree))
+
+
+def _rss_mb(procs: Iterable[psutil.Process]) -> float:
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def process_stats() -> Dict:
+    """Count and RSS of every tracked browser tree, for the health endpoint"""
+    reap_dead()
+    with _lock:
+        trees = list(_trees.values())
+    browsers = []
+    for tree in trees:
+        _snapshot(tree)
+        procs = _live(tree)
+        browsers.append({
+            "label": tree.label,
+            "root_pids": [pid for pid, _ in tree.roots],
+            "processes": len(procs),
+            "rss_mb": round(_rss_mb(procs), 1),
+            "age_seconds": round(time.time() - tree.registered),
+        })
+    return {
+        "tracked_browsers": len(browsers),
+        "processes": sum(b["processes"] for b in browsers),
+        "rss_mb": round(sum(b["rss_mb"] for b in browsers), 1),
+        "reaped": _reaped,
+        "browsers": browsers,
+    }
+
+
+atexit.register(reap_all)
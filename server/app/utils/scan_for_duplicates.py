@@ -1,21 +1,33 @@
-from app.db.connect_database import get_db_connection
+from collections import defaultdict
+
+from app.db.connect_database import db_connection
+from app.utils.job_dedup import normalize_url
 
 def scan_for_duplicates():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT url, COUNT(*) as count
-        FROM jobs
-        GROUP BY url
-        HAVING COUNT(*) > 1
-    """)
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT url, COUNT(*) as count
+            FROM jobs
+            GROUP BY url
+            HAVING COUNT(*) > 1
+        """)
+        rows = cur.fetchall()
+        cur.execute("SELECT url FROM jobs WHERE archived_at IS NULL")
+        urls = [url for (url,) in cur.fetchall()]
 
     if rows:
         print("🚨 Found duplicate job URLs:")
         for url, count in rows:
             print(f"{url} — {count} times")
     else:
-        print("✅ No duplicate job URLs found.")
\ No newline at end of file
+        print("✅ No duplicate job URLs found.")
+
+    # Same posting stored under different tracking URLs
+    variants = defaultdict(set)
+    for url in urls:
+        variants[normalize_url(url)].add(url)
+    groups = {key: found for key, found in variants.items() if len(found) > 1}
+    if groups:
+        print(f"🚨 Found {len(groups)} postings stored under several URLs:")
+        for key, found in groups.items():
+            print(f"{key} — {len(found)} URLs")
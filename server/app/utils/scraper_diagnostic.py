@@ -5,64 +5,53 @@ Run this to verify everything is working correctly
 import sys
 import json
 from datetime import datetime
-from app.db.connect_database import get_db_connection
+from app.db.connect_database import db_connection
 
 def test_database_connection():
     """Test if database connection works"""
     print("\n🔍 Testing Database Connection...")
-    conn = None
-    cur = None
-
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Check if jobs table exists
-        cur.execute("""
-            SELECT COUNT(*) FROM information_schema.tables 
-            WHERE table_schema = 'public' AND table_name = 'jobs'
-        """)
-        result = cur.fetchone()
+        with db_connection() as conn, conn.cursor() as cur:
+            # Check if jobs table exists
+            cur.execute("""
+                SELECT COUNT(*) FROM information_schema.tables 
+                WHERE table_schema = 'public' AND table_name = 'jobs'
+            """)
+            result = cur.fetchone()
 
-        if not result or result[0] == 0:
-            print("❌ Jobs table does not exist!")
-            return False
+            if not result or result[0] == 0:
+                print("❌ Jobs table does not exist!")
+                return False
 
-        # Check current job count
-        cur.execute("SELECT COUNT(*) FROM jobs")
-        row = cur.fetchone()
-        count = row[0] if row else 0
-        print(f"✅ Database connected! Current jobs: {count}")
+            # Check current job count
+            cur.execute("SELECT COUNT(*) FROM jobs")
+            row = cur.fetchone()
+            count = row[0] if row else 0
+            print(f"✅ Database connected! Current jobs: {count}")
 
-        # Show sample of latest jobs
-        cur.execute("""
-            SELECT title, company, site, inserted_at 
-            FROM jobs 
-            ORDER BY inserted_at DESC 
-            LIMIT 5
-        """)
-        recent = cur.fetchall()
+            # Show sample of latest jobs
+            cur.execute("""
+                SELECT title, company, site, inserted_at 
+                FROM jobs 
+                ORDER BY inserted_at DESC 
+                LIMIT 5
+            """)
+            recent = cur.fetchall()
 
-        if recent:
-            print("\n📋 Latest jobs in database:")
-            for job in recent:
-                title = job[0] or "Untitled"
-                company = job[1] or "Unknown"
-                site = job[2] or "N/A"
-                inserted_at = job[3].strftime("%Y-%m-%d %H:%M:%S") if job[3] else "Unknown"
-                print(f"   • {title[:40]} | {company} | {site} | {inserted_at}")
+            if recent:
+                print("\n📋 Latest jobs in database:")
+                for job in recent:
+                    title = job[0] or "Untitled"
+                    company = job[1] or "Unknown"
+                    site = job[2] or "N/A"
+                    inserted_at = job[3].strftime("%Y-%m-%d %H:%M:%S") if job[3] else "Unknown"
+                    print(f"   • {title[:40]} | {company} | {site} | {inserted_at}")
 
         return True
 
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         return False
-
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 def test_job_insertion():
     """Test inserting a sample job"""
     print("\n🔍 Testing Job Insertion...")
@@ -213,35 +202,31 @@ def check_database_schema():
     print("\n🔍 Checking Database Schema...")
     
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT column_name, data_type 
+                FROM information_schema.columns 
+                WHERE table_name = 'jobs'
+                ORDER BY ordinal_position
+            """)
         
-        cur.execute("""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = 'jobs'
-            ORDER BY ordinal_position
-        """)
+            columns = cur.fetchall()
+            print(f"✅ Jobs table has {len(columns)} columns")
         
-        columns = cur.fetchall()
-        print(f"✅ Jobs table has {len(columns)} columns")
+            required_columns = [
+                'id', 'title', 'company', 'job_location', 'job_state', 
+                'salary', 'site', 'date', 'applied', 'saved', 'url',
+                'job_description', 'search_term', 'skills', 'skills_by_category'
+            ]
         
-        required_columns = [
-            'id', 'title', 'company', 'job_location', 'job_state', 
-            'salary', 'site', 'date', 'applied', 'saved', 'url',
-            'job_description', 'search_term', 'skills', 'skills_by_category'
-        ]
+            existing_columns = [col[0] for col in columns]
+            missing = [col for col in required_columns if col not in existing_columns]
         
-        existing_columns = [col[0] for col in columns]
-        missing = [col for col in required_columns if col not in existing_columns]
-        
-        if missing:
-            print(f"⚠️ Missing columns: {missing}")
-        else:
-            print("✅ All required columns present")
+            if missing:
+                print(f"⚠️ Missing columns: {missing}")
+            else:
+                print("✅ All required columns present")
         
-        cur.close()
-        conn.close()
         return True
         
     except Exception as e:
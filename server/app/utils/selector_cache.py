@@ -0,0 +1,181 @@
+# app/utils/selector_cache.py
+"""
+Per-site memory of which CSS selector fallback actually works.
+
+Scrapers keep lists of candidate selectors per "slot" (job cards, title,
+description, ...). Instead of walking the list in source order on every page
+and card, find_first()/afind_first() try the last winning selector first,
+then the rest by hit rate, and record every hit and miss. The stats are
+persisted to disk so a fresh process starts with the learned order, and a
+winner switch is logged since it usually means the site's layout changed.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "selector_cache.json"
+SELECTOR_CACHE_SAVE_EVERY = int(os.getenv("SELECTOR_CACHE_SAVE_EVERY", "50"))
+# Consecutive lookups the winner must miss before another selector takes over;
+# cards on one page often mix variants, so a single miss isn't a layout change
+SELECTOR_SWITCH_AFTER = int(os.getenv("SELECTOR_SWITCH_AFTER", "5"))
+
+
+def get_cache_path() -> Path:
+    return Path(os.getenv("SELECTOR_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+
+
+class SelectorCache:
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_path()
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = self._load()
+        self._dirty = 0
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable selector cache {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._data, indent=2)
+            self._dirty = 0
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save selector cache: {e}")
+
+    def _slot(self, site: str, slot: str) -> Dict[str, Any]:
+        return self._data.setdefault(site, {}).setdefault(
+            slot, {"winner": None, "attempts": 0, "found": 0, "switches": 0, "selectors": {}}
+        )
+
+    def ranked(self, site: str, slot: str, candidates: Sequence[str]) -> List[str]:
+        """Candidates in try order: last winner, then best hit rate, then source order"""
+        with self._lock:
+            entry = self._slot(site, slot)
+            stats = entry["selectors"]
+            winner = entry["winner"]
+
+        def score(item: Tuple[int, str]):
+            index, selector = item
+            s = stats.get(selector, {})
+            hits, misses = s.get("hits", 0), s.get("misses", 0)
+            # Laplace-smoothed so untried selectors sit between proven and failing ones
+            return (selector != winner, -(hits + 1) / (hits + misses + 2), index)
+
+        return [selector for _, selector in sorted(enumerate(candidates), key=score)]
+
+    def record(self, site: str, slot: str, tried: List[str], winner: Optional[str]) -> None:
+        """Book one lookup: every selector in `tried` missed except `winner`"""
+        with self._lock:
+            entry = self._slot(site, slot)
+            entry["attempts"] += 1
+            for selector in tried:
+                s = entry["selectors"].setdefault(selector, {"hits": 0, "misses": 0})
+                if selector == winner:
+                    s["hits"] += 1
+                    s["last_hit"] = datetime.utcnow().isoformat()
+                else:
+                    s["misses"] += 1
+            previous = entry["winner"]
+            if winner is not None:
+                entry["found"] += 1
+                if previous is None:
+                    entry["winner"] = winner
+                elif previous == winner:
+                    entry["winner_misses"] = 0
+                else:
+                    entry["winner_misses"] = entry.get("winner_misses", 0) + 1
+                    if entry["winner_misses"] >= SELECTOR_SWITCH_AFTER:
+                        entry["winner"] = winner
+                        entry["winner_misses"] = 0
+                        entry["switches"] += 1
+                        entry["last_switch"] = datetime.utcnow().isoformat()
+                        logger.warning(f"🔀 [{site}/{slot}] '{previous}' stopped matching, now using '{winner}' (layout change?)")
+            self._dirty += 1
+            due = self._dirty >= SELECTOR_CACHE_SAVE_EVERY
+        if due:
+            self.save()
+
+    def stats(self, site: Optional[str] = None) -> Dict:
+        with self._lock:
+            sites = {site: self._data.get(site, {})} if site else dict(self._data)
+            report = {}
+            for name, slots in sites.items():
+                report[name] = {}
+                for slot, entry in slots.items():
+                    report[name][slot] = {
+                        "winner": entry["winner"],
+                        "hit_rate": round(entry["found"] / entry["attempts"], 3) if entry["attempts"] else None,
+                        "attempts": entry["attempts"],
+                        "switches": entry["switches"],
+                        "last_switch": entry.get("last_switch"),
+                        "selectors": {
+                            selector: {
+                                **s,
+                                "hit_rate": round(s["hits"] / (s["hits"] + s["misses"]), 3) if s["hits"] + s["misses"] else None,
+                            }
+                            for selector, s in entry["selectors"].items()
+                        },
+                    }
+            return report
+
+
+selector_cache = SelectorCache()
+atexit.register(selector_cache.save)
+
+
+def find_first(site: str, slot: str, candidates: Sequence[str], probe: Callable[[str], Any]) -> Tuple[Optional[str], Any]:
+    """
+    Try candidates in learned order; probe(selector) returns something truthy
+    on a match (and may raise). Returns (winning selector, probe result).
+    """
+    tried = []
+    for selector in selector_cache.ranked(site, slot, candidates):
+        tried.append(selector)
+        try:
+            result = probe(selector)
+        except Exception:
+            result = None
+        if result:
+            selector_cache.record(site, slot, tried, selector)
+            return selector, result
+    selector_cache.record(site, slot, tried, None)
+    return None, None
+
+
+async def afind_first(site: str, slot: str, candidates: Sequence[str], probe: Callable[[str], Awaitable[Any]]) -> Tuple[Optional[str], Any]:
+    """find_first for async (Playwright) probes"""
+    tried = []
+    for selector in selector_cache.ranked(site, slot, candidates):
+        tried.append(selector)
+        try:
+            result = await probe(selector)
+        except Exception:
+            result = None
+        if result:
+            selector_cache.record(site, slot, tried, selector)
+            return selector, result
+    selector_cache.record(site, slot, tried, None)
+    return None, None
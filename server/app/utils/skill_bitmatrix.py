@@ -0,0 +1,106 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+WORD_BITS = 64
+
+if hasattr(np, "bitwise_count"):
+    def _popcount_rows(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int32)
+else:
+    _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount_rows(words: np.ndarray) -> np.ndarray:
+        as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape[0], -1)
+        return _POPCOUNT8[as_bytes].sum(axis=1, dtype=np.int32)
+
+
+class SkillBitMatrix:
+    """
+    Packed job × skill bit matrix (one uint64 word per 64 skill ids).
+
+    Scoring a resume against every row is one AND + popcount over the words
+    that contain resume skills, so it stays vectorized at hundreds of
+    thousands of rows. Rows and skill columns grow geometrically so jobs can
+    be added one at a time.
+    """
+
+    def __init__(self, rows: int = 1024, skills: int = WORD_BITS):
+        self.bits = np.zeros((max(rows, 1), max(1, -(-skills // WORD_BITS))), dtype=np.uint64)
+        self.counts = np.zeros(self.bits.shape[0], dtype=np.int32)
+        self.alive = np.zeros(self.bits.shape[0], dtype=bool)
+        self.tags = np.zeros(self.bits.shape[0], dtype=np.int16)
+        self.n_rows = 0
+
+    def _ensure(self, row: int, skill_id: int = 0) -> None:
+        n_rows, n_words = self.bits.shape
+        need_rows = row + 1
+        need_words = skill_id // WORD_BITS + 1
+        if need_rows <= n_rows and need_words <= n_words:
+            return
+        new_rows = max(n_rows * 2, need_rows) if need_rows > n_rows else n_rows
+        new_words = max(n_words * 2, need_words) if need_words > n_words else n_words
+        bits = np.zeros((new_rows, new_words), dtype=np.uint64)
+        bits[:n_rows, :n_words] = self.bits
+        self.bits = bits
+        if new_rows > n_rows:
+            extra = new_rows - n_rows
+            self.counts = np.concatenate([self.counts, np.zeros(extra, dtype=np.int32)])
+            self.alive = np.concatenate([self.alive, np.zeros(extra, dtype=bool)])
+            self.tags = np.concatenate([self.tags, np.zeros(extra, dtype=np.int16)])
+
+    def set_row(self, row: int, skill_ids: Iterable[int], tag: int = 0) -> None:
+        skill_ids = list(skill_ids)
+        self._ensure(row, max(skill_ids, default=0))
+        self.bits[row] = 0
+        for sid in skill_ids:
+            self.bits[row, sid // WORD_BITS] |= np.uint64(1) << np.uint64(sid % WORD_BITS)
+        self.counts[row] = len(set(skill_ids))
+        self.alive[row] = True
+        self.tags[row] = tag
+        self.n_rows = max(self.n_rows, row + 1)
+
+    def clear_row(self, row: int) -> None:
+        if row < self.n_rows:
+            self.bits[row] = 0
+            self.counts[row] = 0
+            self.alive[row] = False
+
+    def overlap(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """Number of the given skills present in each row (length n_rows)"""
+        n_words = self.bits.shape[1]
+        query = np.zeros(n_words, dtype=np.uint64)
+        for sid in skill_ids:
+            if sid // WORD_BITS < n_words:
+                query[sid // WORD_BITS] |= np.uint64(1) << np.uint64(sid % WORD_BITS)
+        words = np.flatnonzero(query)
+        if words.size == 0:
+            return np.zeros(self.n_rows, dtype=np.int32)
+        return _popcount_rows(self.bits[:self.n_rows, words] & query[words])
+
+    def mask(self, tag: Optional[int] = None) -> np.ndarray:
+        alive = self.alive[:self.n_rows]
+        if tag is None:
+            return alive
+        return alive & (self.tags[:self.n_rows] == tag)
+
+
+def top_k(scores: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Row indices of the k highest scores, restricted to mask. Ordered by
+    (-score, row) so equal scores always come back in row order and
+    consecutive pages (k = offset + limit) never overlap or skip a job.
+    """
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(scores.shape[0])
+    if k <= 0 or candidates.size == 0:
+        return candidates[:0]
+    values = scores[candidates]
+    if candidates.size > k:
+        # Everything above the k-th score, then the lowest rows among those tied with it
+        kth = -np.partition(-values, k - 1)[k - 1]
+        above = np.flatnonzero(values > kth)
+        tied = np.flatnonzero(values == kth)[:k - above.size]
+        keep = np.concatenate([above, tied])
+        candidates, values = candidates[keep], values[keep]
+    order = np.lexsort((candidates, -values))
+    return candidates[order]
@@ -0,0 +1,201 @@
+import re
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character that `re` uses for \\b on str patterns"""
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lowercased skill names.
+
+    Finds every skill in a single pass over the lowercased text instead of
+    running one regex per skill. With word_bounded=True the results are
+    identical to `extract_flat_skills` (r"\\b<skill>\\b"), otherwise they match
+    the plain substring test used by `extract_skills`.
+    """
+
+    def __init__(self, skills: Iterable[str], word_bounded: bool = True):
+        self.word_bounded = word_bounded
+        self.patterns: List[str] = []
+        self.originals: List[Set[str]] = []
+        self._empty: Set[str] = set()
+
+        pattern_ids: Dict[str, int] = {}
+        for skill in skills:
+            if not isinstance(skill, str):
+                continue
+            pattern = skill.lower()
+            if not pattern:
+                self._empty.add(skill)
+                continue
+            if pattern not in pattern_ids:
+                pattern_ids[pattern] = len(self.patterns)
+                self.patterns.append(pattern)
+                self.originals.append(set())
+            self.originals[pattern_ids[pattern]].add(skill)
+
+        self._lengths = [len(p) for p in self.patterns]
+        self._first_word = [_is_word_char(p[0]) for p in self.patterns]
+        self._last_word = [_is_word_char(p[-1]) for p in self.patterns]
+        self._build()
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[int]] = [[]]
+
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(pid)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                candidate = goto[f].get(ch, 0)
+                fail[nxt] = candidate if candidate != nxt else 0
+                output[nxt].extend(output[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._output = [tuple(o) for o in output]
+
+    def _matched_ids(self, lowered: str) -> Set[int]:
+        goto, fail, output = self._goto, self._fail, self._output
+        lengths, first_word, last_word = self._lengths, self._first_word, self._last_word
+        bounded = self.word_bounded
+        text_len = len(lowered)
+        found: Set[int] = set()
+        state = 0
+
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            for pid in output[state]:
+                if pid in found:
+                    continue
+                if bounded:
+                    start = i - lengths[pid] + 1
+                    before = start > 0 and _is_word_char(lowered[start - 1])
+                    after = i + 1 < text_len and _is_word_char(lowered[i + 1])
+                    if before == first_word[pid] or after == last_word[pid]:
+                        continue
+                found.add(pid)
+        return found
+
+    def matched_patterns(self, text: str) -> Set[str]:
+        """Lowercased skill names found in the text"""
+        lowered = (text or "").lower()
+        found = {self.patterns[pid] for pid in self._matched_ids(lowered)}
+        if self._empty and self._empty_matches(lowered):
+            found.add("")
+        return found
+
+    def extract(self, text: str) -> List[str]:
+        """Sorted original skill names found in the text"""
+        lowered = (text or "").lower()
+        found: Set[str] = set()
+        for pid in self._matched_ids(lowered):
+            found.update(self.originals[pid])
+        if self._empty and self._empty_matches(lowered):
+            found.update(self._empty)
+        return sorted(found)
+
+    def _empty_matches(self, lowered: str) -> bool:
+        if not self.word_bounded:
+            return True
+        return re.search(r"\b", lowered) is not None
+
+
+def benchmark_matcher(descriptions: List[str], skill_list: List[str], rounds: int = 3) -> Dict[str, float]:
+    """
+    Compare throughput (descriptions/sec) of the per-skill regex scan against
+    the automaton and verify both return the same skills for every description.
+    """
+    from app.utils.skills_engine import _extract_flat_skills_regex
+
+    descriptions = [d for d in descriptions if d]
+    if not descriptions:
+        raise ValueError("No descriptions to benchmark")
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(skill_list)
+    build_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for d in descriptions
+        if matcher.extract(d) != _extract_flat_skills_regex(d, skill_list)
+    )
+
+    def rate(fn) -> float:
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for d in descriptions:
+                fn(d)
+            best = min(best, time.perf_counter() - start)
+        return len(descriptions) / best if best else float("inf")
+
+    regex_rate = rate(lambda d: _extract_flat_skills_regex(d, skill_list))
+    automaton_rate = rate(matcher.extract)
+
+    return {
+        "descriptions": len(descriptions),
+        "skills": len(skill_list),
+        "build_ms": round(build_seconds * 1000, 2),
+        "regex_per_sec": round(regex_rate, 1),
+        "automaton_per_sec": round(automaton_rate, 1),
+        "speedup": round(automaton_rate / regex_rate, 2) if regex_rate else 0.0,
+        "mismatches": mismatches,
+    }
+
+
+def _load_benchmark_descriptions(limit: Optional[int] = None) -> List[str]:
+    from app.config.config_utils import get_job_data_folder
+    from app.utils.write_jobs import iter_job_csv_files, read_job_csv
+
+    descriptions: List[str] = []
+    for file in iter_job_csv_files(get_job_data_folder()):
+        for row in read_job_csv(file):
+            text = row.get("job_description") or row.get("description")
+            if text:
+                descriptions.append(text)
+                if limit and len(descriptions) >= limit:
+                    return descriptions
+    return descriptions
+
+
+if __name__ == "__main__":
+    from app.utils.skills_engine import load_flat_skills
+
+    skills = load_flat_skills()
+    descriptions = _load_benchmark_descriptions(limit=2000)
+    if not descriptions:
+        print("⚠️ No scraped descriptions found in job_data to benchmark against.")
+    else:
+        stats = benchmark_matcher(descriptions, skills)
+        print(
+            f"📊 {stats['descriptions']} descriptions × {stats['skills']} skills → "
+            f"regex {stats['regex_per_sec']}/s, automaton {stats['automaton_per_sec']}/s "
+            f"({stats['speedup']}x), mismatches: {stats['mismatches']}"
+        )
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "skill_matrix_cache.json"
+
+
+def get_cache_path() -> Path:
+    return Path(os.getenv("SKILL_MATRIX_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+
+
+def matrix_hash(matrix: List[Dict]) -> str:
+    """Stable content hash of the skill_categories rows (order-insensitive)"""
+    rows = sorted(json.dumps(row, sort_keys=True, default=str) for row in matrix)
+    return hashlib.sha256("\n".join(rows).encode("utf-8")).hexdigest()
+
+
+def read_cache(path: Optional[Path] = None) -> Optional[Dict]:
+    """Return {"hash", "fetched_at", "matrix"} or None if missing/corrupt"""
+    path = path or get_cache_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Ignoring unreadable skill matrix cache {path}: {e}")
+        return None
+
+    matrix = data.get("matrix")
+    if not isinstance(matrix, list) or data.get("hash") != matrix_hash(matrix):
+        logger.warning(f"⚠️ Skill matrix cache {path} failed its hash check, ignoring it")
+        return None
+    return data
+
+
+def write_cache(matrix: List[Dict], path: Optional[Path] = None) -> str:
+    """Atomically write the matrix with its hash; returns the hash"""
+    path = path or get_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = matrix_hash(matrix)
+    payload = {
+        "hash": digest,
+        "fetched_at": datetime.utcnow().isoformat(),
+        "matrix": matrix,
+    }
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, default=str)
+    os.replace(tmp_path, path)
+    return digest
@@ -1,9 +1,20 @@
 import re
 import json
-from typing import Optional, List, Dict
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional, List, Dict, Set, Tuple
 from app.supabase.supabase_client import supabase
+from app.utils.skill_matcher import SkillMatcher
+from app.utils import skill_matrix_cache
 import os
 
+logger = logging.getLogger(__name__)
+
+SKILL_MATRIX_REFRESH_HOURS = float(os.getenv("SKILL_MATRIX_REFRESH_HOURS", "12"))
+
 def load_flat_skills(filepath: Optional[str] = None) -> List[str]:
     """Load flat skills list from JSON file"""
     if filepath is None:
@@ -18,34 +29,83 @@ def load_flat_skills(filepath: Optional[str] = None) -> List[str]:
         data = json.load(f)
         return [s.lower().strip() for s in data.get("skills", [])]
 
-def load_skill_matrix() -> List[Dict]:
+def fetch_skill_matrix() -> List[Dict]:
     """Load categorized skills from Supabase"""
     response = supabase.table("skill_categories").select("*").execute()
     return response.data or []
 
+def load_skill_matrix(refresh: bool = False) -> List[Dict]:
+    """
+    Load categorized skills, preferring the on-disk cache over Supabase.
+
+    Supabase is only queried when there is no valid cache (or refresh=True);
+    if it is unreachable we fall back to whatever cache exists, else [].
+    """
+    if not refresh:
+        cached = skill_matrix_cache.read_cache()
+        if cached is not None:
+            return cached["matrix"]
+
+    try:
+        matrix = fetch_skill_matrix()
+    except Exception as e:
+        cached = skill_matrix_cache.read_cache()
+        if cached is not None:
+            logger.warning(f"⚠️ skill_categories unreachable ({e}), using cache from {cached.get('fetched_at')}")
+            return cached["matrix"]
+        logger.error(f"❌ skill_categories unreachable and no cache available: {e}")
+        return []
+
+    try:
+        skill_matrix_cache.write_cache(matrix)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write skill matrix cache: {e}")
+    return matrix
+
+@lru_cache(maxsize=16)
+def _cached_matcher(skills: Tuple[str, ...], word_bounded: bool) -> SkillMatcher:
+    return SkillMatcher(skills, word_bounded=word_bounded)
+
+def get_skill_matcher(skills: List[str], word_bounded: bool = True) -> SkillMatcher:
+    """Return a compiled matcher for this skill list, built once and reused"""
+    # The shared index's own tuples already have matchers; skip rebuilding and hashing the key
+    index = _skill_index
+    if index is not None:
+        if word_bounded and skills is index.flat:
+            return index.flat_matcher
+        if not word_bounded and skills is index.combined_flat:
+            return index.combined_matcher
+    return _cached_matcher(tuple(s for s in skills if isinstance(s, str)), word_bounded)
+
 def extract_skills(description: str, skills: List[str]) -> List[str]:
     """Extract skills from description (basic matching)"""
-    lowered = (description or "").lower()
-    matched = {
-        skill for skill in skills
-        if isinstance(skill, str) and skill.lower() in lowered
-    }
-    return sorted(matched)
+    return get_skill_matcher(skills, word_bounded=False).extract(description)
 
-def extract_skills_by_category(description: str, skill_matrix: List[Dict]) -> Dict[str, List[str]]:
-    """Extract skills organized by category"""
+def _group_by_category(found_patterns: Set[str], skill_matrix: Iterable[Mapping]) -> Dict[str, List[str]]:
     matches = {}
-    lowered = (description or "").lower()
-    
     for section in skill_matrix:
-        found = [s for s in section.get("skills", []) if s.lower() in lowered]
+        found = [s for s in section.get("skills", []) if s.lower() in found_patterns]
         if found:
             matches[section["category"]] = found
-    
     return matches
 
+def extract_skills_by_category(description: str, skill_matrix: List[Dict]) -> Dict[str, List[str]]:
+    """Extract skills organized by category"""
+    index = _skill_index
+    if index is not None and skill_matrix is index.matrix:
+        return index.extract_by_category(description)
+    all_skills = [s for section in skill_matrix for s in section.get("skills", [])]
+    found_patterns = get_skill_matcher(all_skills, word_bounded=False).matched_patterns(description)
+    return _group_by_category(found_patterns, skill_matrix)
+
 def extract_flat_skills(description: str, skill_list: List[str]) -> List[str]:
     """Extract skills using word boundary matching (more accurate)"""
+    if not description:
+        return []
+    return get_skill_matcher(skill_list).extract(description)
+
+def _extract_flat_skills_regex(description: str, skill_list: List[str]) -> List[str]:
+    """Reference per-skill regex scan, kept for benchmarking the matcher"""
     if not description:
         return []
     
@@ -60,15 +120,123 @@ def extract_flat_skills(description: str, skill_list: List[str]) -> List[str]:
     
     return sorted(found)
 
-def load_all_skills(frontend_skills: Optional[List[str]] = None):
-    """Load all skill data structures"""
-    flat = load_flat_skills()
-    matrix = load_skill_matrix()
-    frontend_skills = frontend_skills or []
-    combined = sorted(set(flat + frontend_skills))
-    
-    return {
-        "flat": flat,
-        "matrix": matrix,
-        "combined_flat": combined
-    }
\ No newline at end of file
+@dataclass(frozen=True)
+class SkillIndex:
+    """
+    Immutable skill data plus precompiled matchers.
+
+    Built once per process (see get_skill_index) and shared by the API and
+    every scraper. Still supports SKILLS["flat"] / SKILLS.get("matrix") so
+    code written against the old load_all_skills() dict keeps working.
+    """
+    flat: Tuple[str, ...]
+    matrix: Tuple[Mapping[str, Any], ...]
+    combined_flat: Tuple[str, ...]
+    flat_matcher: SkillMatcher = field(repr=False, compare=False)
+    combined_matcher: SkillMatcher = field(repr=False, compare=False)
+    category_matcher: SkillMatcher = field(repr=False, compare=False)
+
+    _KEYS = ("flat", "matrix", "combined_flat")
+
+    @classmethod
+    def build(cls, flat: List[str], matrix: List[Dict], frontend_skills: Optional[List[str]] = None) -> "SkillIndex":
+        sections = tuple(
+            MappingProxyType({**section, "skills": tuple(section.get("skills") or [])})
+            for section in matrix or []
+        )
+        combined = tuple(sorted(set(flat) | set(frontend_skills or [])))
+        category_skills = [s for section in sections for s in section["skills"]]
+        return cls(
+            flat=tuple(flat),
+            matrix=sections,
+            combined_flat=combined,
+            flat_matcher=SkillMatcher(flat),
+            combined_matcher=SkillMatcher(combined, word_bounded=False),
+            category_matcher=SkillMatcher(category_skills, word_bounded=False),
+        )
+
+    def extract_flat(self, text: str) -> List[str]:
+        """Same as extract_flat_skills(text, self.flat)"""
+        if not text:
+            return []
+        return self.flat_matcher.extract(text)
+
+    def extract_combined(self, text: str) -> List[str]:
+        """Same as extract_skills(text, self.combined_flat)"""
+        return self.combined_matcher.extract(text)
+
+    def extract_by_category(self, text: str) -> Dict[str, List[str]]:
+        """Same as extract_skills_by_category(text, self.matrix)"""
+        return _group_by_category(self.category_matcher.matched_patterns(text), self.matrix)
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self._KEYS else default
+
+
+_skill_index: Optional[SkillIndex] = None
+_skill_index_lock = threading.Lock()
+
+def get_skill_index() -> SkillIndex:
+    """Process-wide SkillIndex; skills.json and skill_categories are read only once"""
+    global _skill_index
+    if _skill_index is None:
+        with _skill_index_lock:
+            if _skill_index is None:
+                _skill_index = SkillIndex.build(load_flat_skills(), load_skill_matrix())
+    return _skill_index
+
+def refresh_skill_matrix() -> Optional[SkillIndex]:
+    """
+    Re-fetch skill_categories and, only if its content hash changed, rewrite
+    the cache and swap in a rebuilt shared SkillIndex. Returns the new index
+    or None when nothing changed.
+    """
+    global _skill_index
+    matrix = fetch_skill_matrix()
+    digest = skill_matrix_cache.matrix_hash(matrix)
+    cached = skill_matrix_cache.read_cache()
+    if cached is not None and cached["hash"] == digest:
+        return None
+
+    skill_matrix_cache.write_cache(matrix)
+    with _skill_index_lock:
+        flat = list(_skill_index.flat) if _skill_index is not None else load_flat_skills()
+        _skill_index = SkillIndex.build(flat, matrix)
+    logger.info(f"🔄 Skill matrix changed (hash {digest[:12]}), rebuilt SkillIndex")
+    return _skill_index
+
+def start_skill_matrix_refresh(
+    on_change: Optional[Callable[[SkillIndex], None]] = None,
+    interval_hours: float = SKILL_MATRIX_REFRESH_HOURS
+) -> threading.Event:
+    """
+    Refresh the skill matrix in a daemon thread now and then every
+    interval_hours (0 = once). Set the returned event to stop it.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                index = refresh_skill_matrix()
+                if index is not None and on_change:
+                    on_change(index)
+            except Exception as e:
+                logger.warning(f"⚠️ Background skill matrix refresh failed: {e}")
+            if interval_hours <= 0 or stop.wait(interval_hours * 3600):
+                break
+
+    threading.Thread(target=run, name="skill-matrix-refresh", daemon=True).start()
+    return stop
+
+def load_all_skills(frontend_skills: Optional[List[str]] = None) -> SkillIndex:
+    """Load all skill data structures (shared index unless extra frontend skills are given)"""
+    index = get_skill_index()
+    if not frontend_skills:
+        return index
+    return SkillIndex.build(list(index.flat), [dict(s) for s in index.matrix], frontend_skills)
\ No newline at end of file
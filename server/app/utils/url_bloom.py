@@ -0,0 +1,174 @@
+# app/utils/url_bloom.py
+"""
+Process-wide "have we stored this URL?" filter, so scrapers can skip a job's
+detail page before navigating instead of fetching the description and
+letting ON CONFLICT (url) throw it away.
+
+A Bloom filter over the normalized URLs of every row in jobs (preloaded once,
+streamed with a server-side cursor) and extended as batches are inserted.
+It never misses a stored URL; a new URL is wrongly reported as known with
+probability URL_BLOOM_ERROR_RATE, which only costs that one job until the
+next run's pages list it again.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from app.utils.job_dedup import normalize_url
+
+logger = logging.getLogger(__name__)
+
+URL_BLOOM_ENABLED = os.getenv("URL_BLOOM_ENABLED", "1") != "0"
+URL_BLOOM_ERROR_RATE = float(os.getenv("URL_BLOOM_ERROR_RATE", "0.001"))
+URL_BLOOM_MIN_CAPACITY = int(os.getenv("URL_BLOOM_MIN_CAPACITY", "200000"))
+# After a failed preload, wait this long before trying the DB again
+URL_BLOOM_RETRY_SECONDS = 300
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = URL_BLOOM_ERROR_RATE):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> bool:
+        """Set the key's bits; True if it wasn't (probably) present before"""
+        new = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] >> bit & 1:
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p // 8] >> (p % 8) & 1 for p in self._positions(key))
+
+    @property
+    def expected_error_rate(self) -> float:
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+class UrlFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self.loaded_rows = 0
+        self.load_seconds = 0.0
+        self.lookups = 0
+        self.hits = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._bloom is not None
+
+    def load(self) -> int:
+        """(Re)build from every url in jobs, sized with headroom for this run's inserts"""
+        from app.db.connect_database import db_connection
+
+        start = time.perf_counter()
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) FROM jobs;")
+                total = cur.fetchone()[0]
+            bloom = BloomFilter(max(URL_BLOOM_MIN_CAPACITY, total * 2))
+            # Server-side cursor: the urls stream in chunks instead of landing in memory at once
+            with conn.cursor(name="url_bloom_preload") as cur:
+                cur.itersize = 50000
+                cur.execute("SELECT url FROM jobs WHERE url IS NOT NULL;")
+                rows = 0
+                for (url,) in cur:
+                    bloom.add(normalize_url(url))
+                    rows += 1
+
+        with self._lock:
+            self._bloom = bloom
+            self.loaded_rows = rows
+            self.load_seconds = time.perf_counter() - start
+        logger.info(
+            f"🌸 URL filter loaded {rows} urls in {self.load_seconds:.1f}s "
+            f"({len(bloom.bits) / 1024 / 1024:.1f} MB, {bloom.hashes} hashes)"
+        )
+        return rows
+
+    def might_contain(self, url: str) -> bool:
+        key = normalize_url(url)
+        with self._lock:
+            if self._bloom is None or not key:
+                return False
+            self.lookups += 1
+            if key in self._bloom:
+                self.hits += 1
+                return True
+            return False
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        keys = [normalize_url(url) for url in urls if url]
+        with self._lock:
+            if self._bloom is None:
+                return  # the next load() reads them from the table anyway
+            for key in keys:
+                self._bloom.add(key)
+            full = self._bloom.count > self._bloom.capacity
+        if full:
+            logger.warning("⚠️ URL filter is over capacity; its false-positive rate is climbing until it is reloaded")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            bloom = self._bloom
+            return {
+                "loaded": bloom is not None,
+                "loaded_rows": self.loaded_rows,
+                "load_seconds": round(self.load_seconds, 2),
+                "entries": bloom.count if bloom else 0,
+                "capacity": bloom.capacity if bloom else 0,
+                "memory_mb": round(len(bloom.bits) / 1024 / 1024, 2) if bloom else 0,
+                "expected_error_rate": round(bloom.expected_error_rate, 6) if bloom else None,
+                "lookups": self.lookups,
+                "known": self.hits,
+            }
+
+
+_url_filter = UrlFilter()
+_load_lock = threading.Lock()
+_retry_at = 0.0
+
+
+def get_url_filter() -> UrlFilter:
+    """Shared filter, preloaded from the DB on first use (an empty one if that fails)"""
+    global _retry_at
+    if not _url_filter.loaded and URL_BLOOM_ENABLED and time.monotonic() >= _retry_at:
+        with _load_lock:
+            if not _url_filter.loaded and time.monotonic() >= _retry_at:
+                try:
+                    _url_filter.load()
+                except Exception as e:
+                    _retry_at = time.monotonic() + URL_BLOOM_RETRY_SECONDS
+                    logger.warning(f"⚠️ Could not preload URL filter, every job will be fetched: {e}")
+    return _url_filter
+
+
+def is_known_url(url: str) -> bool:
+    return URL_BLOOM_ENABLED and get_url_filter().might_contain(url)
+
+
+def remember_urls(urls: Iterable[str]) -> None:
+    """Called after inserts; a no-op until a scraper has loaded the filter"""
+    _url_filter.add_many(urls)
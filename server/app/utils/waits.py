@@ -0,0 +1,140 @@
+# app/utils/waits.py
+"""
+Condition-based waits for the scrapers, replacing fixed time.sleep /
+wait_for_timeout calls. Each wait returns as soon as its DOM condition holds
+(or gives up at the timeout), and every second spent waiting is booked under
+a reason so the dead time per job shows up in the logs.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 0.1
+
+
+class AdaptiveWait:
+    """Per-run wait helper for one scraper; call log_summary() at the end"""
+
+    def __init__(self, scraper: str):
+        self.scraper = scraper
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.timeouts: Dict[str, int] = defaultdict(int)
+
+    def _book(self, reason: str, start: float, timed_out: bool = False) -> None:
+        self.seconds[reason] += time.monotonic() - start
+        if timed_out:
+            self.timeouts[reason] += 1
+
+    # ===========================
+    # Selenium
+    # ===========================
+    def until(self, driver, condition: Callable, timeout: float = 15, reason: str = "condition"):
+        """WebDriverWait(...).until(condition), or None on timeout"""
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=POLL_SECONDS).until(condition)
+            self._book(reason, start)
+            return result
+        except TimeoutException:
+            self._book(reason, start, timed_out=True)
+            return None
+
+    def css(self, driver, selector: str, timeout: float = 15, visible: bool = False):
+        """First element matching selector once it is present (or visible)"""
+        check = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+        return self.until(driver, check((By.CSS_SELECTOR, selector)), timeout, reason=selector)
+
+    def css_all(self, driver, selector: str, timeout: float = 15) -> List:
+        return self.until(driver, EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)), timeout, reason=selector) or []
+
+    def new_window(self, driver, count: int, timeout: float = 10) -> bool:
+        return self.until(driver, EC.number_of_windows_to_be(count), timeout, reason="new window") is not None
+
+    def stable_text(self, element, timeout: float = 10, previous: Optional[str] = None, reason: str = "content") -> str:
+        """
+        Element text once it is non-empty, differs from `previous` (e.g. a drawer
+        still showing the last job) and stops changing between two polls.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        last = None
+        while True:
+            try:
+                text = element.text
+            except StaleElementReferenceException:
+                text = ""
+            if text and text != previous and text == last:
+                self._book(reason, start)
+                return text
+            if time.monotonic() >= deadline:
+                self._book(reason, start, timed_out=True)
+                return text
+            last = text
+            time.sleep(POLL_SECONDS * 2)
+
+    def pause(self, low: float, high: float, reason: str = "politeness") -> None:
+        """Deliberate jitter - only where the site needs us to look human or go slow"""
+        start = time.monotonic()
+        time.sleep(random.uniform(low, high))
+        self._book(reason, start)
+
+    # ===========================
+    # Playwright (async)
+    # ===========================
+    async def selector(self, page, selector: str, timeout: float = 15, state: str = "attached"):
+        """page.wait_for_selector with a timeout in seconds; None instead of raising"""
+        start = time.monotonic()
+        try:
+            handle = await page.wait_for_selector(selector, timeout=timeout * 1000, state=state)
+            self._book(selector, start)
+            return handle
+        except Exception:
+            self._book(selector, start, timed_out=True)
+            return None
+
+    async def hidden(self, handle, timeout: float = 3, reason: str = "dismiss") -> None:
+        start = time.monotonic()
+        try:
+            await handle.wait_for_element_state("hidden", timeout=timeout * 1000)
+            self._book(reason, start)
+        except Exception:
+            self._book(reason, start, timed_out=True)
+
+    async def apause(self, low: float, high: float, reason: str = "politeness") -> None:
+        start = time.monotonic()
+        await asyncio.sleep(random.uniform(low, high))
+        self._book(reason, start)
+
+    # ===========================
+    # Reporting
+    # ===========================
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def summary(self, jobs: int = 0) -> Dict:
+        return {
+            "scraper": self.scraper,
+            "wait_seconds": round(self.total_seconds, 2),
+            "wait_seconds_per_job": round(self.total_seconds / jobs, 2) if jobs else None,
+            "by_reason": {reason: round(s, 2) for reason, s in sorted(self.seconds.items(), key=lambda kv: -kv[1])},
+            "timeouts": dict(self.timeouts),
+        }
+
+    def log_summary(self, jobs: int = 0) -> None:
+        s = self.summary(jobs)
+        per_job = f", {s['wait_seconds_per_job']}s/job" if jobs else ""
+        logger.info(f"⏱️ [{self.scraper}] Waited {s['wait_seconds']}s{per_job} {s['by_reason']}")
+        if s["timeouts"]:
+            logger.info(f"⏱️ [{self.scraper}] Wait timeouts: {s['timeouts']}")
@@ -1,27 +1,262 @@
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 import csv
-from typing import Optional
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from app.config.config_utils import get_output_folder
 
+logger = logging.getLogger(__name__)
+
+# Fixed schema: same columns as the jobs table, whatever keys a scraper happens to set
+CSV_FIELDS = (
+    "id", "title", "company", "job_location", "job_state", "salary", "site",
+    "date", "applied", "saved", "url", "job_description", "search_term",
+    "category", "priority", "status", "inserted_at", "last_verified",
+    "skills", "skills_by_category", "user_id",
+)
+
+# Older scrapers build jobs with these keys instead of the column names; every writer maps them back
+FIELD_ALIASES = {
+    "url": ("link",),
+    "job_description": ("description",),
+    "job_location": ("location",),
+    "skills": ("flat_skills",),
+}
+
+JOB_CSV_COMPRESSION = os.getenv("JOB_CSV_COMPRESSION", "gzip")  # gzip | zstd | none
+JOB_CSV_ROTATE_MB = float(os.getenv("JOB_CSV_ROTATE_MB", "64"))
+JOB_CSV_ROTATE_MINUTES = float(os.getenv("JOB_CSV_ROTATE_MINUTES", "60"))
+# never | rotate (on file close) | batch (every JOB_CSV_FSYNC_ROWS rows) | always (every row)
+JOB_CSV_FSYNC = os.getenv("JOB_CSV_FSYNC", "batch")
+JOB_CSV_FSYNC_ROWS = int(os.getenv("JOB_CSV_FSYNC_ROWS", "100"))
+# Also feed every job into the Parquet archive (app/utils/parquet_archive.py, needs pyarrow)
+JOB_PARQUET_ARCHIVE = os.getenv("JOB_PARQUET_ARCHIVE", "0") != "0"
+
+EXTENSIONS = {"gzip": ".csv.gz", "zstd": ".csv.zst", "none": ".csv"}
+PART_SUFFIX = ".part"
+
+
+def _cell(value):
+    """Lists/dicts as JSON (sync_jobs json.loads them back), dates as ISO strings"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def canonical_job(job: Dict) -> Dict:
+    """job with alias keys (link, description, location, flat_skills) copied onto the column names"""
+    missing = [field for field in FIELD_ALIASES if job.get(field) is None]
+    if not any(job.get(alias) is not None for field in missing for alias in FIELD_ALIASES[field]):
+        return job
+    job = dict(job)
+    for field in missing:
+        job[field] = next((job[alias] for alias in FIELD_ALIASES[field] if job.get(alias) is not None), None)
+    return job
+
+
+class JobCsvWriter:
+    """
+    Streams job dicts into compressed CSV files as a scraper finds them,
+    instead of holding the whole run in memory and writing once at the end.
+
+    Files are written as `<name>.part` and renamed when they are rotated
+    (by uncompressed size or age) or the writer is closed, so a `.part` file
+    means a run that didn't finish. Every flush ends a compressed block, so
+    a crashed run's rows up to the last flush can still be read back.
+
+        with JobCsvWriter("zip_playwright") as out:
+            for job in scrape():
+                out.write(job)
+    """
+
+    def __init__(
+        self,
+        label: str = "jobs",
+        folder_name: Optional[str] = None,
+        compression: str = JOB_CSV_COMPRESSION,
+        rotate_mb: float = JOB_CSV_ROTATE_MB,
+        rotate_minutes: float = JOB_CSV_ROTATE_MINUTES,
+        fsync: str = JOB_CSV_FSYNC,
+        fsync_rows: int = JOB_CSV_FSYNC_ROWS,
+        archive: bool = JOB_PARQUET_ARCHIVE,
+    ):
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (expected one of {', '.join(EXTENSIONS)})")
+        if fsync not in ("never", "rotate", "batch", "always"):
+            raise ValueError(f"Unknown fsync policy '{fsync}'")
+        self.label = label
+        self.folder = Path(folder_name) if folder_name is not None else Path(get_output_folder())
+        self.compression = compression
+        self.rotate_bytes = int(rotate_mb * 1024 * 1024) if rotate_mb else 0
+        self.rotate_seconds = rotate_minutes * 60 if rotate_minutes else 0
+        self.fsync = fsync
+        self.fsync_rows = max(1, fsync_rows)
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        self.files: List[Path] = []
+        self.rows = 0
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(self._buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        self._raw = None
+        self._stream = None
+        self._path: Optional[Path] = None
+        self._file_rows = 0
+        self._file_bytes = 0
+        self._opened_at = 0.0
+        self._unsynced = 0
+
+        self.archive = None
+        if archive:
+            from app.utils.parquet_archive import JobParquetWriter
+            self.archive = JobParquetWriter(label)
+
+    # ===========================
+    # File lifecycle
+    # ===========================
+    def _open(self) -> None:
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self._path = self.folder / f"{self.run_id}_{self.label}_{len(self.files) + 1:03d}{EXTENSIONS[self.compression]}"
+        self._raw = open(self._path.with_name(self._path.name + PART_SUFFIX), "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            import zstandard
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self._file_rows = 0
+        self._file_bytes = 0
+        self._opened_at = time.monotonic()
+        self._writer.writeheader()
+        self._emit()
+
+    def _emit(self) -> None:
+        """Move the buffered CSV text into the compressor, counting uncompressed bytes for rotation"""
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._stream.write(data)
+        self._file_bytes += len(data)
+
+    def _sync(self) -> None:
+        """Flush through the compressor (ends a block) and optionally fsync"""
+        if self.compression == "zstd":
+            import zstandard
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self._stream.flush()
+        self._raw.flush()
+        if self.fsync != "never":
+            os.fsync(self._raw.fileno())
+        self._unsynced = 0
+
+    def _close_file(self) -> None:
+        if self._raw is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()  # writes the gzip trailer / zstd frame end; leaves _raw open
+        self._raw.flush()
+        if self.fsync != "never":
+            os.fsync(self._raw.fileno())
+        self._raw.close()
+        os.replace(self._path.with_name(self._path.name + PART_SUFFIX), self._path)
+        self.files.append(self._path)
+        print(f"📁 CSV saved to {self._path} ({self._file_rows} jobs)")
+        self._raw = self._stream = None
+
+    def _should_rotate(self) -> bool:
+        if self.rotate_bytes and self._file_bytes >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self._opened_at >= self.rotate_seconds
+
+    # ===========================
+    # Writing
+    # ===========================
+    def write(self, job: Dict) -> None:
+        if self._raw is None:
+            self._open()
+        job = canonical_job(job)
+        self._writer.writerow({field: _cell(job.get(field)) for field in CSV_FIELDS})
+        self._emit()
+        if self.archive is not None:
+            self.archive.write(job)
+        self.rows += 1
+        self._file_rows += 1
+        self._unsynced += 1
+
+        if self.fsync == "always" or (self.fsync == "batch" and self._unsynced >= self.fsync_rows):
+            self._sync()
+        if self._should_rotate():
+            self._close_file()
+
+    def write_many(self, jobs: Iterable[Dict]) -> None:
+        for job in jobs:
+            self.write(job)
+
+    def flush(self) -> None:
+        if self._raw is not None:
+            self._sync()
+
+    def close(self) -> List[Path]:
+        self._close_file()
+        if self.archive is not None:
+            self.archive.close()
+        return self.files
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 def write_jobs_csv(jobs: list, folder_name: Optional[str] = None, label: str = "jobs") -> None:
+    """Write an already collected list in one go (scrapers that can stream should use JobCsvWriter)"""
     if not jobs:
         print("⚠️ No jobs to write.")
         return
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"{timestamp}_{label}.csv"
+    with JobCsvWriter(label, folder_name=folder_name, fsync="rotate") as writer:
+        writer.write_many(jobs)
+
+
+# ===========================
+# Reading back
+# ===========================
+def iter_job_csv_files(folder, include_partial: bool = False) -> List[Path]:
+    """Plain and compressed job CSVs in a folder, oldest first; `.part` files only on request"""
+    folder = Path(folder)
+    patterns = ["*.csv", "*.csv.gz", "*.csv.zst"]
+    if include_partial:
+        patterns += [p + PART_SUFFIX for p in patterns]
+    return sorted({path for pattern in patterns for path in folder.glob(pattern)})
 
-    # Use custom folder if provided, else default
-    # target_folder = Path(folder_name) if folder_name else Path(get_output_folder())
-    target_folder = Path(folder_name) if folder_name is not None else Path(get_output_folder())
-    target_folder.mkdir(parents=True, exist_ok=True)
 
-    filepath = target_folder / filename
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(jobs[0].keys()))
-        writer.writeheader()
-        writer.writerows(jobs)
+def read_job_csv(path) -> Iterator[Dict[str, str]]:
+    """Rows of a job CSV whatever its compression; a truncated `.part` file yields rows up to the last flush"""
+    path = Path(path)
+    name = path.name[:-len(PART_SUFFIX)] if path.name.endswith(PART_SUFFIX) else path.name
+    truncated = (EOFError, OSError)
+    if name.endswith(".gz"):
+        stream = gzip.open(path, "rb")
+    elif name.endswith(".zst"):
+        import zstandard
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True, read_across_frames=True)
+        truncated += (zstandard.ZstdError,)
+    else:
+        stream = open(path, "rb")
 
-    print(f"📁 CSV saved to {filepath}")
\ No newline at end of file
+    csv.field_size_limit(10 * 1024 * 1024)
+    with io.TextIOWrapper(stream, encoding="utf-8", newline="") as text:
+        try:
+            yield from csv.DictReader(text)
+        except truncated as e:
+            logger.warning(f"⚠️ {path.name} ends early ({e}); kept the rows before it")
@@ -1,8 +1,9 @@
-from fastapi import FastAPI, APIRouter, Query, HTTPException, Header, File, UploadFile, Request
+from fastapi import FastAPI, APIRouter, Query, HTTPException, Header, File, UploadFile, Request, Response
 from fastapi.responses import RedirectResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Any
+import asyncio
 import os
 import logging
 from dotenv import load_dotenv
@@ -59,23 +60,26 @@ async def add_cors_headers(request: Request, call_next):
 # ===========================
 # Global Skill Loading
 # ===========================
-from app.utils.skills_engine import (
-    load_all_skills,
-    extract_skills,
-    extract_flat_skills,
-    extract_skills_by_category
-)
+from app.utils.skills_engine import SkillIndex, get_skill_index, start_skill_matrix_refresh
+from app.utils.job_skill_index import get_job_skill_index, warm_job_skill_index
 
+# Built once per process and shared with every router/scraper via app.state.skills
 logger.info("Loading skills data...")
 try:
-    SKILLS = load_all_skills()
-    logger.info(f"Skills loaded successfully: {len(SKILLS.get('combined_flat', []))} total skills")
+    SKILLS = get_skill_index()
+    logger.info(f"Skills loaded successfully: {len(SKILLS.combined_flat)} total skills")
 except Exception as e:
     logger.error(f"Failed to load skills: {e}")
-    SKILLS = {"flat": [], "combined_flat": [], "matrix": {}}
+    SKILLS = SkillIndex.build([], [])
 
 app.state.skills = SKILLS
 
+def _on_skills_refreshed(index: SkillIndex):
+    global SKILLS
+    SKILLS = index
+    app.state.skills = index
+    logger.info(f"Skills refreshed: {len(index.combined_flat)} total skills, {len(index.matrix)} categories")
+
 # ===========================
 # Request Models
 # ===========================
@@ -94,8 +98,8 @@ class JobDesc(BaseModel):
 # ===========================
 @app.post("/flat-skills/extract")
 def flat_skill_extract(payload: JobDesc):
-    flat = extract_flat_skills(payload.text, SKILLS["flat"])
-    categorized = extract_skills_by_category(payload.text, SKILLS["matrix"])
+    flat = SKILLS.extract_flat(payload.text)
+    categorized = SKILLS.extract_by_category(payload.text)
     return {
         "flat_skills": flat,
         "skills_by_category": categorized
@@ -103,8 +107,8 @@ def flat_skill_extract(payload: JobDesc):
 
 @app.post("/compare-resume")
 def compare_resume(payload: CompareResumeRequest):
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-    job_skills = extract_skills(payload.job_description, SKILLS["combined_flat"])
+    resume_skills = SKILLS.extract_combined(payload.resume_text)
+    job_skills = SKILLS.extract_combined(payload.job_description)
     matched = sorted(set(resume_skills) & set(job_skills))
     missing = sorted(set(job_skills) - set(resume_skills))
     score = round(100 * len(matched) / max(len(job_skills), 1))
@@ -115,32 +119,31 @@ def compare_resume(payload: CompareResumeRequest):
     }
 
 @app.post("/match-top-jobs")
-def match_top_jobs(payload: ResumeMatchRequest):
-    from app.db.connect_database import supabase
-    resume_skills = extract_skills(payload.resume_text, SKILLS["combined_flat"])
-    jobs_response = supabase.table("jobs").select("id", "title", "company", "job_description").execute()
-    jobs = jobs_response.data or []
+async def match_top_jobs(
+    payload: ResumeMatchRequest,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    min_score: int = Query(1, ge=1, description="Minimum number of shared skills"),
+    include_details: bool = Query(True, description="Include job_description, job_skills, missing_skills and resume_skills")
+):
+    from app.db.async_database import fetch_job_descriptions
+    resume_skills = SKILLS.extract_combined(payload.resume_text)
+    # Bounded top-k over the job skill index; only the requested page is materialized
+    job_index = await asyncio.to_thread(get_job_skill_index)
+    top_jobs, total = job_index.match_page(
+        resume_skills, limit=limit, offset=offset, min_score=min_score, include_skills=include_details
+    )
+    response.headers["X-Total-Count"] = str(total)
+    if not include_details:
+        return top_jobs
 
-    scored_jobs = []
-    for job in jobs:
-        job_text = job.get("job_description", "")
-        job_skills = extract_skills(job_text, SKILLS["combined_flat"])
-        overlap = set(resume_skills) & set(job_skills)
-        missing = sorted(set(job_skills) - set(resume_skills))
-        score = len(overlap)
-        scored_jobs.append({
-            "id": job["id"],
-            "title": job["title"],
-            "company": job["company"],
-            "match_score": score,
-            "matched_skills": sorted(overlap),
-            "missing_skills": missing,
-            "job_skills": sorted(job_skills),
-            "resume_skills": sorted(resume_skills),
-            "job_description": job_text
-        })
+    descriptions = await fetch_job_descriptions(job["id"] for job in top_jobs)
+    for job in top_jobs:
+        job["resume_skills"] = sorted(resume_skills)
+        job["job_description"] = descriptions.get(job["id"], "")
 
-    return sorted(scored_jobs, key=lambda x: x["match_score"], reverse=True)[:10]
+    return top_jobs
 
 # ===========================
 # Import Scraper Routers
@@ -240,9 +243,31 @@ async def startup_event():
     print("📚 API Documentation available at: http://127.0.0.1:8000/docs")
     print("🏥 Health check available at: http://127.0.0.1:8000/api/health")
     print(f"🧠 Skills loaded: {len(SKILLS.get('combined_flat', []))} total skills")
+    # Skills were served from the on-disk cache; check Supabase for changes without blocking startup
+    app.state.skill_refresh_stop = start_skill_matrix_refresh(on_change=_on_skills_refreshed)
+    warm_job_skill_index()
+    from app.utils.job_dedup import warm_dedup_indexes
+    warm_dedup_indexes()
+    from app.utils.browser_pool import start_browser_pool
+    try:
+        await start_browser_pool()
+    except Exception as e:
+        # Scrapers fall back to one-off browsers without the pool
+        print(f"⚠️ Browser pool unavailable: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    stop = getattr(app.state, "skill_refresh_stop", None)
+    if stop is not None:
+        stop.set()
+    from app.db.connect_database import close_pool
+    from app.db.async_database import close_async_pool
+    from app.utils.browser_pool import stop_browser_pool
+    from app.utils.http_fetcher import close_http_client
+    close_pool()
+    await close_async_pool()
+    await stop_browser_pool()
+    close_http_client()
     print("👋 Job Scraper & Matching API is shutting down...")
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import os
+import re
+import sqlite3
+import sys
+import types
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+
+# Tests import the app package the same way main.py does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+class _Cursor:
+    """psycopg2-style cursor over sqlite: %s placeholders, context manager, itersize"""
+
+    def __init__(self, cur: sqlite3.Cursor):
+        self._cur = cur
+        self.itersize = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cur.close()
+
+    def execute(self, sql, params=()):
+        params = tuple(str(p) if isinstance(p, (datetime, date)) else p for p in params)
+        self._cur.execute(re.sub(r"%s", "?", sql), params)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+
+class _Connection:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def cursor(self, name=None):
+        return _Cursor(self._conn.cursor())
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch):
+    """
+    In-memory sqlite behind a stand-in app.db.connect_database, for code that
+    talks to the jobs table through db_connection(). Yields the raw connection.
+    """
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("""
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY, url TEXT, title TEXT, company TEXT, job_location TEXT,
+            content_simhash INTEGER, inserted_at TEXT, date TEXT, archived_at TEXT
+        )
+    """)
+
+    @contextmanager
+    def db_connection():
+        yield _Connection(conn)
+
+    module = types.ModuleType("app.db.connect_database")
+    module.db_connection = db_connection
+    monkeypatch.setitem(sys.modules, "app.db.connect_database", module)
+    yield conn
+    conn.close()
@@ -0,0 +1,65 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from app.db import async_database
+
+
+class FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.log.append(("BEGIN",))
+        yield
+        self.log.append(("COMMIT",))
+
+    async def execute(self, sql, *args):
+        self.log.append((" ".join(sql.split()), *args))
+
+    async def executemany(self, sql, rows):
+        self.log.append((" ".join(sql.split()), rows))
+
+
+class FakePool:
+    def __init__(self):
+        self.log = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self.log)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+
+    async def get_async_pool():
+        return pool
+
+    monkeypatch.setattr(async_database, "get_async_pool", get_async_pool)
+    return pool
+
+
+def test_application_writes_run_as_the_user(pool):
+    asyncio.run(async_database.insert_application({"user_id": "user-1", "job_id": "job-1"}))
+    begin, claims, role, insert, commit = pool.log
+    assert (begin, commit) == (("BEGIN",), ("COMMIT",))
+    assert json.loads(claims[1]) == {"sub": "user-1", "role": "authenticated"}
+    assert claims[2] == "user-1"
+    assert role == ('SET LOCAL ROLE "authenticated"',)
+    assert insert == ("INSERT INTO applications (user_id, job_id) VALUES ($1, $2)", "user-1", "job-1")
+
+
+def test_batch_insert_is_one_scoped_transaction(pool):
+    records = [{"user_id": "user-1", "job_id": f"job-{n}"} for n in range(3)]
+    assert asyncio.run(async_database.insert_applications("user-1", records)) == 3
+    assert [entry[0] for entry in pool.log].count("BEGIN") == 1
+    assert pool.log[2] == ('SET LOCAL ROLE "authenticated"',)
+    assert pool.log[3][1] == [("user-1", f"job-{n}") for n in range(3)]
+    assert asyncio.run(async_database.insert_applications("user-1", [])) == 0
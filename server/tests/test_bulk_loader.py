@@ -0,0 +1,96 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from app.utils.write_jobs import JobCsvWriter
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    """app.db.bulk_loader with load_batch standing in for the COPY (no database)"""
+    def no_database():
+        raise AssertionError("load_batch is replaced in these tests")
+
+    connect = types.ModuleType("app.db.connect_database")
+    connect.DB_POOL_MAX = 4
+    connect.db_connection = no_database
+    monkeypatch.setitem(sys.modules, "app.db.connect_database", connect)
+    for name in ("app.db.job_writer", "app.db.bulk_loader"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    module = importlib.import_module("app.db.bulk_loader")
+
+    module.batches = []
+
+    def load_batch(jobs):
+        module.batches.append([job["url"] for job in jobs])
+        if any(job["date"] == "not a date" for job in jobs):
+            raise psycopg2.DataError("invalid input syntax for type date")
+        if module.fail_connection:
+            raise psycopg2.OperationalError("server closed the connection")
+        return {"inserted": len(jobs), "duplicates": 0}
+
+    module.fail_connection = False
+    monkeypatch.setattr(module, "load_batch", load_batch)
+    yield module
+    for name in ("app.db.job_writer", "app.db.bulk_loader"):
+        sys.modules.pop(name, None)
+
+
+def write_csv(folder, rows):
+    with JobCsvWriter("sync", folder_name=str(folder), fsync="never") as out:
+        out.write_many(rows)
+    return out.files[0]
+
+
+def rows(n):
+    return [{"title": f"Job {i}", "site": "Dice", "url": f"https://a.example/{i}", "date": "2026-10-16"} for i in range(n)]
+
+
+def test_bad_rows_are_counted_and_the_rest_loaded(loader, tmp_path):
+    data = rows(10)
+    data[3]["url"] = ""
+    data[6]["date"] = "not a date"
+    path = write_csv(tmp_path, data)
+
+    manifest = loader.SyncManifest(tmp_path)
+    stats = loader.load_file(path, manifest, batch_size=5)
+    assert (stats["rows"], stats["inserted"], stats["failed"]) == (10, 8, 2)
+
+    entry = manifest.files[path.name]
+    assert (entry["rows_done"], entry["inserted"], entry["failed"], entry["complete"]) == (10, 8, 2, True)
+    # The second batch failed as a whole, then went row by row
+    assert loader.batches[1] == [f"https://a.example/{i}" for i in range(5, 10)]
+    assert [len(batch) for batch in loader.batches[2:]] == [1] * 5
+
+
+def test_connection_errors_resume_from_the_failed_batch(loader, tmp_path):
+    path = write_csv(tmp_path, rows(10))
+    manifest = loader.SyncManifest(tmp_path)
+
+    original = loader.load_batch
+
+    def fail_second_batch(jobs):
+        loader.fail_connection = len(loader.batches) == 1
+        return original(jobs)
+
+    loader.load_batch = fail_second_batch
+    stats = loader.load_file(path, manifest, batch_size=4)
+    assert "error" in stats
+    assert manifest.files[path.name]["rows_done"] == 4
+
+    loader.load_batch = original
+    loader.fail_connection = False
+    stats = loader.load_file(path, loader.SyncManifest(tmp_path), batch_size=4)
+    assert (stats["resumed_past"], stats["rows"], stats["inserted"]) == (4, 6, 6)
+    assert loader.SyncManifest(tmp_path).files[path.name]["complete"] is True
+
+
+def test_finished_files_are_skipped(loader, tmp_path):
+    path = write_csv(tmp_path, rows(3))
+    assert loader.load_folder(tmp_path)["inserted"] == 3
+    totals = loader.load_folder(tmp_path)
+    assert (totals["files_skipped"], totals["inserted"]) == (1, 0)
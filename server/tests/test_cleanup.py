@@ -0,0 +1,81 @@
+import functools
+import importlib
+import sys
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def cleanup(sqlite_db, monkeypatch):
+    """app.db.cleanup bound to the sqlite jobs table (the validator isn't exercised here)"""
+    validator = types.ModuleType("app.db.job_validator")
+    validator.validate_jobs = lambda batch_size: {}
+    monkeypatch.setitem(sys.modules, "app.db.job_validator", validator)
+    monkeypatch.delitem(sys.modules, "app.db.cleanup", raising=False)
+    module = importlib.import_module("app.db.cleanup")
+    yield module
+    sys.modules.pop("app.db.cleanup", None)
+
+
+def insert(db, url, hours_ago):
+    inserted_at = datetime.utcnow() - timedelta(hours=hours_ago)
+    db.execute("INSERT INTO jobs (url, inserted_at) VALUES (?, ?)", (url, str(inserted_at)))
+
+
+def remaining(db):
+    return sorted(db.execute("SELECT url, inserted_at FROM jobs").fetchall())
+
+
+def test_run_chunked_repeats_until_a_short_chunk(cleanup, sqlite_db):
+    for n in range(23):
+        insert(sqlite_db, f"https://a.example/{n}", 1)
+    stats = cleanup.run_chunked("deleted", "DELETE FROM jobs WHERE id IN (SELECT id FROM jobs LIMIT %s)", chunk_size=5)
+    assert stats["rows"] == 23
+    assert stats["chunks"] == 5
+    assert remaining(sqlite_db) == []
+
+
+def test_keeps_only_the_newest_row_per_url(cleanup, sqlite_db):
+    for hours in (30, 20, 10, 1):
+        insert(sqlite_db, "https://a.example/dup", hours)
+    insert(sqlite_db, "https://a.example/single", 5)
+    stats = cleanup.remove_duplicate_urls(lookback_days=None)
+    assert stats["rows"] == 3
+    rows = remaining(sqlite_db)
+    assert [url for url, _ in rows] == ["https://a.example/dup", "https://a.example/single"]
+    assert datetime.fromisoformat(rows[0][1]) > datetime.utcnow() - timedelta(hours=2)
+
+
+def test_rows_with_several_newer_twins_count_once_per_chunk(cleanup, sqlite_db, monkeypatch):
+    # Each older row has several newer twins; a join would repeat them and end the loop early
+    for n in range(4):
+        for hours in (40, 30, 20, 10, 1):
+            insert(sqlite_db, f"https://a.example/{n}", hours)
+    monkeypatch.setattr(cleanup, "run_chunked", functools.partial(cleanup.run_chunked, chunk_size=4))
+    stats = cleanup.remove_duplicate_urls(lookback_days=None)
+    assert stats["rows"] == 16
+    assert len(remaining(sqlite_db)) == 4
+
+
+def test_lookback_only_considers_recent_duplicates(cleanup, sqlite_db):
+    insert(sqlite_db, "https://a.example/old", 24 * 10)
+    insert(sqlite_db, "https://a.example/old", 24 * 9)
+    insert(sqlite_db, "https://a.example/new", 24 * 10)
+    insert(sqlite_db, "https://a.example/new", 1)
+    stats = cleanup.remove_duplicate_urls(lookback_days=3)
+    assert stats["rows"] == 1
+    assert [url for url, _ in remaining(sqlite_db)].count("https://a.example/old") == 2
+
+
+
+def test_cleanup_defaults_to_a_full_duplicate_pass(cleanup, sqlite_db, monkeypatch):
+    monkeypatch.setattr(cleanup, "purge_older_than", lambda days: {})
+    insert(sqlite_db, "https://a.example/old", 24 * 10)
+    insert(sqlite_db, "https://a.example/old", 24 * 9)
+    assert cleanup.DEDUP_LOOKBACK_DAYS is None
+    assert cleanup.cleanup()["duplicates"]["rows"] == 1
+    insert(sqlite_db, "https://a.example/old", 24 * 8)
+    # The post-crawl window leaves duplicates older than DEDUP_RECENT_DAYS to the full pass
+    assert cleanup.cleanup(lookback_days=cleanup.DEDUP_RECENT_DAYS)["duplicates"]["rows"] == 0
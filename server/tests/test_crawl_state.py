@@ -0,0 +1,137 @@
+import sys
+import types
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils import crawl_state
+from app.utils.crawl_state import CrawlTracker, _naive_utc
+from app.utils.job_dedup import normalize_url
+
+STORED = {"https://a.example/jobs/1", "https://a.example/jobs/2", "https://a.example/jobs/3"}
+
+
+@pytest.fixture
+def watermark(monkeypatch):
+    """Previous run's state as _load() would return it; the URL filter knows STORED"""
+    state = {"head_keys": [], "last_full_crawl_at": None}
+    monkeypatch.setattr(CrawlTracker, "_load", lambda self: state)
+    monkeypatch.setattr("app.utils.url_bloom.is_known_url", lambda url: url in STORED)
+    return state
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Parameters of every watermark upsert finish() makes"""
+    calls = []
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def execute(self, sql, params):
+            calls.append(params)
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    @contextmanager
+    def db_connection():
+        yield Connection()
+
+    module = types.ModuleType("app.db.connect_database")
+    module.db_connection = db_connection
+    monkeypatch.setitem(sys.modules, "app.db.connect_database", module)
+    return calls
+
+
+def recent(hours):
+    return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def test_naive_utc_converts_before_dropping_the_zone():
+    eastern = timezone(timedelta(hours=-5))
+    assert _naive_utc(datetime(2026, 1, 1, 7, 0, tzinfo=eastern)) == datetime(2026, 1, 1, 12, 0)
+    assert _naive_utc(datetime(2026, 1, 1, 7, 0)) == datetime(2026, 1, 1, 7, 0)
+
+
+def test_full_crawl_schedule(watermark):
+    assert CrawlTracker("site", "python", "remote").full
+
+    watermark["last_full_crawl_at"] = recent(2)
+    assert not CrawlTracker("site", "python", "remote").full
+
+    watermark["last_full_crawl_at"] = recent(crawl_state.INCREMENTAL_FULL_CRAWL_HOURS + 1)
+    assert CrawlTracker("site", "python", "remote").full
+
+
+def test_recent_full_crawl_in_another_zone_is_not_stale(watermark):
+    # 22:00 at UTC-5 is 03:00 UTC the next day; dropping the zone would make it look 5 hours older
+    eastern = timezone(timedelta(hours=-5))
+    watermark["last_full_crawl_at"] = (
+        datetime.now(timezone.utc) - timedelta(hours=crawl_state.INCREMENTAL_FULL_CRAWL_HOURS - 1)
+    ).astimezone(eastern)
+    assert not CrawlTracker("site", "python", "remote").full
+
+
+def test_cut_stops_at_the_previous_head(watermark):
+    watermark["head_keys"] = [normalize_url("https://a.example/jobs/2"), normalize_url("https://a.example/jobs/3")]
+    watermark["last_full_crawl_at"] = recent(1)
+    tracker = CrawlTracker("site", "python", "remote", ordered=True)
+    urls = ["https://a.example/jobs/9", "https://a.example/jobs/2", "https://a.example/jobs/3"]
+    assert tracker.cut(urls) == 1
+    # A lone known card (sponsored, pinned on top) is not the high-water mark
+    assert tracker.cut(["https://a.example/jobs/2", "https://a.example/jobs/8", "https://a.example/jobs/9"]) == 3
+
+
+def test_page_of_known_postings_stops_an_incremental_crawl(watermark):
+    watermark["last_full_crawl_at"] = recent(1)
+    tracker = CrawlTracker("site", "python", "remote")
+    for n in (1, 2, 3, 4, 5):
+        tracker.check(f"https://a.example/jobs/{n}")
+    assert tracker.page_done() is True      # 3 of 5 known, under the ratio
+
+    for url in STORED:
+        tracker.check(url)
+    assert tracker.page_done() is False
+    assert tracker.stopped_early
+
+
+def test_full_crawl_never_stops_early(watermark):
+    tracker = CrawlTracker("site", "python", "remote")
+    for url in STORED:
+        tracker.check(url)
+    assert tracker.page_done() is True
+
+
+def test_only_stored_postings_make_the_head(watermark, saved):
+    tracker = CrawlTracker("site", "python", "remote")
+    known = tracker.check("https://a.example/jobs/1")
+    new = tracker.check("https://a.example/jobs/7")
+    failed = tracker.check("https://a.example/jobs/8")
+    assert (known, new, failed) == (True, False, False)
+    tracker.page_done()
+
+    # jobs/7 was inserted, jobs/8 failed to insert
+    tracker.saw("https://a.example/jobs/1")
+    tracker.saw("https://a.example/jobs/7")
+    tracker.finish()
+
+    assert len(saved) == 1
+    site, keyword, location, head_keys, newest_key, pages, full = saved[0]
+    assert head_keys == '["a.example/jobs/1", "a.example/jobs/7"]'
+    assert newest_key == "a.example/jobs/1"
+    assert (pages, full) == (1, True)
+
+
+def test_run_that_stored_nothing_keeps_the_old_mark(watermark, saved):
+    tracker = CrawlTracker("site", "python", "remote")
+    tracker.check("https://a.example/jobs/8")
+    tracker.page_done()
+    tracker.finish()
+    assert saved == []
@@ -0,0 +1,113 @@
+import pytest
+
+from app.utils import job_dedup
+from app.utils.job_dedup import JobDeduper, normalize_url, simhash, to_signed, to_unsigned
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to build and operate Python services on AWS. "
+    "You will design REST APIs, own PostgreSQL schemas, write tests, review code and "
+    "help the team ship reliable features every week with a focus on observability."
+)
+
+
+@pytest.fixture(autouse=True)
+def no_url_filter(monkeypatch):
+    monkeypatch.setattr("app.utils.url_bloom.is_known_url", lambda url: False)
+
+
+def job(url, description=DESCRIPTION, title="Backend Engineer", company="Acme", location="Remote"):
+    return {"url": url, "title": title, "company": company, "job_location": location, "job_description": description}
+
+
+def stored(deduper, job):
+    """check() and, for a new posting, the register() that follows a successful write"""
+    reason = deduper.check(job)
+    if reason is None:
+        deduper.register(job)
+    return reason
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.indeed.com/rc/clk?jk=abc123&from=serp&vjs=3", "indeed.com/viewjob?jk=abc123"),
+    ("https://m.indeed.com/viewjob?jk=abc123", "indeed.com/viewjob?jk=abc123"),
+    ("https://Jobs.Example.com//careers/42/?utm_source=x&b=2&a=1", "jobs.example.com/careers/42?a=1&b=2"),
+    ("", ""),
+])
+def test_normalize_url_strips_tracking(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_simhash_is_close_for_small_edits_and_far_for_other_text():
+    edited = DESCRIPTION.replace("every week", "each week")
+    other = "Registered nurse needed for night shifts in a busy emergency department, " * 3
+    assert bin(simhash(DESCRIPTION) ^ simhash(edited)).count("1") <= 10
+    assert bin(simhash(DESCRIPTION) ^ simhash(other)).count("1") > 10
+
+
+def test_signed_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        assert -(1 << 63) <= to_signed(value) < 1 << 63
+        assert to_unsigned(to_signed(value)) == value
+
+
+def test_tracking_variant_is_a_url_duplicate():
+    deduper = JobDeduper()
+    first = job("https://www.indeed.com/viewjob?jk=1")
+    assert stored(deduper, first) is None
+    assert first["content_simhash"] == to_signed(simhash(f"Backend Engineer Acme {DESCRIPTION}"))
+    assert stored(deduper, job("https://indeed.com/rc/clk?jk=1&from=serp")) == "url"
+    assert deduper.seen_listing("https://indeed.com/rc/clk?jk=1&tk=x") == "url"
+
+
+def test_repost_on_another_board_is_a_near_duplicate():
+    deduper = JobDeduper()
+    assert stored(deduper, job("https://a.example/1")) is None
+    repost = job("https://b.example/9", company="ACME", location="New York")
+    assert stored(deduper, repost) == "near_duplicate"
+
+
+def test_same_listing_with_different_content_is_kept():
+    deduper = JobDeduper()
+    assert stored(deduper, job("https://a.example/1")) is None
+    # Same title/company/location is only a candidate before the description is known
+    assert deduper.seen_listing("https://a.example/2", "Backend Engineer", "Acme", "Remote") is None
+    assert deduper.counts["listing_candidates"] == 1
+    second_req = job("https://a.example/2", description="Data platform role: Spark, Kafka and Scala pipelines. " * 5)
+    assert stored(deduper, second_req) is None
+
+
+def test_same_listing_with_close_content_is_a_listing_duplicate():
+    deduper = JobDeduper()
+    assert stored(deduper, job("https://a.example/1")) is None
+    # A few bits further apart than DEDUP_MAX_DISTANCE, well within the listing limit
+    edited = DESCRIPTION.replace("every week", "each week")
+    assert stored(deduper, job("https://a.example/2", description=edited)) == "listing"
+    # The same edit under another location is a different posting
+    assert stored(deduper, job("https://a.example/3", description=edited, location="Austin, TX")) is None
+
+def test_short_descriptions_only_dedup_by_url():
+    deduper = JobDeduper()
+    assert stored(deduper, job("https://a.example/1", description="N/A")) is None
+    assert stored(deduper, job("https://a.example/2", description="N/A")) is None
+    assert stored(deduper, job("https://a.example/1?utm_source=feed", description="N/A")) == "url"
+
+
+
+def test_check_is_read_only_until_register():
+    deduper = JobDeduper()
+    first = job("https://a.example/1")
+    assert deduper.check(first) is None
+    # The insert failed, so nothing was registered: the retry is not a duplicate
+    assert deduper.check(job("https://a.example/1")) is None
+    deduper.register(first)
+    assert deduper.check(job("https://a.example/1")) == "url"
+    assert deduper.check(job("https://b.example/9", location="Austin, TX")) == "near_duplicate"
+
+
+def test_register_jobs_waits_for_the_seed(monkeypatch):
+    monkeypatch.setattr(job_dedup, "_deduper", None)
+    job_dedup.register_jobs([job("https://a.example/1")])
+    deduper = JobDeduper()
+    monkeypatch.setattr(job_dedup, "_deduper", deduper)
+    job_dedup.register_jobs([job("https://a.example/1")])
+    assert deduper.stats()["urls"] == 1
@@ -0,0 +1,86 @@
+from app.utils.job_skill_index import JobSkillIndex
+
+
+def build_index():
+    index = JobSkillIndex()
+    for n in range(25):
+        # Scores repeat, so most pages end in the middle of a tie
+        skills = ["python", "sql", "aws"][:n % 3 + 1]
+        index.add_job(f"job-{n}", skills, title=f"Job {n}", status="new" if n % 2 else "old")
+    return index
+
+
+def test_pages_cover_every_match_once():
+    index = build_index()
+    seen = []
+    for offset in range(0, 30, 4):
+        page, total = index.match_page(["Python", "SQL", "AWS"], limit=4, offset=offset)
+        seen.extend(result["id"] for result in page)
+    assert total == 25
+    assert len(seen) == len(set(seen)) == 25
+    scores = [len(["python", "sql", "aws"][:int(job_id.split("-")[1]) % 3 + 1]) for job_id in seen]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_min_score_and_removed_jobs_are_excluded():
+    index = build_index()
+    index.remove_job("job-2")
+    page, total = index.match_page(["aws"], limit=50, min_score=1)
+    assert total == 7
+    assert "job-2" not in [result["id"] for result in page]
+    assert all(result["matched_skills"] == ["aws"] for result in page)
+
+
+def test_match_by_percent_filters_on_status():
+    index = build_index()
+    results, total = index.match_by_percent(["python"], min_percent=100, limit=50, status="new")
+    # Only the python-only jobs are fully covered; odd numbers are "new"
+    assert total == len([n for n in range(25) if n % 3 == 0 and n % 2])
+    assert {r["id"] for r in results} == {f"job-{n}" for n in range(25) if n % 3 == 0 and n % 2}
+
+
+def test_compaction_keeps_results(monkeypatch):
+    monkeypatch.setattr("app.utils.job_skill_index.JOB_INDEX_COMPACT_AFTER", 5)
+    index = build_index()
+    before, before_total = index.match_page(["python", "sql", "aws"], limit=50)
+    for n in range(0, 25, 5):
+        index.remove_job(f"job-{n}")
+    # Fifth removal triggers the rebuild; no empty rows are left behind
+    assert len(index._job_ids) == len(index) == 20
+    page, total = index.match_page(["python", "sql", "aws"], limit=50)
+    assert total == before_total - 5
+    assert [r for r in before if r["id"] not in {f"job-{n}" for n in range(0, 25, 5)}] == page
+    results, _ = index.match_by_percent(["python"], min_percent=100, limit=50, status="new")
+    assert {r["id"] for r in results} == {f"job-{n}" for n in range(25) if n % 3 == 0 and n % 2 and n % 5}
+    index.add_job("job-new", ["python"], status="new")
+    assert index.match_page(["python"], limit=50)[1] == len([n for n in range(25) if n % 5]) + 1
+
+
+class _FakeQuery:
+    def __init__(self, rows, calls):
+        self.rows, self.calls = rows, calls
+
+    def select(self, *columns):
+        return self
+
+    def order(self, column):
+        self.calls.append(("order", column))
+        self.rows = sorted(self.rows, key=lambda row: row[column])
+        return self
+
+    def range(self, start, end):
+        self.calls.append(("range", start, end))
+        self.rows = self.rows[start:end + 1]
+        return self
+
+    def execute(self):
+        return type("Response", (), {"data": self.rows})()
+
+
+def test_load_from_db_pages_in_id_order():
+    rows = [{"id": f"job-{n:02d}", "skills": ["python"], "title": "", "company": "", "status": "new"} for n in range(7)]
+    calls = []
+    client = type("Client", (), {"table": lambda self, name: _FakeQuery(list(reversed(rows)), calls)})()
+    index = JobSkillIndex()
+    assert index.load_from_db(client, page_size=3) == 7
+    assert [c for c in calls if c[0] == "order"] == [("order", "id")] * 3
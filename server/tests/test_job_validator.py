@@ -0,0 +1,182 @@
+import asyncio
+import importlib
+import sys
+import types
+from contextlib import asynccontextmanager, contextmanager
+
+import pytest
+
+for dependency in ("httpx", "lxml", "psycopg2"):
+    pytest.importorskip(dependency)
+
+
+class Response:
+    def __init__(self, status_code=200, chunks=(), headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._chunks = chunks
+
+    async def aiter_text(self):
+        for chunk in self._chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class FakeClient:
+    """httpx.AsyncClient stand-in: url -> (HEAD response, GET response), tracking concurrency per host"""
+
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.active = {}
+        self.peak = {}
+        self.order = []
+
+    @asynccontextmanager
+    async def _busy(self, url):
+        host = url.split("/")[2]
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            await asyncio.sleep(self.delay)
+            yield
+        finally:
+            self.active[host] -= 1
+            self.order.append(url)
+
+    async def head(self, url, headers=None):
+        async with self._busy(url):
+            return self.pages[url][0]
+
+    @asynccontextmanager
+    async def stream(self, method, url, headers=None):
+        async with self._busy(url):
+            yield self.pages[url][1]
+
+
+@pytest.fixture
+def validator_module(monkeypatch):
+    calls = []
+
+    class Cursor:
+        rowcount = 1
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def execute(self, sql, params=()):
+            calls.append((" ".join(sql.split()), params))
+
+        def fetchall(self):
+            return []
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    @contextmanager
+    def db_connection():
+        yield Connection()
+
+    connect = types.ModuleType("app.db.connect_database")
+    connect.db_connection = db_connection
+    monkeypatch.setitem(sys.modules, "app.db.connect_database", connect)
+    monkeypatch.delitem(sys.modules, "app.db.job_validator", raising=False)
+    module = importlib.import_module("app.db.job_validator")
+    monkeypatch.setattr(module, "execute_values", lambda cur, sql, rows, page_size=None: cur.execute(sql, tuple(rows)))
+    module.sql_calls = calls
+    yield module
+    sys.modules.pop("app.db.job_validator", None)
+
+
+def run_checks(module, client, urls):
+    validator = module.JobValidator(client)
+    return asyncio.run(_gather(validator, urls))
+
+
+async def _gather(validator, urls):
+    return await asyncio.gather(*(validator.check(str(n), url, "etag-1", None) for n, url in enumerate(urls)))
+
+
+def test_verdicts(validator_module, monkeypatch):
+    module = validator_module
+    browser_fetches = []
+    monkeypatch.setattr(module, "fetch_browser",
+                        lambda url: browser_fetches.append(url) or module.FetchResult(url, None, "", "browser"))
+    pages = {
+        "https://a.example/gone": (Response(404), None),
+        "https://a.example/same": (Response(304), None),
+        "https://a.example/expired": (Response(200), Response(200, ["<p>Sorry, this position has", " been filled</p>"])),
+        "https://a.example/live": (Response(200), Response(200, ["<h1>Apply now</h1>"], {"etag": "etag-2"})),
+        "https://a.example/walled": (Response(200), Response(403, ["Access denied"])),
+    }
+    results = run_checks(module, FakeClient(pages), list(pages))
+    verdicts = {r.url.rsplit("/", 1)[1]: (r.verdict, r.reason, r.etag) for r in results}
+    assert verdicts["gone"] == (module.EXPIRED, "status 404", None)
+    assert verdicts["same"] == (module.LIVE, "not modified", "etag-1")
+    # The phrase is split across two chunks
+    assert verdicts["expired"][:2] == (module.EXPIRED, "expiry phrase")
+    assert verdicts["live"] == (module.LIVE, "no expiry phrase", "etag-2")
+    # A bot wall is retried in the browser; a failed browser fetch stays inconclusive
+    assert verdicts["walled"][:2] == (module.UNKNOWN, "blocked: browser fetch failed")
+    assert browser_fetches == ["https://a.example/walled"]
+
+
+def test_one_busy_host_does_not_hold_every_global_slot(validator_module, monkeypatch):
+    module = validator_module
+    monkeypatch.setattr(module, "VALIDATE_CONCURRENCY", 3)
+    monkeypatch.setattr(module, "VALIDATE_PER_HOST", 2)
+    pages = {f"https://busy.example/{n}": (Response(404), None) for n in range(12)}
+    pages["https://other.example/1"] = (Response(404), None)
+    client = FakeClient(pages, delay=0.01)
+    run_checks(module, client, list(pages))
+
+    assert client.peak["busy.example"] == 2
+    # Waiting busy.example checks queue on their host slot, so other.example gets through early
+    assert client.order.index("https://other.example/1") < 4
+
+
+def test_apply_results_archives_stamps_and_backs_off(validator_module):
+    module = validator_module
+    CheckResult = module.CheckResult
+    applied = module.apply_results([
+        CheckResult("1", "u1", module.EXPIRED, "status 404"),
+        CheckResult("2", "u2", module.LIVE, "not modified", "etag", None),
+        CheckResult("3", "u3", module.UNKNOWN, "network: ConnectTimeout"),
+    ])
+    assert applied == {"archived": 1, "deleted": 1, "verified": 1, "backed_off": 1}
+    assert [params for sql, params in module.sql_calls if "archived_at = NOW()" in sql or sql.startswith("DELETE")] == [(["1"],)] * 2
+    assert any("validation_failures + 1" in sql and params == (["3"],) for sql, params in module.sql_calls)
+    assert any("validation_failures = 0" in sql and params == (("2", "etag", None),) for sql, params in module.sql_calls)
+
+
+def test_batch_query_skips_archived_jobs_and_backs_off(validator_module):
+    module = validator_module
+    module._jobs_to_validate(10)
+    sql, params = module.sql_calls[-1]
+    assert "archived_at IS NULL" in sql
+    assert "validation_attempted_at" in sql
+    assert params == (module.VALIDATE_RETRY_HOURS, 10)
+
+
+def test_one_failing_job_does_not_sink_the_batch(validator_module):
+    module = validator_module
+
+    class BrokenPage(Response):
+        async def aiter_text(self):
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+            yield ""
+
+    pages = {
+        "https://a.example/gone": (Response(404), None),
+        "https://a.example/broken": (Response(200), BrokenPage(200)),
+    }
+    results = run_checks(module, FakeClient(pages), list(pages) + [None])
+    assert [(r.verdict, r.reason) for r in results] == [
+        (module.EXPIRED, "status 404"),
+        (module.UNKNOWN, "error: UnicodeDecodeError"),
+        (module.UNKNOWN, "no url"),
+    ]
@@ -0,0 +1,110 @@
+import importlib
+import sys
+import types
+from contextlib import contextmanager
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+
+@pytest.fixture
+def writer_module(monkeypatch):
+    """app.db.job_writer over a fake jobs table: a set of urls, and "bad" dates the DB rejects"""
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    @contextmanager
+    def db_connection():
+        yield Connection()
+
+    connect = types.ModuleType("app.db.connect_database")
+    connect.db_connection = db_connection
+    monkeypatch.setitem(sys.modules, "app.db.connect_database", connect)
+    monkeypatch.delitem(sys.modules, "app.db.job_writer", raising=False)
+    module = importlib.import_module("app.db.job_writer")
+
+    table = set()
+    statements = []
+    url_at, date_at = module.JOB_COLUMNS.index("url"), module.JOB_COLUMNS.index("date")
+
+    def execute_values(cur, sql, rows, page_size=None, fetch=False):
+        statements.append(len(rows))
+        if any(row[date_at] == "bad" for row in rows):
+            raise psycopg2.DataError("invalid input syntax for type date")
+        new = [row for row in rows if row[url_at] not in table]
+        table.update(row[url_at] for row in new)
+        return [(row[0], row[url_at]) for row in new]
+
+    monkeypatch.setattr(module, "execute_values", execute_values)
+    monkeypatch.setattr(module, "check_job", lambda job: None)
+    monkeypatch.setattr(module, "DEDUP_ENABLED", False)
+    monkeypatch.setattr(module, "index_inserted_job", lambda job_id, job: None)
+    module.table, module.statements = table, statements
+    yield module
+    sys.modules.pop("app.db.job_writer", None)
+
+
+def job(n, **extra):
+    return {"title": f"Job {n}", "site": "Dice", "url": f"https://a.example/{n}", **extra}
+
+
+def test_batch_is_one_statement(writer_module):
+    stats = writer_module.insert_jobs([job(n) for n in range(5)] + [job(0)])
+    assert stats == {"batches": 1, "inserted": 5, "duplicates": 1, "failed": 0, "skipped": 0}
+    assert writer_module.statements == [5]
+
+
+def test_malformed_jobs_are_skipped_alone(writer_module):
+    broken = {"url": "https://a.example/no-title", "site": "Dice"}
+    stats = writer_module.insert_jobs([job(1), broken, job(2)])
+    assert (stats["inserted"], stats["failed"]) == (2, 1)
+    assert writer_module.table == {"https://a.example/1", "https://a.example/2"}
+
+
+def test_rejected_batch_is_retried_row_by_row(writer_module):
+    writer = writer_module.JobBulkWriter(source="test")
+    for n in range(4):
+        writer.add(job(n, date="bad" if n == 2 else None))
+    writer.add(job(0))
+    assert writer.flush() == {"inserted": 3, "duplicates": 1, "failed": 1}
+    assert writer_module.statements == [4, 1, 1, 1, 1]
+    assert writer.stored == {"https://a.example/0", "https://a.example/1", "https://a.example/3"}
+
+
+def test_connection_errors_fail_the_batch(writer_module, monkeypatch):
+    def down(cur, sql, rows, page_size=None, fetch=False):
+        raise psycopg2.OperationalError("server closed the connection")
+
+    monkeypatch.setattr(writer_module, "execute_values", down)
+    writer = writer_module.JobBulkWriter(source="test")
+    writer.add(job(1))
+    assert writer.flush() == {"inserted": 0, "duplicates": 0, "failed": 1}
+    assert writer.stored == set()
+
+
+def test_open_batch_is_deduped_and_registered_after_the_write(writer_module, monkeypatch):
+    from app.utils.job_dedup import JobDeduper
+
+    monkeypatch.setattr(writer_module, "DEDUP_ENABLED", True)
+    registered = []
+    monkeypatch.setattr(writer_module, "register_jobs", lambda jobs: registered.extend(j["url"] for j in jobs))
+    description = "Senior Python engineer for our payments platform, owning APIs, Postgres and on-call. " * 4
+    writer = writer_module.JobBulkWriter(source="test")
+    writer.add(job(1, job_description=description, company="Acme"))
+    # Same posting under a tracking URL, while the first copy is still buffered
+    writer.add(job(1, url="https://a.example/1?utm_source=feed", job_description=description, company="Acme"))
+    writer.add(job(2, date="bad"))
+    assert (writer.skipped, registered) == (1, [])
+    writer.flush()
+    # The rejected row is left out, so a later run can still store it
+    assert registered == ["https://a.example/1"]
+    assert isinstance(writer._pending, JobDeduper) and writer._pending.stats()["urls"] == 0
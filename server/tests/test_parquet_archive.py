@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.utils.parquet_archive import JobParquetWriter, archive_csv_files, job_record, read_archive
+from app.utils.write_jobs import JobCsvWriter
+
+
+def job(n, site="Dice", day=date(2026, 10, 16), **extra):
+    return {
+        "title": f"Job {n}", "url": f"https://a.example/{n}", "site": site, "date": day,
+        "skills": ["python"], "skills_by_category": {"languages": ["python"]}, **extra,
+    }
+
+
+def test_writes_one_partition_per_site_and_date(tmp_path):
+    with JobParquetWriter("test", root=tmp_path, row_group_size=2) as writer:
+        for n in range(3):
+            writer.write(job(n))
+        writer.write(job(3, site="Indeed", day=date(2026, 10, 17)))
+    partitions = sorted(str(path.parent.relative_to(tmp_path)) for path in writer.files)
+    assert partitions == ["site=Dice/date=2026-10-16", "site=Dice/date=2026-10-16", "site=Indeed/date=2026-10-17"]
+
+    dice = read_archive(columns=["url", "skills"], filters=[("site", "=", "Dice")], root=tmp_path)
+    assert sorted(dice.column("url").to_pylist()) == [f"https://a.example/{n}" for n in range(3)]
+    assert dice.column("skills").to_pylist() == [["python"]] * 3
+
+
+def test_scraper_aliases_are_archived(tmp_path):
+    indeed = {"title": "Backend", "link": "https://indeed.com/viewjob?jk=1", "description": "Go",
+              "location": "Remote", "flat_skills": ["go"], "site": "Indeed", "date": date(2026, 10, 17)}
+    with JobParquetWriter("test", root=tmp_path) as writer:
+        writer.write(indeed)
+        writer.write({"title": "no url", "site": "Indeed"})
+    table = read_archive(root=tmp_path)
+    assert table.num_rows == 1
+    row = table.to_pylist()[0]
+    assert (row["url"], row["job_description"], row["job_location"], row["skills"]) == (
+        "https://indeed.com/viewjob?jk=1", "Go", "Remote", ["go"])
+
+
+def test_csv_rows_convert_back_to_typed_values(tmp_path):
+    with JobCsvWriter("test", folder_name=str(tmp_path / "csv"), fsync="never") as csv_out:
+        csv_out.write(job(1, applied=True, inserted_at="2026-10-16T08:30:00"))
+    stats = archive_csv_files(tmp_path / "csv", root=tmp_path / "archive")
+    assert stats == {"csv_files": 1, "rows": 1, "parquet_files": 1}
+
+    row = read_archive(root=tmp_path / "archive").to_pylist()[0]
+    assert row["applied"] is True
+    assert row["skills_by_category"] == [("languages", ["python"])]
+    assert row["inserted_at"].isoformat() == "2026-10-16T08:30:00"
+    assert row["date"] == date(2026, 10, 16)
+
+
+def test_job_record_tolerates_bad_json_and_dates():
+    record = job_record({"url": "u", "skills": "not json", "date": "yesterday", "site": ""})
+    assert record["skills"] == []
+    assert record["site"] == "unknown"
+    assert isinstance(record["date"], date)
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from app.utils import selector_cache as selector_cache_module
+from app.utils.selector_cache import SELECTOR_SWITCH_AFTER, SelectorCache, find_first
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SelectorCache(tmp_path / "selectors.json")
+    monkeypatch.setattr(selector_cache_module, "selector_cache", cache)
+    return cache
+
+
+def test_learned_winner_is_tried_first(cache):
+    page = {".new-card": "card"}
+    assert find_first("site", "cards", [".old-card", ".new-card"], page.get) == (".new-card", "card")
+    assert cache.ranked("site", "cards", [".old-card", ".new-card"]) == [".new-card", ".old-card"]
+
+
+def test_winner_survives_a_few_mixed_cards(cache):
+    candidates = [".a", ".b"]
+    find_first("site", "title", candidates, {".a": 1}.get)
+    # Cards on one page mix variants: .b winning now and then is not a layout change
+    for _ in range(SELECTOR_SWITCH_AFTER - 1):
+        find_first("site", "title", candidates, {".b": 1}.get)
+        find_first("site", "title", candidates, {".a": 1}.get)
+    assert cache.stats("site")["site"]["title"]["winner"] == ".a"
+    assert cache.stats("site")["site"]["title"]["switches"] == 0
+
+
+def test_winner_switches_after_a_sustained_run_of_misses(cache):
+    candidates = [".a", ".b"]
+    find_first("site", "title", candidates, {".a": 1}.get)
+    for _ in range(SELECTOR_SWITCH_AFTER):
+        find_first("site", "title", candidates, {".b": 1}.get)
+    stats = cache.stats("site")["site"]["title"]
+    assert (stats["winner"], stats["switches"]) == (".b", 1)
+
+
+def test_misses_are_recorded_and_saved(cache):
+    assert find_first("site", "salary", [".x", ".y"], lambda selector: None) == (None, None)
+    cache.save()
+    saved = json.loads(cache.path.read_text())
+    assert saved["site"]["salary"]["selectors"][".x"] == {"hits": 0, "misses": 1}
+    assert SelectorCache(cache.path).stats()["site"]["salary"]["attempts"] == 1
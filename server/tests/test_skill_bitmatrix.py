@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.utils.skill_bitmatrix import SkillBitMatrix, top_k
+
+
+def reference(scores, k, mask=None):
+    rows = [row for row in range(len(scores)) if mask is None or mask[row]]
+    return sorted(rows, key=lambda row: (-scores[row], row))[:max(k, 0)]
+
+
+def test_orders_by_score_then_row():
+    scores = np.array([3, 5, 3, 5, 1])
+    assert top_k(scores, 5).tolist() == [1, 3, 0, 2, 4]
+
+
+def test_ties_at_the_boundary_keep_the_lowest_rows():
+    scores = np.array([2, 7, 2, 2, 7, 2])
+    assert top_k(scores, 3).tolist() == [1, 4, 0]
+    assert top_k(scores, 4).tolist() == [1, 4, 0, 2]
+
+
+def test_mask_and_empty_cases():
+    scores = np.array([9, 1, 8, 7])
+    mask = np.array([False, True, True, False])
+    assert top_k(scores, 10, mask).tolist() == [2, 1]
+    assert top_k(scores, 0).tolist() == []
+    assert top_k(scores, 3, np.zeros(4, dtype=bool)).tolist() == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_a_full_sort(seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 6, size=200)
+    mask = rng.random(200) < 0.7
+    for k in (1, 7, 50, 199, 400):
+        assert top_k(scores, k, mask).tolist() == reference(scores, k, mask)
+
+
+def test_pages_never_overlap_or_skip():
+    rng = np.random.default_rng(1)
+    scores = rng.integers(0, 4, size=97)
+    limit = 10
+    paged = []
+    for offset in range(0, 120, limit):
+        paged.extend(top_k(scores, offset + limit)[offset:].tolist())
+    assert paged == reference(scores, len(scores))
+
+
+
+def test_overlap_counts_shared_skills_across_words():
+    matrix = SkillBitMatrix(rows=1, skills=1)
+    matrix.set_row(0, [1, 2, 130])
+    matrix.set_row(3, [2, 64])
+    assert matrix.overlap([2, 130, 500]).tolist() == [2, 0, 0, 1]
+    matrix.clear_row(0)
+    assert matrix.mask().tolist() == [False, False, False, True]
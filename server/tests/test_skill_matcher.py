@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from app.utils.skill_matcher import SkillMatcher
+
+
+def regex_extract(text, skills):
+    """The per-skill regex scan SkillMatcher replaces"""
+    lowered = text.lower()
+    return sorted({s for s in skills if re.search(rf"\b{re.escape(s.lower())}\b", lowered)})
+
+
+SKILLS = ["Python", "Java", "JavaScript", "C", "C++", "C#", ".NET", "SQL", "PostgreSQL", "machine learning", "Go"]
+
+
+def test_finds_skills_case_insensitively():
+    assert SkillMatcher(SKILLS).extract("PYTHON and postgresql") == ["PostgreSQL", "Python"]
+
+
+def test_word_bounded_skips_partial_words():
+    found = SkillMatcher(SKILLS).extract("We use JavaScript, Golang and MySQL")
+    assert found == ["JavaScript"]
+
+
+def test_overlapping_patterns_are_all_reported():
+    found = SkillMatcher(SKILLS).extract("Experience with SQL (PostgreSQL) and machine learning")
+    assert found == ["PostgreSQL", "SQL", "machine learning"]
+
+
+@pytest.mark.parametrize("text", [
+    "C++ and C# on .NET",
+    "plain C, then c++17",
+    "java/javascript",
+    "go-to person for Go",
+    "",
+])
+def test_matches_regex_extraction(text):
+    assert SkillMatcher(SKILLS).extract(text) == regex_extract(text, SKILLS)
+
+
+def test_substring_mode_matches_inside_words():
+    matcher = SkillMatcher(["java", "sql"], word_bounded=False)
+    assert matcher.extract("MySQL and JavaScript") == ["java", "sql"]
+
+
+def test_case_variants_share_one_pattern():
+    matcher = SkillMatcher(["Python", "python", 42])
+    assert matcher.patterns == ["python"]
+    assert matcher.extract("python") == ["Python", "python"]
+    assert matcher.matched_patterns("PYTHON!") == {"python"}
@@ -0,0 +1,37 @@
+import json
+
+from app.utils.skill_matrix_cache import matrix_hash, read_cache, write_cache
+
+MATRIX = [
+    {"id": 1, "category": "languages", "skills": ["python", "go"]},
+    {"id": 2, "category": "cloud", "skills": ["aws"]},
+]
+
+
+def test_hash_ignores_row_and_key_order():
+    reordered = [{"skills": ["aws"], "category": "cloud", "id": 2}, MATRIX[0]]
+    assert matrix_hash(reordered) == matrix_hash(MATRIX)
+    assert matrix_hash(MATRIX[:1]) != matrix_hash(MATRIX)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "cache" / "skills.json"
+    digest = write_cache(MATRIX, path)
+    cached = read_cache(path)
+    assert cached["hash"] == digest
+    assert cached["matrix"] == MATRIX
+    assert not path.with_suffix(".json.tmp").exists()
+
+
+def test_missing_corrupt_or_tampered_cache_is_ignored(tmp_path):
+    path = tmp_path / "skills.json"
+    assert read_cache(path) is None
+
+    path.write_text("{not json")
+    assert read_cache(path) is None
+
+    write_cache(MATRIX, path)
+    data = json.loads(path.read_text())
+    data["matrix"][0]["skills"].append("rust")
+    path.write_text(json.dumps(data))
+    assert read_cache(path) is None
@@ -0,0 +1,36 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+
+@pytest.fixture
+def skills_engine(monkeypatch):
+    """app.utils.skills_engine without a Supabase client"""
+    client = types.ModuleType("app.supabase.supabase_client")
+    client.supabase = None
+    monkeypatch.setitem(sys.modules, "app.supabase.supabase_client", client)
+    monkeypatch.delitem(sys.modules, "app.utils.skills_engine", raising=False)
+    module = importlib.import_module("app.utils.skills_engine")
+    yield module
+    sys.modules.pop("app.utils.skills_engine", None)
+
+
+def test_shared_index_tuples_reuse_its_matchers(skills_engine, monkeypatch):
+    index = skills_engine.SkillIndex.build(
+        ["python", "sql"], [{"category": "Cloud", "skills": ["AWS", "GCP"]}], frontend_skills=["react"]
+    )
+    monkeypatch.setattr(skills_engine, "_skill_index", index)
+    skills_engine._cached_matcher.cache_clear()
+
+    assert skills_engine.get_skill_matcher(index.flat) is index.flat_matcher
+    assert skills_engine.get_skill_matcher(index.combined_flat, word_bounded=False) is index.combined_matcher
+    text = "Python and React on AWS"
+    assert skills_engine.extract_skills(text, index["combined_flat"]) == index.extract_combined(text)
+    assert skills_engine.extract_skills_by_category(text, index["matrix"]) == {"Cloud": ["AWS"]}
+    assert skills_engine._cached_matcher.cache_info().currsize == 0
+
+    # Any other list still goes through the tuple-keyed cache
+    assert skills_engine.extract_skills(text, ["aws", "react"]) == ["aws", "react"]
+    assert skills_engine._cached_matcher.cache_info().currsize == 1
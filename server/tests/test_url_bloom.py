@@ -0,0 +1,69 @@
+from app.utils import url_bloom
+from app.utils.url_bloom import BloomFilter, UrlFilter
+
+
+def test_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(5000, error_rate=0.01)
+    for n in range(5000):
+        bloom.add(f"example.com/jobs/{n}")
+    assert all(f"example.com/jobs/{n}" in bloom for n in range(5000))
+    false_positives = sum(f"other.example/{n}" in bloom for n in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert bloom.expected_error_rate < 0.02
+
+
+def test_add_reports_new_keys():
+    bloom = BloomFilter(100)
+    assert bloom.add("a.example/1") is True
+    assert bloom.add("a.example/1") is False
+    assert bloom.count == 1
+
+
+def test_unloaded_filter_knows_nothing():
+    url_filter = UrlFilter()
+    url_filter.add_many(["https://a.example/1"])
+    assert not url_filter.loaded
+    assert url_filter.might_contain("https://a.example/1") is False
+
+
+def test_load_reads_every_url_and_matches_tracking_variants(sqlite_db, monkeypatch):
+    monkeypatch.setattr(url_bloom, "URL_BLOOM_MIN_CAPACITY", 1000)
+    sqlite_db.executemany("INSERT INTO jobs (url) VALUES (?)", [
+        ("https://www.indeed.com/viewjob?jk=abc",), ("https://a.example/jobs/1",), (None,),
+    ])
+    url_filter = UrlFilter()
+    assert url_filter.load() == 2
+    assert url_filter.might_contain("https://indeed.com/rc/clk?jk=abc&from=serp")
+    assert url_filter.might_contain("https://a.example/jobs/1/?utm_source=feed")
+    assert not url_filter.might_contain("https://a.example/jobs/2")
+
+    # Inserts made after the load are remembered too
+    url_filter.add_many(["https://a.example/jobs/2"])
+    assert url_filter.might_contain("https://a.example/jobs/2")
+    assert url_filter.stats()["lookups"] == 4
+
+
+def test_failed_preload_backs_off(monkeypatch):
+    calls = []
+
+    def failing_load():
+        calls.append(1)
+        raise RuntimeError("db down")
+
+    fresh = UrlFilter()
+    monkeypatch.setattr(fresh, "load", failing_load)
+    monkeypatch.setattr(url_bloom, "_url_filter", fresh)
+    monkeypatch.setattr(url_bloom, "_retry_at", 0.0)
+    assert url_bloom.is_known_url("https://a.example/1") is False
+    assert url_bloom.is_known_url("https://a.example/1") is False
+    assert len(calls) == 1
+
+
+def test_warm_dedup_indexes_loads_both_off_thread(monkeypatch):
+    from app.utils import job_dedup
+
+    loaded = []
+    monkeypatch.setattr(job_dedup, "get_job_deduper", lambda: loaded.append("deduper"))
+    monkeypatch.setattr(url_bloom, "get_url_filter", lambda: loaded.append("url_filter"))
+    job_dedup.warm_dedup_indexes().join(timeout=5)
+    assert sorted(loaded) == ["deduper", "url_filter"]
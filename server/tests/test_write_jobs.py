@@ -0,0 +1,63 @@
+import json
+from datetime import date
+
+from app.utils.write_jobs import JobCsvWriter, canonical_job, iter_job_csv_files, read_job_csv
+
+INDEED_JOB = {
+    "title": "Backend Engineer",
+    "company": "Acme",
+    "link": "https://www.indeed.com/viewjob?jk=1",
+    "description": "Python and SQL",
+    "location": "Remote",
+    "flat_skills": ["python", "sql"],
+    "site": "Indeed",
+    "date": date(2026, 10, 17),
+}
+
+
+def test_canonical_job_maps_aliases_without_touching_the_input():
+    job = canonical_job(INDEED_JOB)
+    assert job is not INDEED_JOB and "url" not in INDEED_JOB
+    assert (job["url"], job["job_description"], job["job_location"], job["skills"]) == (
+        "https://www.indeed.com/viewjob?jk=1", "Python and SQL", "Remote", ["python", "sql"])
+
+
+def test_canonical_job_prefers_column_names():
+    job = {"url": "https://a.example/1", "link": "https://other.example", "job_location": "Austin"}
+    assert canonical_job(job) is job
+
+
+def test_rows_stream_to_gzip_and_read_back(tmp_path):
+    with JobCsvWriter("test", folder_name=str(tmp_path), fsync="never") as writer:
+        writer.write(INDEED_JOB)
+        writer.write({"title": "Data Engineer", "url": "https://a.example/2", "skills": ["spark"]})
+        # A crashed run leaves a .part file whose flushed rows can still be read
+        writer.flush()
+        assert [p.name.endswith(".part") for p in iter_job_csv_files(tmp_path, include_partial=True)] == [True]
+
+    files = iter_job_csv_files(tmp_path)
+    assert len(files) == 1 and files[0].name.endswith("_test_001.csv.gz")
+    rows = list(read_job_csv(files[0]))
+    assert [row["url"] for row in rows] == ["https://www.indeed.com/viewjob?jk=1", "https://a.example/2"]
+    assert rows[0]["job_description"] == "Python and SQL"
+    assert json.loads(rows[0]["skills"]) == ["python", "sql"]
+    assert rows[0]["date"] == "2026-10-17"
+
+
+def test_rotates_by_size(tmp_path):
+    with JobCsvWriter("test", folder_name=str(tmp_path), compression="none", rotate_mb=0.0001, fsync="never") as writer:
+        for n in range(3):
+            writer.write({"title": "x" * 200, "url": f"https://a.example/{n}"})
+    files = iter_job_csv_files(tmp_path)
+    assert len(files) == 3
+    assert sum(len(list(read_job_csv(path))) for path in files) == 3
+
+
+def test_truncated_part_file_yields_rows_up_to_the_last_flush(tmp_path):
+    writer = JobCsvWriter("test", folder_name=str(tmp_path), fsync="never")
+    writer.write({"title": "A", "url": "https://a.example/1"})
+    writer.flush()
+    writer.write({"title": "B", "url": "https://a.example/2"})
+    part = iter_job_csv_files(tmp_path, include_partial=True)[0]
+    assert [row["title"] for row in read_job_csv(part)] == ["A"]
+    writer.close()
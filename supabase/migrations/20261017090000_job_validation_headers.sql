@@ -0,0 +1,5 @@
+-- HTTP validators from the last expiry check, sent back as If-None-Match /
+-- If-Modified-Since so unchanged job pages answer 304 without a body.
+ALTER TABLE public.jobs
+    ADD COLUMN IF NOT EXISTS http_etag text,
+    ADD COLUMN IF NOT EXISTS http_last_modified text;
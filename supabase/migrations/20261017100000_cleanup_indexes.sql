@@ -0,0 +1,30 @@
+-- Indexes behind the chunked cleanup (app/db/cleanup.py) and the validator queue.
+
+-- purge_older_than: old, not yet archived jobs
+create index if not exists jobs_date_active_idx
+    on public.jobs (date)
+    where archived_at is null;
+
+-- EXISTS / NOT EXISTS probes from jobs into user_job_status
+create index if not exists user_job_status_job_id_idx
+    on public.user_job_status (job_id);
+
+-- validate_jobs: ORDER BY last_verified NULLS FIRST LIMIT n
+create index if not exists jobs_last_verified_idx
+    on public.jobs (last_verified nulls first);
+
+-- remove_duplicate_urls: recently inserted rows, then their older twins by url
+create index if not exists jobs_inserted_at_idx
+    on public.jobs (inserted_at);
+
+-- The upsert's ON CONFLICT (url) already needs a unique index on url; only add one if it is missing
+do $$
+begin
+    if not exists (
+        select 1 from pg_indexes
+        where schemaname = 'public' and tablename = 'jobs'
+          and indexdef ~* '\(url\)'
+    ) then
+        create index jobs_url_idx on public.jobs (url);
+    end if;
+end $$;
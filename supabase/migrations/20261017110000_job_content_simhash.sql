@@ -0,0 +1,6 @@
+-- SimHash fingerprint of title + company + description, written by the
+-- scrapers' dedup stage (app/utils/job_dedup.py) and read back to seed it.
+alter table public.jobs
+    add column if not exists content_simhash bigint;
+
+-- Dedup seeding reads recent rows by inserted_at (index added with the cleanup indexes)
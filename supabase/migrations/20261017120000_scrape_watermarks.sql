@@ -0,0 +1,14 @@
+-- High-water marks for incremental scraping (app/utils/crawl_state.py):
+-- the newest postings each (site, keyword, location) crawl saw, so the next
+-- run can stop paginating once it reaches them.
+create table if not exists public.scrape_watermarks (
+    site text not null,
+    keyword text not null,
+    location text not null,
+    head_keys jsonb not null default '[]'::jsonb,
+    newest_key text,
+    pages_last_run integer,
+    last_run_at timestamptz,
+    last_full_crawl_at timestamptz,
+    primary key (site, keyword, location)
+);
@@ -0,0 +1,11 @@
+-- When the expiry check last ran for a job, and how many checks in a row were
+-- inconclusive (network errors, bot walls). Those jobs back off exponentially
+-- instead of staying at the head of every validation batch.
+ALTER TABLE public.jobs
+    ADD COLUMN IF NOT EXISTS validation_attempted_at timestamptz,
+    ADD COLUMN IF NOT EXISTS validation_failures integer NOT NULL DEFAULT 0;
+
+-- validate_jobs: ORDER BY GREATEST(last_verified, validation_attempted_at) NULLS FIRST LIMIT n, active jobs only
+CREATE INDEX IF NOT EXISTS jobs_validation_queue_idx
+    ON public.jobs ((GREATEST(last_verified, validation_attempted_at)) NULLS FIRST)
+    WHERE archived_at IS NULL;